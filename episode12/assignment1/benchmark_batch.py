@@ -0,0 +1,103 @@
+"""
+Batch registration benchmark for Episode 12 Assignment 1
+N single POST /register requests vs one POST /register/batch
+
+The server runs in this process (ThreadingHTTPServer, keep-alive on)
+on a free port. Every way of sending registers the same N users, one
+in ten of them invalid, and checks the server's answers.
+
+Run:
+    python benchmark_batch.py [N]
+"""
+
+import http.client
+import json
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from urllib.parse import urlencode
+
+from solution import FormHandler
+
+
+def registrations(n):
+    users = []
+    for i in range(n):
+        users.append({
+            'username': f'user{i:06d}',
+            'email': f'user{i}@example.com' if i % 10 else f'user{i}.example.com',
+            'password': 'securepass123',
+            'age': str(18 + i % 60)
+        })
+    return users
+
+
+def singles(port, users, keep_alive):
+    conn = http.client.HTTPConnection('localhost', port)
+    valid = 0
+    for user in users:
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        if not keep_alive:
+            headers['Connection'] = 'close'
+        conn.request('POST', '/register', urlencode(user), headers)
+        response = conn.getresponse()
+        valid += json.loads(response.read())['status'] == 'success'
+        if not keep_alive:
+            conn.close()
+    conn.close()
+    return valid
+
+
+def batch(port, users, body_format):
+    if body_format == 'array':
+        body = json.dumps(users)
+        content_type = 'application/json'
+    else:
+        body = ''.join(json.dumps(user) + '\n' for user in users)
+        content_type = 'application/x-ndjson'
+    conn = http.client.HTTPConnection('localhost', port)
+    conn.request('POST', '/register/batch', body.encode('utf-8'),
+                 {'Content-Type': content_type})
+    summary = json.loads(conn.getresponse().read().splitlines()[-1])
+    conn.close()
+    return summary['valid']
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    users = registrations(n)
+    expected = sum(1 for i in range(n) if i % 10)
+
+    FormHandler.keep_alive = True
+    FormHandler.max_requests = n + 1
+    server = ThreadingHTTPServer(('localhost', 0), FormHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    print("╔════════════════════════════════════════════╗")
+    print("║  Batch Registration Benchmark              ║")
+    print("╚════════════════════════════════════════════╝")
+
+    runs = [
+        ('single, new connection each', lambda: singles(port, users, False)),
+        ('single, keep-alive', lambda: singles(port, users, True)),
+        ('batch, JSON array', lambda: batch(port, users, 'array')),
+        ('batch, JSON lines', lambda: batch(port, users, 'lines')),
+    ]
+    print(f"\nRegistering {n} users ({n - expected} invalid)")
+    print(f"{'requests':<30}{'seconds':>9}{'users/s':>11}{'speedup':>9}")
+    baseline = None
+    for label, run in runs:
+        start = time.perf_counter()
+        valid = run()
+        elapsed = time.perf_counter() - start
+        assert valid == expected, (label, valid)
+        baseline = baseline or elapsed
+        print(f"{label:<30}{elapsed:>9.3f}{n / elapsed:>11.0f}{baseline / elapsed:>8.1f}x")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
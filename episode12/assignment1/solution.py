@@ -3,11 +3,114 @@ EPISODE 12 - ASSIGNMENT 1: Solution
 Complete implementation of form data processing
 """
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import itertools
 import json
+from keepalive import KeepAliveMixin
+from form_parser import MAX_BODY, MAX_FIELD, FormError, read_request_form
+from schema import Field, Schema
 
-class FormHandler(BaseHTTPRequestHandler):
+BATCH_FLUSH_SIZE = 16 * 1024    # result bytes collected before each write
+
+# One encoder for every result line of a batch
+_encode = json.JSONEncoder(separators=(',', ':')).encode
+
+
+REGISTRATION_SCHEMA = Schema([
+    Field('username', required='Username is required', min_length=3, max_length=20,
+          length_error='Username must be 3-20 characters'),
+    Field('email', required='Email is required', contains='@',
+          contains_error='Email must contain @'),
+    Field('password', required='Password is required', min_length=8,
+          length_error='Password must be at least 8 characters'),
+    Field('age', int, required='Age is required', min=13, max=120,
+          range_error='Age must be between 13 and 120',
+          type_error='Age must be a valid number'),
+])
+
+# Check one registration; returns the list of errors (empty if valid).
+# Shared by /register and /register/batch, so a batch item gets the
+# same errors a single request would.
+validate_registration = REGISTRATION_SCHEMA.validate
+
+
+def _batch_fields(item):
+    """
+    Form fields of one batch item, or (None, errors)
+
+    Items are JSON objects; numbers are accepted as field values
+    ("age": 25) and turned into the strings a form would send.
+    """
+    if not isinstance(item, dict):
+        return None, ['Registration must be a JSON object']
+    fields = {}
+    for name, value in item.items():
+        if isinstance(value, str):
+            fields[name] = value
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            fields[name] = str(value)
+        else:
+            return None, [f'Field {name} must be a string or number']
+    return fields, None
+
+
+def read_batch(rfile, content_length, max_body=None, max_line=None):
+    """
+    Registrations in a batch body, one Python value per item
+
+    The body is either a JSON array or JSON lines (one object per
+    line, blank lines skipped); a first non-blank character of '['
+    means an array. JSON lines are read and yielded a line at a time,
+    so results can go out while the client is still sending. An array
+    is parsed whole.
+
+    A line that is not valid JSON is yielded as a FormError(400)
+    instance, so the batch goes on with the next line. Raises
+    FormError for the body as a whole: 413 over max_body or a line
+    over max_line, 400 for a malformed array or a short body. Limits
+    left as None take form_parser's MAX_BODY and MAX_FIELD.
+    """
+    max_body = MAX_BODY if max_body is None else max_body
+    max_line = MAX_FIELD if max_line is None else max_line
+    try:
+        remaining = int(content_length or 0)
+    except ValueError:
+        raise FormError(400, 'Invalid Content-Length')
+    if remaining < 0:
+        raise FormError(400, 'Invalid Content-Length')
+    if remaining > max_body:
+        raise FormError(413, f'Request body too large (limit {max_body} bytes)')
+
+    first = True
+    while remaining:
+        line = rfile.readline(min(remaining, max_line + 1))
+        if not line:
+            raise FormError(400, 'Request body ended early')
+        remaining -= len(line)
+        if first and line.lstrip()[:1] == b'[':
+            rest = rfile.read(remaining)
+            if len(rest) < remaining:
+                raise FormError(400, 'Request body ended early')
+            try:
+                items = json.loads(line + rest)
+            except ValueError:
+                raise FormError(400, 'Invalid JSON array')
+            if not isinstance(items, list):
+                raise FormError(400, 'Invalid JSON array')
+            yield from items
+            return
+        if len(line) > max_line:
+            raise FormError(413, f'JSON line too large (limit {max_line} bytes)')
+        if not line.strip():
+            continue
+        first = False
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield FormError(400, 'Invalid JSON')
+
+
+class FormHandler(KeepAliveMixin, BaseHTTPRequestHandler):
     
     def do_POST(self):
         """Handle POST requests"""
@@ -33,12 +136,16 @@ class FormHandler(BaseHTTPRequestHandler):
                         'errors': errors
                     }
                     self._send_response(400, response)
+            except FormError as e:
+                self._send_response(e.status, {'status': 'error', 'message': str(e)})
             except Exception as e:
                 response = {
                     'status': 'error',
                     'message': f'Server error: {str(e)}'
                 }
                 self._send_response(500, response)
+        elif self.path == '/register/batch':
+            self._handle_register_batch()
         else:
             response = {
                 'status': 'error',
@@ -50,32 +157,14 @@ class FormHandler(BaseHTTPRequestHandler):
         """
         Helper method to read and parse form data
         
-        Steps:
-        1. Get content-length from headers (default to 0)
-        2. Read exact bytes from self.rfile
-        3. Decode bytes using UTF-8
-        4. Parse with parse_qs()
-        5. Flatten using dict comprehension
+        The body is read in chunks and parsed as it arrives, within size
+        limits; urlencoded and multipart forms are both accepted (see
+        form_parser.py).
         
         Returns:
             dict: Form data with {key: value} format
         """
-        # Read Content-Length header
-        content_length = int(self.headers.get('Content-Length', 0))
-        
-        # Read exact bytes from request body
-        body = self.rfile.read(content_length)
-        
-        # Decode bytes to string using UTF-8
-        body_string = body.decode('utf-8')
-        
-        # Parse form data
-        parsed = parse_qs(body_string)
-        
-        # Flatten the dict: {key: [value]} -> {key: value}
-        form_data = {k: v[0] for k, v in parsed.items()}
-        
-        return form_data
+        return read_request_form(self)
     
     def _validate_form(self, form_data):
         """
@@ -84,43 +173,85 @@ class FormHandler(BaseHTTPRequestHandler):
         Returns:
             tuple: (is_valid: bool, errors: list)
         """
-        errors = []
+        errors = validate_registration(form_data)
+        is_valid = len(errors) == 0
+        return is_valid, errors
+    
+    def _handle_register_batch(self):
+        """
+        Validate many registrations in one request
+        
+        The body is a JSON array or JSON lines of registration objects
+        (see read_batch). The response is JSON lines, one per item in
+        order, then a summary:
         
-        # Check username
-        username = form_data.get('username', '')
-        if not username:
-            errors.append('Username is required')
-        elif len(username) < 3 or len(username) > 20:
-            errors.append('Username must be 3-20 characters')
+            {"index":0,"status":"success","data":{...}}
+            {"index":1,"status":"error","errors":["Email must contain @"]}
+            {"status":"done","total":2,"valid":1,"invalid":1}
         
-        # Check email
-        email = form_data.get('email', '')
-        if not email:
-            errors.append('Email is required')
-        elif '@' not in email:
-            errors.append('Email must contain @')
+        Lines are written as items are validated, BATCH_FLUSH_SIZE bytes
+        at a time (chunked on HTTP/1.1). A body error found before the
+        first item is an ordinary JSON error response; one found later
+        ends the stream with an error line instead of the summary.
+        """
+        items = read_batch(self.rfile, self.headers.get('Content-Length'))
+        try:
+            items = itertools.chain((next(items),), items)
+        except StopIteration:
+            items = iter(())
+        except FormError as e:
+            self.close_connection = True
+            self._send_response(e.status, {'status': 'error', 'message': str(e)})
+            return
         
-        # Check password
-        password = form_data.get('password', '')
-        if not password:
-            errors.append('Password is required')
-        elif len(password) < 8:
-            errors.append('Password must be at least 8 characters')
+        chunked = self.protocol_version == 'HTTP/1.1' and self.request_version != 'HTTP/1.0'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
         
-        # Check age
-        age_str = form_data.get('age', '')
-        if not age_str:
-            errors.append('Age is required')
-        else:
-            try:
-                age = int(age_str)
-                if age < 13 or age > 120:
-                    errors.append('Age must be between 13 and 120')
-            except ValueError:
-                errors.append('Age must be a valid number')
+        write = self.wfile.write
         
-        is_valid = len(errors) == 0
-        return is_valid, errors
+        def flush(data):
+            if chunked:
+                write(b'%x\r\n%s\r\n' % (len(data), data))
+            else:
+                write(data)
+        
+        out = []
+        size = 0
+        total = valid = 0
+        validate = validate_registration
+        try:
+            for item in items:
+                if isinstance(item, FormError):
+                    result = {'index': total, 'status': 'error', 'errors': [str(item)]}
+                else:
+                    fields, errors = _batch_fields(item)
+                    if fields is not None:
+                        errors = validate(fields)
+                    if errors:
+                        result = {'index': total, 'status': 'error', 'errors': errors}
+                    else:
+                        result = {'index': total, 'status': 'success', 'data': fields}
+                        valid += 1
+                total += 1
+                line = _encode(result) + '\n'
+                out.append(line)
+                size += len(line)
+                if size >= BATCH_FLUSH_SIZE:
+                    flush(''.join(out).encode('utf-8'))
+                    out.clear()
+                    size = 0
+            out.append(_encode({'status': 'done', 'total': total, 'valid': valid,
+                                'invalid': total - valid}) + '\n')
+        except FormError as e:
+            self.close_connection = True
+            out.append(_encode({'status': 'error', 'message': str(e)}) + '\n')
+        flush(''.join(out).encode('utf-8'))
+        if chunked:
+            write(b'0\r\n\r\n')
     
     def _send_response(self, status_code, response_dict):
         """Send JSON response"""
@@ -137,7 +268,9 @@ class FormHandler(BaseHTTPRequestHandler):
 
 
 if __name__ == '__main__':
-    server = HTTPServer(('localhost', 8000), FormHandler)
+    # Persistent connections; each one is served by its own thread
+    FormHandler.keep_alive = True
+    server = ThreadingHTTPServer(('localhost', 8000), FormHandler)
     print("Server running on http://localhost:8000")
     print("\nTest with curl commands:")
     print("\n1. Valid registration:")
@@ -148,4 +281,6 @@ if __name__ == '__main__':
     print('curl -X POST -d "username=john&email=johnexample.com&password=securepass123&age=25" http://localhost:8000/register')
     print("\n4. Invalid password (too short):")
     print('curl -X POST -d "username=john&email=john@example.com&password=short&age=25" http://localhost:8000/register')
+    print("\n5. Batch registration (JSON lines):")
+    print("""printf '%s\\n' '{"username":"john","email":"john@example.com","password":"securepass123","age":25}' '{"username":"ab","email":"ab@example.com","password":"securepass123","age":25}' | curl -X POST --data-binary @- http://localhost:8000/register/batch""")
     server.serve_forever()
@@ -178,6 +178,112 @@ class TestFormHandler(unittest.TestCase):
         
         self.assertEqual(response.status_code, 200)
         self.assertEqual(result['data']['username'], 'señor')
+    
+    def test_multipart_registration(self):
+        """Test multipart/form-data forms are parsed like urlencoded ones"""
+        files = {
+            'username': (None, 'janedoe'),
+            'email': (None, 'jane@example.com'),
+            'password': (None, 'securepass123'),
+            'age': (None, '30'),
+            'avatar': ('avatar.png', b'\x89PNG' + bytes(5000), 'image/png')
+        }
+        response = requests.post(f'{self.base_url}/register', files=files)
+        result = response.json()
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(result['data']['username'], 'janedoe')
+        self.assertNotIn('avatar', result['data'])
+    
+    def test_oversized_field_rejected(self):
+        """Test a field over the size limit gets 413"""
+        data = {'username': 'x' * (100 * 1024), 'email': 'a@b.co', 'password': 'p' * 8, 'age': '20'}
+        response = requests.post(f'{self.base_url}/register', data=urlencode(data))
+        
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.json()['status'], 'error')
+    
+    def test_keep_alive_connection_reuse(self):
+        """Test keep-alive mode answers several requests on one connection"""
+        import http.client
+        handler = self.server.RequestHandlerClass
+        handler.keep_alive = True
+        conn = http.client.HTTPConnection('localhost', 8001, timeout=5)
+        try:
+            statuses = []
+            sock = None
+            for username in ('johndoe', 'ab', 'janedoe'):
+                data = urlencode({'username': username, 'email': 'john@example.com',
+                                  'password': 'securepass123', 'age': '25'})
+                conn.request('POST', '/register', data,
+                             {'Content-Type': 'application/x-www-form-urlencoded'})
+                response = conn.getresponse()
+                self.assertIsNotNone(response.getheader('Content-Length'))
+                json.loads(response.read())
+                statuses.append(response.status)
+                sock = sock or conn.sock
+                self.assertIs(conn.sock, sock)
+            self.assertEqual(statuses, [200, 400, 200])
+        finally:
+            handler.keep_alive = False
+            conn.close()
+
+    
+    def test_batch_registration_array(self):
+        """Test a JSON array batch gets one result per item and a summary"""
+        batch = [
+            {'username': 'johndoe', 'email': 'john@example.com',
+             'password': 'securepass123', 'age': 25},
+            {'username': 'ab', 'email': 'johnexample.com',
+             'password': 'securepass123', 'age': '25'},
+            'not an object'
+        ]
+        response = requests.post(f'{self.base_url}/register/batch', data=json.dumps(batch),
+                                 headers={'Content-Type': 'application/json'})
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(lines[0], {'index': 0, 'status': 'success', 'data': {
+            'username': 'johndoe', 'email': 'john@example.com',
+            'password': 'securepass123', 'age': '25'}})
+        self.assertEqual(lines[1]['errors'],
+                         ['Username must be 3-20 characters', 'Email must contain @'])
+        self.assertEqual(lines[2]['status'], 'error')
+        self.assertEqual(lines[3], {'status': 'done', 'total': 3, 'valid': 1, 'invalid': 2})
+        
+        response = requests.post(f'{self.base_url}/register/batch', data='[{"username": ')
+        self.assertEqual(response.status_code, 400)
+    
+    def test_batch_registration_json_lines_keep_alive(self):
+        """Test a JSON lines batch streamed back chunked over keep-alive"""
+        import http.client
+        handler = self.server.RequestHandlerClass
+        handler.keep_alive = True
+        valid = json.dumps({'username': 'janedoe', 'email': 'jane@example.com',
+                            'password': 'securepass123', 'age': '30'})
+        body = '\n'.join([valid] * 2000 + ['{broken', '', '{"age": 5}']) + '\n'
+        conn = http.client.HTTPConnection('localhost', 8001, timeout=5)
+        try:
+            conn.request('POST', '/register/batch', body,
+                         {'Content-Type': 'application/x-ndjson'})
+            response = conn.getresponse()
+            self.assertEqual(response.getheader('Transfer-Encoding'), 'chunked')
+            lines = [json.loads(line) for line in response.read().splitlines()]
+            self.assertEqual(len(lines), 2003)
+            self.assertEqual(lines[1999]['index'], 1999)
+            self.assertEqual(lines[2000]['errors'], ['Invalid JSON'])
+            self.assertIn('Age must be between 13 and 120', lines[2001]['errors'])
+            self.assertEqual(lines[-1], {'status': 'done', 'total': 2002,
+                                         'valid': 2000, 'invalid': 2})
+            
+            # The connection is still usable afterwards
+            conn.request('POST', '/register/batch', valid)
+            response = conn.getresponse()
+            self.assertEqual(response.read().splitlines()[-1],
+                             b'{"status":"done","total":1,"valid":1,"invalid":0}')
+        finally:
+            handler.keep_alive = False
+            conn.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,64 @@
+"""
+Cookie parsing benchmark for Episode 12 Assignment 2
+SimpleCookie vs cookie_parser.get_cookie for reading session_id
+
+Headers are shaped like a real browser's: analytics and consent
+cookies, a CSRF token and preferences around the session cookie.
+
+Run:
+    python benchmark_cookies.py
+"""
+
+import time
+from http.cookies import SimpleCookie
+
+from cookie_parser import get_cookie
+
+ROUNDS = 100000
+SESSION_ID = '6f1c2b9e-3d4a-4f7e-9a51-0c8d2e7b4a13'
+
+HEADERS = {
+    'session only': f'session_id={SESSION_ID}',
+    'session first, 8 cookies': (
+        f'session_id={SESSION_ID}; _ga=GA1.1.1234567890.1700000000; '
+        '_gid=GA1.1.987654321.1700000000; csrftoken=Zx81kLqP0aVbN3mYt7WcRr2uEo9sHdJf; '
+        'theme=dark; lang=en-GB; tz=Europe%2FLondon; cookie_consent="analytics,marketing"'),
+    'session last, 12 cookies': (
+        '_ga=GA1.1.1234567890.1700000000; _gid=GA1.1.987654321.1700000000; '
+        '_fbp=fb.1.1700000000000.1234567890; _hjSessionUser_123=eyJpZCI6IjEyMyJ9; '
+        'csrftoken=Zx81kLqP0aVbN3mYt7WcRr2uEo9sHdJf; theme=dark; lang=en-GB; '
+        'tz=Europe%2FLondon; cookie_consent="analytics,marketing"; sidebar=collapsed; '
+        f'recently_viewed=101%2C102%2C103; session_id={SESSION_ID}'),
+}
+
+
+def simple_cookie(header):
+    cookie = SimpleCookie()
+    cookie.load(header)
+    morsel = cookie.get('session_id')
+    return morsel.value if morsel else None
+
+
+def timed(parse, header):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        parse(header)
+    return (time.perf_counter() - start) / ROUNDS * 1e6
+
+
+def main():
+    print("╔════════════════════════════════════════════╗")
+    print("║  Cookie Parsing Benchmark                  ║")
+    print("╚════════════════════════════════════════════╝")
+
+    print(f"\nReading session_id, µs per request ({ROUNDS} rounds)")
+    print(f"{'header':<27}{'bytes':>6}{'SimpleCookie':>14}{'get_cookie':>12}{'speedup':>9}")
+    for label, header in HEADERS.items():
+        assert simple_cookie(header) == get_cookie(header, 'session_id') == SESSION_ID
+        slow = timed(simple_cookie, header)
+        fast = timed(lambda h: get_cookie(h, 'session_id'), header)
+        print(f"{label:<27}{len(header):>6}{slow:>14.2f}{fast:>12.2f}{slow / fast:>8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
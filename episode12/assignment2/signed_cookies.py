@@ -0,0 +1,81 @@
+"""
+EPISODE 12 - ASSIGNMENT 2: Signed cookie module
+Session data kept in the cookie itself, HMAC-signed so it can't be forged
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+MAX_AGE = 3600          # seconds a token stays valid after it is issued
+CLOCK_SKEW = 60         # seconds a token may appear to come from the future
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+class CookieSigner:
+    """
+    Turn a JSON-serializable payload into a signed cookie value and back
+
+    A token is three cookie-safe parts joined by dots:
+
+        base64url(compact JSON) . issued-at (unix seconds) . base64url(HMAC-SHA256)
+
+    The signature covers the payload and the issue time, so neither
+    can be changed without the key. loads() returns None for a token
+    that is malformed, signed with an unknown key, or older than
+    max_age, so any process holding the keys can check a session
+    without shared state.
+
+    Key rotation: keys is a list, newest first. New tokens are signed
+    with keys[0]; tokens signed with any listed key are accepted. To
+    rotate, put the new key first, and drop the old one after max_age.
+
+    The payload is readable by the client (signed, not encrypted), so
+    it must not hold secrets.
+
+    Example:
+        signer = CookieSigner([b'new secret', b'old secret'], max_age=3600)
+        token = signer.dumps({'username': 'admin'})
+        signer.loads(token)         # {'username': 'admin'}
+    """
+
+    def __init__(self, keys, max_age=MAX_AGE, clock=time.time):
+        if not keys:
+            raise ValueError('At least one signing key is required')
+        self.keys = [key.encode('utf-8') if isinstance(key, str) else key for key in keys]
+        self.max_age = max_age
+        self._clock = clock
+
+    def _signature(self, key, signed):
+        return hmac.new(key, signed, hashlib.sha256).digest()
+
+    def dumps(self, payload):
+        """Signed token for payload, issued now"""
+        data = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        signed = f'{_b64encode(data)}.{int(self._clock())}'.encode('ascii')
+        return f'{signed.decode("ascii")}.{_b64encode(self._signature(self.keys[0], signed))}'
+
+    def loads(self, token):
+        """Payload of a valid, unexpired token, or None"""
+        try:
+            data, issued, signature = token.split('.')
+            signed = f'{data}.{issued}'.encode('ascii')
+            signature = _b64decode(signature)
+            if not any(hmac.compare_digest(self._signature(key, signed), signature)
+                       for key in self.keys):
+                return None
+            age = self._clock() - int(issued)
+            if age > self.max_age or age < -CLOCK_SKEW:
+                return None
+            return json.loads(_b64decode(data))
+        except (ValueError, UnicodeError):
+            return None
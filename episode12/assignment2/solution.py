@@ -3,19 +3,42 @@ EPISODE 12 - ASSIGNMENT 2: Solution
 Complete implementation of session-based authentication with cookies
 """
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import parse_qs, urlparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse
 from http.cookies import SimpleCookie
 import json
+import os
+import secrets
+import sys
 import uuid
 from datetime import datetime
+from keepalive import KeepAliveMixin
+from cookie_parser import request_cookie
+from form_parser import FormError, read_request_form
+from sessions import SessionStore
+from signed_cookies import CookieSigner
 
-# Simple in-memory session store
-SESSIONS = {}
-FLASH_MESSAGES = {}
+SESSION_TTL = 3600  # 1 hour, for the cookie and the server-side session
 
+# Where session data is kept:
+#   'memory' - in SESSIONS / FLASH_MESSAGES below; the cookie holds an id
+#   'signed' - in the cookie itself, HMAC-signed (signed_cookies.py), so
+#              any process holding the keys can serve any session
+SESSION_MODE = 'memory'
 
-class SessionHandler(BaseHTTPRequestHandler):
+# In-memory session stores; idle entries expire (see sessions.py)
+SESSIONS = SessionStore(ttl=SESSION_TTL)
+FLASH_MESSAGES = SessionStore(ttl=SESSION_TTL)
+
+# Signing keys for 'signed' mode, newest first. SESSION_KEYS (comma
+# separated) shares them between processes; without it each process
+# makes up its own key.
+SIGNER = CookieSigner([key for key in os.environ.get('SESSION_KEYS', '').split(',') if key]
+                      or [secrets.token_bytes(32)], max_age=SESSION_TTL)
+MAX_COOKIE_FLASHES = 5  # flash messages kept in a signed cookie (cookies max out at 4 KB)
+
+
+class SessionHandler(KeepAliveMixin, BaseHTTPRequestHandler):
     
     def do_GET(self):
         """Handle GET requests"""
@@ -29,6 +52,9 @@ class SessionHandler(BaseHTTPRequestHandler):
             self._handle_logout()
         elif path == '/messages':
             self._handle_messages()
+        elif path == '/session-stats':
+            self._render_json({'sessions': SESSIONS.stats(),
+                               'flash_messages': FLASH_MESSAGES.stats()})
         else:
             self._render_json({'status': 'error', 'message': 'Not found'}, 404)
     
@@ -36,10 +62,13 @@ class SessionHandler(BaseHTTPRequestHandler):
         """Handle POST requests"""
         path = self._parse_path()
         
-        if path == '/login':
-            self._handle_login_post()
-        else:
-            self._render_json({'status': 'error', 'message': 'Not found'}, 404)
+        try:
+            if path == '/login':
+                self._handle_login_post()
+            else:
+                self._render_json({'status': 'error', 'message': 'Not found'}, 404)
+        except FormError as e:
+            self._render_json({'status': 'error', 'message': str(e)}, e.status)
     
     def _parse_path(self):
         """Parse URL path without query string"""
@@ -47,25 +76,18 @@ class SessionHandler(BaseHTTPRequestHandler):
         return parsed.path
     
     def _get_session_from_cookie(self):
-        """Extract session ID from cookie"""
-        cookie_header = self.headers.get('Cookie', '')
-        
-        if not cookie_header:
-            return None
-        
-        cookies = SimpleCookie()
-        try:
-            cookies.load(cookie_header)
-            session_id = cookies.get('session_id')
-            if session_id:
-                return session_id.value
-        except Exception:
-            pass
-        
-        return None
+        """Extract session ID from cookie (parsed once per request)"""
+        return request_cookie(self, 'session_id')
     
     def _create_session(self, username):
-        """Create a new session"""
+        """Create a new session; return the value for the session cookie"""
+        if SESSION_MODE == 'signed':
+            return SIGNER.dumps({
+                'username': username,
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'flash': []
+            })
+        
         session_id = str(uuid.uuid4())
         SESSIONS[session_id] = {
             'username': username,
@@ -74,12 +96,20 @@ class SessionHandler(BaseHTTPRequestHandler):
         }
         return session_id
     
+    def _load_session(self, session_id):
+        """Session data for a session cookie value, or None if not logged in"""
+        if not session_id:
+            return None
+        if SESSION_MODE == 'signed':
+            return SIGNER.loads(session_id)
+        return SESSIONS.get(session_id)
+    
     def _set_session_cookie(self, session_id):
         """Set session cookie"""
         cookie = SimpleCookie()
         cookie['session_id'] = session_id
         cookie['session_id']['path'] = '/'
-        cookie['session_id']['max-age'] = 3600  # 1 hour
+        cookie['session_id']['max-age'] = SESSION_TTL
         cookie['session_id']['httponly'] = True
         return cookie['session_id'].OutputString()
     
@@ -92,36 +122,62 @@ class SessionHandler(BaseHTTPRequestHandler):
         return cookie['session_id'].OutputString()
     
     def _set_flash_message(self, session_id, message_type, message):
-        """Set a flash message"""
+        """
+        Set a flash message
+        
+        Returns the session cookie value, which changes in 'signed'
+        mode (the messages travel in the cookie).
+        """
+        if SESSION_MODE == 'signed':
+            session = SIGNER.loads(session_id)
+            if session is None:
+                return session_id
+            flash = session['flash'] + [{'type': message_type, 'message': message}]
+            session['flash'] = flash[-MAX_COOKIE_FLASHES:]
+            return SIGNER.dumps(session)
+        
         if session_id not in FLASH_MESSAGES:
             FLASH_MESSAGES[session_id] = []
         FLASH_MESSAGES[session_id].append({
             'type': message_type,
             'message': message
         })
+        return session_id
     
     def _get_and_clear_flash_message(self, session_id):
-        """Get and remove flash message"""
+        """
+        Get and remove flash message
+        
+        Returns (message or None, session cookie value), as the cookie
+        value changes in 'signed' mode.
+        """
+        if SESSION_MODE == 'signed':
+            session = SIGNER.loads(session_id)
+            if not session or not session['flash']:
+                return None, session_id
+            message = session['flash'].pop(0)
+            return message, SIGNER.dumps(session)
+        
         if session_id in FLASH_MESSAGES and FLASH_MESSAGES[session_id]:
             message = FLASH_MESSAGES[session_id].pop(0)
             if not FLASH_MESSAGES[session_id]:
                 del FLASH_MESSAGES[session_id]
-            return message
-        return None
+            return message, session_id
+        return None, session_id
     
     def _handle_login_page(self):
         """Show login page with flash messages"""
         session_id = self._get_session_from_cookie()
         
         # If already logged in, redirect to profile
-        if session_id and session_id in SESSIONS:
+        if self._load_session(session_id) is not None:
             self.send_response(302)
             self.send_header('Location', '/profile')
             self.end_headers()
             return
         
         # Get flash messages if any
-        flash = self._get_and_clear_flash_message(session_id) if session_id else None
+        flash, new_session_id = self._get_and_clear_flash_message(session_id) if session_id else (None, None)
         flash_html = ''
         
         if flash:
@@ -158,19 +214,24 @@ class SessionHandler(BaseHTTPRequestHandler):
         </body>
         </html>
         '''
-        self._render_html(html)
+        headers = []
+        if new_session_id != session_id:
+            headers.append(('Set-Cookie', self._set_session_cookie(new_session_id)))
+        self._render_html(html, headers)
     
     def _handle_profile(self):
         """Show user profile (requires authentication)"""
         session_id = self._get_session_from_cookie()
+        # In memory, looking the session up keeps it alive for another SESSION_TTL
+        session = self._load_session(session_id)
         
-        if not session_id or session_id not in SESSIONS:
+        if session is None:
             self.send_response(302)
             self.send_header('Location', '/')
             self.end_headers()
             return
         
-        session = SESSIONS[session_id]
+        session['last_activity'] = datetime.now().isoformat()
         username = session['username']
         
         html = f'''
@@ -202,8 +263,9 @@ class SessionHandler(BaseHTTPRequestHandler):
         """Handle logout"""
         session_id = self._get_session_from_cookie()
         
-        if session_id and session_id in SESSIONS:
-            del SESSIONS[session_id]
+        if session_id:
+            SESSIONS.pop(session_id)
+            FLASH_MESSAGES.pop(session_id)
         
         self.send_response(302)
         self.send_header('Location', '/')
@@ -214,12 +276,15 @@ class SessionHandler(BaseHTTPRequestHandler):
         """Demonstrate flash messaging"""
         session_id = self._get_session_from_cookie()
         
-        if session_id and session_id in SESSIONS:
+        new_session_id = session_id
+        if self._load_session(session_id) is not None:
             # Set a flash message
-            self._set_flash_message(session_id, 'success', 'This is a flash message! It will show once.')
+            new_session_id = self._set_flash_message(session_id, 'success', 'This is a flash message! It will show once.')
         
         self.send_response(302)
         self.send_header('Location', '/profile')
+        if new_session_id != session_id:
+            self.send_header('Set-Cookie', self._set_session_cookie(new_session_id))
         self.end_headers()
     
     def _handle_login_post(self):
@@ -245,10 +310,12 @@ class SessionHandler(BaseHTTPRequestHandler):
             self.send_header('Location', '/')
             self.end_headers()
     
-    def _render_html(self, content):
+    def _render_html(self, content, headers=()):
         """Send HTML response"""
         self.send_response(200)
         self.send_header('Content-Type', 'text/html; charset=utf-8')
+        for name, value in headers:
+            self.send_header(name, value)
         self.end_headers()
         self.wfile.write(content.encode('utf-8'))
     
@@ -260,12 +327,8 @@ class SessionHandler(BaseHTTPRequestHandler):
         self.wfile.write(json.dumps(data).encode('utf-8'))
     
     def _read_form(self):
-        """Read POST form data"""
-        content_length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(content_length)
-        body_string = body.decode('utf-8')
-        parsed = parse_qs(body_string)
-        return {k: v[0] for k, v in parsed.items()}
+        """Read POST form data (in chunks, with size limits; see form_parser.py)"""
+        return read_request_form(self)
     
     def log_message(self, format, *args):
         """Suppress default logging"""
@@ -273,14 +336,22 @@ class SessionHandler(BaseHTTPRequestHandler):
 
 
 if __name__ == '__main__':
-    server = HTTPServer(('localhost', 8002), SessionHandler)
-    print("Server running on http://localhost:8002")
+    # Persistent connections; each one is served by its own thread
+    SessionHandler.keep_alive = True
+    # python solution.py [memory|signed]
+    if len(sys.argv) > 1:
+        SESSION_MODE = sys.argv[1]
+    SESSIONS.start_sweeper()
+    FLASH_MESSAGES.start_sweeper()
+    server = ThreadingHTTPServer(('localhost', 8002), SessionHandler)
+    print(f"Server running on http://localhost:8002 ({SESSION_MODE} sessions)")
     print("\nTest the following:")
     print("1. http://localhost:8002/               - Login page")
     print("2. http://localhost:8002/profile        - Protected page (redirects to login)")
     print("3. Login with username: admin, password: password123")
     print("4. http://localhost:8002/logout         - Logout")
     print("5. http://localhost:8002/messages       - Test flash messages")
+    print("6. http://localhost:8002/session-stats  - Live session counts (JSON)")
     print("\nDefault credentials:")
     print("  Username: admin")
     print("  Password: password123")
@@ -162,6 +162,167 @@ class TestSessionHandler(unittest.TestCase):
         cookie_header = response.headers['Set-Cookie']
         self.assertIn('httponly', cookie_header.lower())
         self.assertIn('path', cookie_header.lower())
+    
+    def test_keep_alive_connection_reuse(self):
+        """Test keep-alive mode answers several requests on one connection"""
+        import http.client
+        handler = self.server.RequestHandlerClass
+        handler.keep_alive = True
+        conn = http.client.HTTPConnection('localhost', 8003, timeout=5)
+        try:
+            conn.request('GET', '/')
+            response = conn.getresponse()
+            self.assertIn(b'Login', response.read())
+            self.assertIsNotNone(response.getheader('Content-Length'))
+            sock = conn.sock
+            
+            conn.request('GET', '/profile')
+            response = conn.getresponse()
+            response.read()
+            self.assertEqual(response.status, 302)
+            conn.request('GET', '/')
+            self.assertEqual(conn.getresponse().status, 200)
+            self.assertIs(conn.sock, sock)
+        finally:
+            handler.keep_alive = False
+            conn.close()
+    
+    def test_session_store_expiry_and_capacity(self):
+        """Test sessions expire when idle, slide on use and evict LRU at capacity"""
+        from sessions import SessionStore
+        now = [0.0]
+        store = SessionStore(ttl=10, max_entries=3, clock=lambda: now[0])
+        store['a'] = 1
+        store['b'] = 2
+        
+        now[0] = 8
+        self.assertEqual(store['a'], 1)     # used: lives until 18
+        now[0] = 12
+        self.assertIn('a', store)
+        self.assertNotIn('b', store)
+        self.assertEqual(store.sweep(), 0)  # 'b' already dropped, 'a' rescheduled
+        
+        store['c'] = 3
+        store['d'] = 4
+        store['e'] = 5                      # full: 'a' is least recently used
+        self.assertNotIn('a', store)
+        
+        now[0] = 30
+        self.assertEqual(store.sweep(), 3)
+        self.assertEqual(store.stats(), {'live': 0, 'capacity': 3, 'peak': 3,
+                                         'created': 5, 'expired': 4, 'evicted': 1})
+    
+    def test_session_store_pop_skips_expired(self):
+        """Test pop returns the default for an entry past its TTL, without a sweep"""
+        from sessions import SessionStore
+        now = [0.0]
+        store = SessionStore(ttl=10, clock=lambda: now[0])
+        store['a'] = 1
+        store['b'] = 2
+        now[0] = 5
+        self.assertEqual(store.pop('a'), 1)
+        now[0] = 11
+        self.assertIsNone(store.pop('b'))
+        self.assertEqual(store.pop('b', 'gone'), 'gone')
+        self.assertEqual(store.stats()['expired'], 1)
+    
+    def test_session_store_heap_bounded(self):
+        """Test evicted and deleted sessions don't pile up in the expiry heap"""
+        import sessions
+        store = sessions.SessionStore(ttl=3600, max_entries=10)
+        for i in range(100000):
+            store[i] = i
+            if i % 3 == 0:
+                store.pop(i)
+        self.assertLessEqual(len(store._entries), 10)
+        self.assertLessEqual(len(store._heap), 2 * 10 + sessions.HEAP_SLACK + 1)
+        self.assertEqual(store[99998], 99998)
+        self.assertEqual(store.stats()['live'], len(store._entries))
+    
+    def test_session_stats_endpoint(self):
+        """Test /session-stats reports live sessions"""
+        data = {'username': 'admin', 'password': 'password123'}
+        self.session.post(f'{self.base_url}/login', data=urlencode(data), allow_redirects=False)
+        
+        response = self.session.get(f'{self.base_url}/session-stats')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['sessions']['live'], 1)
+    
+    def test_cookie_signer_rotation_and_expiry(self):
+        """Test signed tokens reject tampering, accept old keys and expire"""
+        from signed_cookies import CookieSigner
+        now = [1000000]
+        old = CookieSigner([b'old key'], max_age=60, clock=lambda: now[0])
+        rotated = CookieSigner([b'new key', b'old key'], max_age=60, clock=lambda: now[0])
+        
+        token = old.dumps({'username': 'admin', 'flash': []})
+        self.assertEqual(rotated.loads(token), {'username': 'admin', 'flash': []})
+        self.assertIsNone(CookieSigner([b'new key']).loads(token))
+        
+        data, issued, signature = token.split('.')
+        self.assertIsNone(rotated.loads(f'{data}.{int(issued) + 30}.{signature}'))
+        self.assertIsNone(rotated.loads('not-a-token'))
+        
+        now[0] += 61
+        self.assertIsNone(rotated.loads(token))
+    
+    def test_signed_session_mode(self):
+        """Test signed mode keeps the session in the cookie, not in SESSIONS"""
+        import solution
+        from signed_cookies import CookieSigner
+        solution.SESSION_MODE = 'signed'
+        try:
+            data = {'username': 'admin', 'password': 'password123'}
+            self.session.post(f'{self.base_url}/login', data=urlencode(data))
+            self.assertEqual(len(solution.SESSIONS), 0)
+            response = self.session.get(f'{self.base_url}/profile')
+            self.assertIn('Welcome, admin!', response.text)
+            
+            # The flash message travels in a re-signed cookie
+            token = self.session.cookies.get('session_id')
+            response = self.session.get(f'{self.base_url}/messages', allow_redirects=False)
+            new_token = self.session.cookies.get('session_id')
+            self.assertNotEqual(new_token, token)
+            self.assertEqual(len(solution.SIGNER.loads(new_token)['flash']), 1)
+            
+            # Any process with the same keys can issue a valid session
+            other = CookieSigner(solution.SIGNER.keys)
+            self.session.cookies.set('session_id', other.dumps(
+                {'username': 'elsewhere', 'created_at': 'now', 'flash': []}))
+            self.assertIn('Welcome, elsewhere!', self.session.get(f'{self.base_url}/profile').text)
+            
+            self.session.cookies.set('session_id', new_token[:-2] + 'xx')
+            response = self.session.get(f'{self.base_url}/profile', allow_redirects=False)
+            self.assertEqual(response.status_code, 302)
+        finally:
+            solution.SESSION_MODE = 'memory'
+    
+    def test_cookie_parser_matches_simple_cookie(self):
+        """Test get_cookie reads the same values as SimpleCookie, once per request"""
+        from http.cookies import SimpleCookie
+        from cookie_parser import get_cookie, request_cookie
+        headers = [
+            'session_id=abc123',
+            'theme=dark; session_id=abc123; lang=en',
+            'xsession_id=wrong; session_id=abc123',
+            'session_id=old; theme=dark; session_id=abc123; xsession_id=wrong',
+            'a=1;session_id="quoted value"',
+            'session_id="esc\\"aped"; b=2',
+            'theme=dark',
+        ]
+        for header in headers:
+            morsel = SimpleCookie(header).get('session_id')
+            self.assertEqual(get_cookie(header, 'session_id'), morsel.value if morsel else None, header)
+        self.assertIsNone(get_cookie('', 'session_id'))
+        
+        class Request:
+            headers = {'Cookie': 'session_id=first'}
+        request = Request()
+        self.assertEqual(request_cookie(request, 'session_id'), 'first')
+        request.headers['Cookie'] = 'session_id=changed'    # same request: memoized
+        self.assertEqual(request_cookie(request, 'session_id'), 'first')
+        request.headers = {'Cookie': 'session_id=next'}     # next request
+        self.assertEqual(request_cookie(request, 'session_id'), 'next')
 
 
 if __name__ == '__main__':
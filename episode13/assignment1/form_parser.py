@@ -0,0 +1,261 @@
+"""
+EPISODE 13 - ASSIGNMENT 1: Form parser module (same as episode15)
+Read urlencoded and multipart/form-data request bodies in chunks, with size limits
+"""
+
+import tempfile
+from email.message import Message
+from email.parser import BytesHeaderParser
+from email.utils import collapse_rfc2231_value
+from urllib.parse import parse_qsl
+
+CHUNK_SIZE = 64 * 1024              # bytes read from the socket at a time
+MAX_BODY = 16 * 1024 * 1024         # whole request body
+MAX_FIELD = 64 * 1024               # one text field
+MAX_FIELDS = 1000                   # fields and files in one form
+MAX_FILE = 8 * 1024 * 1024          # one uploaded file
+MAX_PART_HEADERS = 16 * 1024        # header block of one multipart part
+SPOOL_SIZE = 256 * 1024             # file bytes kept in memory before moving to disk
+
+
+class FormError(Exception):
+    """Unreadable or oversized form body; status is the HTTP status to answer"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class UploadedFile:
+    """A file part of a multipart form, spooled to a temporary file"""
+
+    def __init__(self, filename, content_type, file, size):
+        self.filename = filename
+        self.content_type = content_type
+        self.file = file
+        self.size = size
+
+    def read(self):
+        self.file.seek(0)
+        return self.file.read()
+
+    def close(self):
+        self.file.close()
+
+
+class FormData(dict):
+    """
+    Text fields as {name: first value}, like the old parse_qs flattening
+
+    Uploaded files are in .files ({name: UploadedFile}); close() deletes
+    their temporary files (garbage collection does too).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.files = {}
+
+    def close(self):
+        for upload in self.files.values():
+            upload.close()
+
+
+def parse_form(rfile, content_length, content_type='', max_body=None,
+               max_field=None, max_fields=None, max_file=None):
+    """
+    Read a form body of content_length bytes from rfile
+
+    The body is read CHUNK_SIZE bytes at a time and parsed as it
+    arrives, so memory use is bounded by the limits, not by what the
+    client sends:
+    - Content-Length over max_body is refused before reading anything
+    - a text field over max_field, a file over max_file, or more than
+      max_fields fields stops the read at that point
+    - files go to temporary files (in memory up to SPOOL_SIZE)
+
+    multipart/form-data bodies are split on their boundary; anything
+    else is read as application/x-www-form-urlencoded. Raises FormError
+    (413 for a limit, 400 for a malformed body). Limits left as None
+    take the module's MAX_* values.
+
+    Example:
+        form = parse_form(self.rfile, self.headers.get('Content-Length'),
+                          self.headers.get('Content-Type', ''))
+        form.get('name'), form.files.get('photo')
+    """
+    max_body = MAX_BODY if max_body is None else max_body
+    max_field = MAX_FIELD if max_field is None else max_field
+    max_fields = MAX_FIELDS if max_fields is None else max_fields
+    max_file = MAX_FILE if max_file is None else max_file
+
+    try:
+        length = int(content_length or 0)
+    except ValueError:
+        raise FormError(400, 'Invalid Content-Length')
+    if length < 0:
+        raise FormError(400, 'Invalid Content-Length')
+    if length > max_body:
+        raise FormError(413, f'Request body too large (limit {max_body} bytes)')
+
+    header = Message()
+    header['Content-Type'] = content_type or 'application/x-www-form-urlencoded'
+    chunks = _read_chunks(rfile, length)
+    if header.get_content_type() == 'multipart/form-data':
+        boundary = header.get_param('boundary')
+        if not boundary:
+            raise FormError(400, 'Multipart form without a boundary')
+        return _parse_multipart(chunks, boundary, max_field, max_fields, max_file)
+    return _parse_urlencoded(chunks, max_field, max_fields)
+
+
+def read_request_form(handler, **limits):
+    """
+    parse_form for the POST body of a BaseHTTPRequestHandler
+
+    On FormError the rest of the body is left unread, so the handler
+    is marked to close the connection after its error response.
+    """
+    try:
+        return parse_form(handler.rfile, handler.headers.get('Content-Length'),
+                          handler.headers.get('Content-Type', ''), **limits)
+    except FormError:
+        handler.close_connection = True
+        raise
+
+
+def _read_chunks(rfile, length):
+    remaining = length
+    while remaining:
+        data = rfile.read(min(CHUNK_SIZE, remaining))
+        if not data:
+            raise FormError(400, 'Request body ended early')
+        remaining -= len(data)
+        yield data
+
+
+def _decode(data):
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        raise FormError(400, 'Form data is not valid UTF-8')
+
+
+def _parse_urlencoded(chunks, max_field, max_fields):
+    form = FormData()
+    count = 0
+
+    def add(pair):
+        nonlocal count
+        if not pair:
+            return
+        if len(pair) > max_field:
+            raise FormError(413, f'Form field too large (limit {max_field} bytes)')
+        count += 1
+        if count > max_fields:
+            raise FormError(413, f'Too many form fields (limit {max_fields})')
+        for name, value in parse_qsl(_decode(pair)):
+            form.setdefault(name, value)
+
+    pending = b''       # a pair cut off at the end of the last chunk
+    for chunk in chunks:
+        pairs = (pending + chunk).split(b'&')
+        pending = pairs.pop()
+        for pair in pairs:
+            add(pair)
+        if len(pending) > max_field:
+            add(pending)    # raises
+    add(pending)
+    return form
+
+
+def _parse_multipart(chunks, boundary, max_field, max_fields, max_file):
+    # Every boundary but the first follows a CRLF; starting the buffer
+    # with one lets the same delimiter find them all
+    delimiter = b'\r\n--' + boundary.encode('latin-1')
+    buffer = bytearray(b'\r\n')
+    form = FormData()
+
+    def fill():
+        """Append the next chunk to buffer; False at the end of the body"""
+        chunk = next(chunks, None)
+        if chunk is None:
+            return False
+        buffer.extend(chunk)
+        return True
+
+    def need(more):
+        if not more:
+            raise FormError(400, 'Multipart body ended early')
+
+    # Skip the preamble
+    while (i := buffer.find(delimiter)) == -1:
+        del buffer[:max(0, len(buffer) - len(delimiter) + 1)]
+        need(fill())
+    del buffer[:i + len(delimiter)]
+
+    count = 0
+    upload = None       # temporary file of the part being read, until stored
+    try:
+        while True:
+            # After a boundary: "--" ends the body, CRLF starts a part
+            while len(buffer) < 2:
+                need(fill())
+            if buffer[:2] == b'--':
+                for _ in chunks:
+                    pass        # epilogue
+                return form
+            if buffer[:2] != b'\r\n':
+                raise FormError(400, 'Malformed multipart boundary')
+            del buffer[:2]
+
+            while (end := buffer.find(b'\r\n\r\n')) == -1:
+                if len(buffer) > MAX_PART_HEADERS:
+                    raise FormError(413, 'Multipart part headers too large')
+                need(fill())
+            headers = BytesHeaderParser().parsebytes(bytes(buffer[:end]))
+            del buffer[:end + 4]
+
+            count += 1
+            if count > max_fields:
+                raise FormError(413, f'Too many form fields (limit {max_fields})')
+            name = headers.get_param('name', header='content-disposition')
+            name = collapse_rfc2231_value(name) if name is not None else None
+            filename = headers.get_filename()
+            if filename is not None:
+                upload = tempfile.SpooledTemporaryFile(SPOOL_SIZE)
+                write, limit = upload.write, max_file
+            else:
+                value = bytearray()
+                write, limit = value.extend, max_field
+
+            # The part's data runs up to the next delimiter
+            size = 0
+            while True:
+                i = buffer.find(delimiter)
+                # Without a delimiter, keep what could be the start of one
+                take = i if i != -1 else len(buffer) - len(delimiter) + 1
+                if take > 0:
+                    size += take
+                    if size > limit:
+                        what = 'Uploaded file' if filename is not None else 'Form field'
+                        raise FormError(413, f'{what} too large (limit {limit} bytes)')
+                    write(buffer[:take])
+                    del buffer[:take]
+                if i != -1:
+                    del buffer[:len(delimiter)]
+                    break
+                need(fill())
+
+            if filename is None:
+                if name is not None:
+                    form.setdefault(name, _decode(bytes(value)))
+            elif name is not None and filename and name not in form.files:
+                form.files[name] = UploadedFile(filename, headers.get_content_type(), upload, size)
+            else:
+                upload.close()      # unnamed, empty file input, or a repeated name
+            upload = None
+    except BaseException:
+        if upload is not None:
+            upload.close()
+        form.close()
+        raise
@@ -0,0 +1,316 @@
+"""
+EPISODE 13 - ASSIGNMENT 1: Pooled server module (same as episode15)
+HTTPServer with a fixed pool of worker threads and a bounded queue
+"""
+
+import queue
+import selectors
+import socket
+import threading
+import time
+from http.server import HTTPServer
+
+WORKERS = 16            # threads serving connections
+QUEUE_SIZE = 64         # accepted connections waiting for a worker
+RETRY_AFTER = 1         # seconds, sent with 503 when the queue is full
+IDLE_TIMEOUT = 2        # socket timeout while a worker reads a request
+PARKED_TIMEOUT = 15     # keep-alive wait for the next request, without a worker
+
+
+def overloaded_response(retry_after):
+    """Bytes of the 503 sent when no worker will be free soon"""
+    body = b'Server busy, retry later\n'
+    return (b'HTTP/1.1 503 Service Unavailable\r\n'
+            b'Retry-After: %d\r\n'
+            b'Content-Type: text/plain; charset=utf-8\r\n'
+            b'Content-Length: %d\r\n'
+            b'Connection: close\r\n\r\n%s' % (retry_after, len(body), body))
+
+
+class _IdleConnections:
+    """
+    Parked keep-alive connections, waited on by one selector thread
+
+    A connection whose next request starts arriving goes back to the
+    server's queue (server.resume); one idle for timeout seconds is
+    closed. All connections get the same timeout, so the dict of
+    parked connections is in deadline order.
+    """
+
+    def __init__(self, server, timeout):
+        self._server = server
+        self._timeout = timeout
+        self._selector = selectors.DefaultSelector()
+        self._wakeup, self._waker = socket.socketpair()
+        self._wakeup.setblocking(False)
+        self._waker.setblocking(False)
+        self._selector.register(self._wakeup, selectors.EVENT_READ)
+        self._lock = threading.Lock()
+        self._incoming = []         # (request, client_address, served) to register
+        self._parked = {}           # request -> (client_address, served, deadline)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='http-idle', daemon=True)
+        self._thread.start()
+
+    def __len__(self):
+        return len(self._parked)
+
+    def add(self, request, client_address, served):
+        with self._lock:
+            if not self._closed:
+                self._incoming.append((request, client_address, served))
+                request = None
+        if request is not None:
+            self._server.close_connection(request)      # server closing
+            return
+        self._wake()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        self._wake()
+        self._thread.join()
+
+    def _wake(self):
+        try:
+            self._waker.send(b'\0')
+        except OSError:
+            pass        # buffer full: a wakeup is pending anyway
+
+    def _run(self):
+        while not self._closed:
+            now = time.monotonic()
+            while self._parked:
+                request = next(iter(self._parked))
+                if self._parked[request][2] > now:
+                    break
+                self._drop(request)
+                self._server.close_connection(request)
+
+            timeout = None
+            if self._parked:
+                timeout = next(iter(self._parked.values()))[2] - now
+            for key, _ in self._selector.select(timeout):
+                request = key.fileobj
+                if request is self._wakeup:
+                    self._register_incoming()
+                else:
+                    client_address, served, _ = self._drop(request)
+                    self._server.resume(request, client_address, served)
+
+        self._register_incoming()
+        for request in list(self._parked):
+            self._drop(request)
+            self._server.close_connection(request)
+        self._selector.close()
+        self._wakeup.close()
+        self._waker.close()
+
+    def _register_incoming(self):
+        try:
+            while self._wakeup.recv(4096):
+                pass
+        except OSError:
+            pass
+        with self._lock:
+            incoming, self._incoming = self._incoming, []
+        deadline = time.monotonic() + self._timeout
+        for request, client_address, served in incoming:
+            try:
+                self._selector.register(request, selectors.EVENT_READ)
+            except (ValueError, OSError):
+                self._server.close_connection(request)      # closed meanwhile
+                continue
+            self._parked[request] = (client_address, served, deadline)
+
+    def _drop(self, request):
+        self._selector.unregister(request)
+        return self._parked.pop(request)
+
+
+class PooledHTTPServer(HTTPServer):
+    """
+    HTTPServer served by a fixed number of worker threads
+
+    ThreadingHTTPServer starts a thread for every connection, however
+    many arrive. Here accepted connections wait in a bounded queue for
+    one of `workers` threads; when the queue is full the connection is
+    answered 503 with Retry-After straight away. Under overload latency
+    then levels off at roughly queue_size / throughput instead of
+    every request slowing down together.
+
+    A keep-alive connection does not hold a worker while idle: after
+    each response KeepAliveMixin parks it here (park()), and a selector
+    thread queues it again when its next request arrives, or closes it
+    after parked_timeout seconds. Idle browser tabs therefore cost a
+    socket, not a worker. A worker reading a request uses the short
+    idle_timeout, and saturated (every worker busy, connections
+    queued) makes KeepAliveMixin close the connection after the
+    current response.
+
+    stats() returns the counters: queue depth, busy workers, idle
+    (parked) connections, utilization, handled and rejected
+    connections.
+
+    Example:
+        server = PooledHTTPServer(('127.0.0.1', 5001), Handler, workers=8)
+        server.serve_forever()
+    """
+
+    daemon_threads = True
+    request_queue_size = 128    # listen backlog (socketserver default is 5)
+
+    def __init__(self, server_address, handler_class, workers=WORKERS,
+                 queue_size=QUEUE_SIZE, retry_after=RETRY_AFTER, idle_timeout=IDLE_TIMEOUT,
+                 parked_timeout=PARKED_TIMEOUT):
+        super().__init__(server_address, handler_class)
+        self.workers = workers
+        self.retry_after = retry_after
+        self.idle_timeout = idle_timeout
+        self._queue = queue.Queue(queue_size)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._busy_seconds = 0.0
+        self._parking = {}          # request -> requests served, set by park()
+        self._served = {}           # request -> requests served, for served_before()
+        self._idle = _IdleConnections(self, parked_timeout)
+
+        self.busy = 0               # workers serving a connection now
+        self.handled = 0            # connections served
+        self.rejected = 0           # connections answered 503
+        self.peak_queue_depth = 0
+
+        self._threads = [threading.Thread(target=self._work, name=f'http-worker-{i}', daemon=True)
+                         for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def saturated(self):
+        """True while every worker is busy and connections are waiting"""
+        return self.busy >= self.workers and not self._queue.empty()
+
+    def process_request(self, request, client_address):
+        """Queue the connection for a worker, or refuse it if the queue is full"""
+        try:
+            self._queue.put_nowait((request, client_address))
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+                self._served.pop(request, None)
+            self._reject(request)
+            return
+        depth = self._queue.qsize()
+        if depth > self.peak_queue_depth:
+            self.peak_queue_depth = depth
+
+    def park(self, request, requests_served):
+        """Take an idle keep-alive connection from its handler (KeepAliveMixin)"""
+        with self._lock:
+            self._parking[request] = requests_served
+
+    def served_before(self, request):
+        """Requests served on a resumed connection before it was parked"""
+        with self._lock:
+            return self._served.pop(request, 0)
+
+    def resume(self, request, client_address, requests_served):
+        """Queue a parked connection whose next request has arrived"""
+        with self._lock:
+            self._served[request] = requests_served
+        self.process_request(request, client_address)
+
+    def close_connection(self, request):
+        """Close a connection that has been served"""
+        self.shutdown_request(request)
+        with self._lock:
+            self.handled += 1
+
+    def _reject(self, request):
+        """Answer 503 without handing the connection to a worker"""
+        try:
+            # Read what already arrived, so closing doesn't reset the
+            # connection before the client sees the response
+            request.setblocking(False)
+            try:
+                request.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                pass
+            request.setblocking(True)
+            request.sendall(overloaded_response(self.retry_after))
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                # Pass the sentinel on to the next worker
+                try:
+                    self._queue.put_nowait(None)
+                except queue.Full:
+                    pass
+                return
+            request, client_address = item
+            with self._lock:
+                self.busy += 1
+            start = time.monotonic()
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                with self._lock:
+                    served = self._parking.pop(request, None)
+                if served is None:
+                    self.close_connection(request)
+                else:
+                    self._idle.add(request, client_address, served)
+                with self._lock:
+                    self.busy -= 1
+                    self._busy_seconds += time.monotonic() - start
+
+    def server_close(self):
+        """Close the socket, drop queued connections and let the workers exit"""
+        super().server_close()
+        self._idle.close()
+        # The queue may be full: close what is waiting rather than block
+        # behind it, then queue one sentinel the workers pass along
+        while True:
+            self._drop_queued()
+            try:
+                self._queue.put_nowait(None)
+                return
+            except queue.Full:
+                pass
+
+    def _drop_queued(self):
+        """Close every connection still waiting in the queue"""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                request, _ = item
+                with self._lock:
+                    self._served.pop(request, None)
+                self.shutdown_request(request)
+
+    def stats(self):
+        """Return queue depth, worker and connection counters"""
+        with self._lock:
+            elapsed = max(time.monotonic() - self._started, 1e-9)
+            return {
+                'workers': self.workers,
+                'busy_workers': self.busy,
+                'idle_connections': len(self._idle),
+                'queue_depth': self._queue.qsize(),
+                'queue_size': self._queue.maxsize,
+                'peak_queue_depth': self.peak_queue_depth,
+                'handled': self.handled,
+                'rejected': self.rejected,
+                # Share of worker time spent serving since start
+                'utilization': round(self._busy_seconds / (elapsed * self.workers), 3)
+            }
@@ -5,16 +5,20 @@ Complete implementation of variable scopes and data persistence
 
 import json
 import os
-from http.server import HTTPServer, BaseHTTPRequestHandler, ThreadingHTTPServer
-from urllib.parse import parse_qs
+from http.server import HTTPServer, BaseHTTPRequestHandler
 from threading import Lock
 import signal
 import sys
 from datetime import datetime
 import stores
+from repository import StudentRepository
+from keepalive import KeepAliveMixin
+from pooled_server import PooledHTTPServer
+from form_parser import FormError, read_request_form
+from schema import Field, Schema
 
 # Global variables (using LEGB rule)
-STUDENTS = []
+STUDENTS = StudentRepository()
 LOG_LOCK = Lock()
 
 def log_message(format_string, *args):
@@ -35,13 +39,31 @@ def log_message(format_string, *args):
         print(f"[{timestamp}] {message}")
 
 
-def create_validator():
+# Field checks for a new student, compiled once (see schema.py)
+STUDENT_SCHEMA = Schema([
+    Field('id', int, default='', min=1, range_error='Student ID must be positive',
+          type_error='Student ID must be a number',
+          unique_error='Student ID already exists'),
+    Field('name', required='Name must be 2-50 characters', min_length=2, max_length=50,
+          length_error='Name must be 2-50 characters'),
+    Field('grade', float, default='', min=0, max=100, range_error='Grade must be 0-100',
+          type_error='Grade must be a number'),
+])
+
+
+def create_validator(repository=None):
     """
     Factory function using closure pattern
     Demonstrates Enclosing scope and nonlocal keyword
     
     LEGB Rule: create_validator() creates an Enclosing scope
     Inner functions (validate_student) access this scope with nonlocal
+    
+    Args:
+        repository: optional StudentRepository. When given, duplicate IDs
+            are checked against it (O(1) index lookup) instead of the IDs
+            this validator has seen, so deleted IDs can be reused and IDs
+            loaded from file are known.
     """
     # Enclosing scope variable - accessible to inner function
     student_ids = set()
@@ -53,45 +75,24 @@ def create_validator():
         """
         nonlocal student_ids
         
-        errors = []
-        
-        # Validate ID
-        try:
-            student_id = int(student_data.get('id', ''))
-            if student_id in student_ids:
-                errors.append('Student ID already exists')
-            elif student_id < 1:
-                errors.append('Student ID must be positive')
-        except ValueError:
-            errors.append('Student ID must be a number')
-        
-        # Validate name
-        name = student_data.get('name', '')
-        if not name or len(name) < 2 or len(name) > 50:
-            errors.append('Name must be 2-50 characters')
+        # Validate all fields; IDs are checked against the known ones
+        known_ids = student_ids if repository is None else repository
+        values, errors = STUDENT_SCHEMA.clean(student_data, known_ids)
         
-        # Validate grade
-        try:
-            grade = float(student_data.get('grade', ''))
-            if grade < 0 or grade > 100:
-                errors.append('Grade must be 0-100')
-        except ValueError:
-            errors.append('Grade must be a number')
-        
-        if not errors and 'id' in student_data:
+        if not errors and repository is None:
             # Register the ID in enclosing scope
-            student_ids.add(int(student_data['id']))
+            student_ids.add(values['id'])
         
         return len(errors) == 0, errors
     
     return validate_student
 
 
-class StudentHandler(BaseHTTPRequestHandler):
+class StudentHandler(KeepAliveMixin, BaseHTTPRequestHandler):
     """Handler for student management requests"""
     
     # Class-level validator (shared across instances)
-    validator = create_validator()
+    validator = create_validator(STUDENTS)
     
     def do_POST(self):
         """Handle POST requests"""
@@ -112,8 +113,15 @@ class StudentHandler(BaseHTTPRequestHandler):
                         'grade': float(form_data['grade'])
                     }
                     
-                    # Modify global STUDENTS list
-                    STUDENTS.append(student)
+                    # Modify global STUDENTS repository (atomic duplicate check)
+                    if not STUDENTS.insert(student):
+                        response = {
+                            'status': 'error',
+                            'message': 'Validation failed',
+                            'errors': ['Student ID already exists']
+                        }
+                        self._send_json_response(response, 400)
+                        return
                     
                     # Persist to file
                     success = stores.save_students(STUDENTS)
@@ -141,6 +149,8 @@ class StudentHandler(BaseHTTPRequestHandler):
                     }
                     self._send_json_response(response, 400)
                     
+            except FormError as e:
+                self._send_json_response({'status': 'error', 'message': str(e)}, e.status)
             except Exception as e:
                 log_message("Error processing request: %s", str(e))
                 response = {
@@ -152,12 +162,8 @@ class StudentHandler(BaseHTTPRequestHandler):
             self._send_json_response({'status': 'error', 'message': 'Not found'}, 404)
     
     def _read_form(self):
-        """Read POST form data"""
-        content_length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(content_length)
-        body_string = body.decode('utf-8')
-        parsed = parse_qs(body_string)
-        return {k: v[0] for k, v in parsed.items()}
+        """Read POST form data (in chunks, with size limits; see form_parser.py)"""
+        return read_request_form(self)
     
     def _send_json_response(self, data, status_code=200):
         """Send JSON response"""
@@ -180,15 +186,16 @@ def handle_shutdown(signum, frame):
 
 if __name__ == '__main__':
     # Load existing students from file
-    STUDENTS = stores.load_students()
+    STUDENTS.load(stores.load_students())
     log_message("Loaded %d students from file", len(STUDENTS))
     
     # Setup signal handlers for graceful shutdown
     signal.signal(signal.SIGINT, handle_shutdown)
     signal.signal(signal.SIGTERM, handle_shutdown)
     
-    # Create ThreadingHTTPServer for handling multiple requests
-    server = ThreadingHTTPServer(('localhost', 8005), StudentHandler)
+    # Fixed worker pool; connections beyond its queue get 503 + Retry-After
+    StudentHandler.keep_alive = True
+    server = PooledHTTPServer(('localhost', 8005), StudentHandler)
     
     log_message("Student Management Server started on http://localhost:8005")
     log_message("Available endpoints: POST /add-student")
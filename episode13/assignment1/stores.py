@@ -33,7 +33,7 @@ def save_students(students):
     Save students to JSON file (thread-safe)
     
     Args:
-        students (list): List of student dictionaries
+        students (list): List of student dictionaries (or a StudentRepository)
     
     Returns:
         bool: True if successful, False otherwise
@@ -41,7 +41,7 @@ def save_students(students):
     try:
         with FILE_LOCK:
             with open(STUDENTS_FILE, 'w') as f:
-                json.dump(students, f, indent=2)
+                json.dump(list(students), f, indent=2)
         return True
     except IOError as e:
         print(f"Error saving students: {e}")
@@ -73,6 +73,43 @@ class TestVariableScopes(unittest.TestCase):
         self.assertTrue(any('positive' in e for e in errors))
 
 
+class TestStudentRepository(unittest.TestCase):
+    """Test indexed student repository"""
+
+    def test_insert_get_delete(self):
+        """Test O(1) operations keep insertion order"""
+        from repository import StudentRepository
+        repo = StudentRepository()
+
+        self.assertTrue(repo.insert({'id': 101, 'name': 'John', 'grade': 85.0}))
+        self.assertTrue(repo.insert({'id': 102, 'name': 'Jane', 'grade': 90.0}))
+        self.assertFalse(repo.insert({'id': 101, 'name': 'Dup', 'grade': 10.0}))
+
+        self.assertEqual(repo.get(102)['name'], 'Jane')
+        self.assertEqual(repo.update(101, grade=70.0)['grade'], 70.0)
+        self.assertEqual([s['id'] for s in repo], [101, 102])
+        self.assertEqual(repo[-1:], [repo.get(102)])
+
+        self.assertEqual(repo.delete(101)['name'], 'John')
+        self.assertIsNone(repo.get(101))
+        self.assertEqual(len(repo), 1)
+
+    def test_validator_uses_repository(self):
+        """Test validator checks IDs against the repository"""
+        from repository import StudentRepository
+        repo = StudentRepository([{'id': 101, 'name': 'John', 'grade': 85.0}])
+        validator = create_validator(repo)
+
+        is_valid, errors = validator({'id': '101', 'name': 'Jane', 'grade': '90'})
+        self.assertFalse(is_valid)
+        self.assertTrue(any('already exists' in e for e in errors))
+
+        # Deleted IDs can be reused
+        repo.delete(101)
+        is_valid, errors = validator({'id': '101', 'name': 'Jane', 'grade': '90'})
+        self.assertTrue(is_valid)
+
+
 class TestDataPersistence(unittest.TestCase):
     """Test data persistence"""
     
@@ -228,6 +265,32 @@ class TestStudentHandler(unittest.TestCase):
         response = requests.post(f'{self.base_url}/invalid')
         
         self.assertEqual(response.status_code, 404)
+    
+    def test_keep_alive_connection_reuse(self):
+        """Test keep-alive mode answers several requests on one connection"""
+        import http.client
+        handler = self.server.RequestHandlerClass
+        handler.keep_alive = True
+        conn = http.client.HTTPConnection('localhost', 8006, timeout=5)
+        try:
+            statuses = []
+            sock = None
+            for student_id in ('101', '101', '102'):
+                data = urlencode({'id': student_id, 'name': 'John Doe', 'grade': '85'})
+                conn.request('POST', '/add-student', data,
+                             {'Content-Type': 'application/x-www-form-urlencoded'})
+                response = conn.getresponse()
+                self.assertIsNotNone(response.getheader('Content-Length'))
+                json.loads(response.read())
+                statuses.append(response.status)
+                sock = sock or conn.sock
+                self.assertIs(conn.sock, sock)
+            self.assertEqual(statuses[0], 200)
+            self.assertNotEqual(statuses[1], 200)
+            self.assertEqual(statuses[2], 200)
+        finally:
+            del handler.keep_alive
+            conn.close()
 
 
 if __name__ == '__main__':
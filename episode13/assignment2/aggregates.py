@@ -0,0 +1,117 @@
+"""
+EPISODE 13 - ASSIGNMENT 2: Aggregates module (same as episode15)
+Incrementally maintained dashboard statistics
+"""
+
+import math
+import threading
+
+# Set True (e.g. in tests) to verify every read against a full recompute
+CHECK_CONSISTENCY = False
+
+PASS_GRADE = 60
+HIGH_ATTENDANCE = 80
+
+
+def _number(student, field):
+    """Read a numeric field the way the statistics code always has"""
+    return float(student.get(field, 0) or 0)
+
+
+class StatsAggregator:
+    """
+    Running sums and counts over all students
+
+    Instead of re-scanning every student on each dashboard hit, add()
+    and remove() adjust the counters by one student, so reading the
+    statistics is O(1). An edit is remove(old) + add(new).
+
+    Counters:
+        total, grade_sum, attendance_sum, pass_count,
+        high_attendance_count, fees_paid_count
+    """
+
+    FIELDS = ('total', 'grade_sum', 'attendance_sum', 'pass_count',
+              'high_attendance_count', 'fees_paid_count')
+
+    def __init__(self, students=()):
+        self._lock = threading.Lock()
+        self.reset()
+        for student in students:
+            self.add(student)
+
+    def reset(self):
+        """Zero all counters"""
+        with self._lock:
+            self._counters = dict.fromkeys(self.FIELDS, 0)
+
+    def _adjust(self, student, sign):
+        grade = _number(student, 'grade')
+        attendance = _number(student, 'attendance')
+        counters = self._counters
+        counters['total'] += sign
+        counters['grade_sum'] += sign * grade
+        counters['attendance_sum'] += sign * attendance
+        counters['pass_count'] += sign * (grade >= PASS_GRADE)
+        counters['high_attendance_count'] += sign * (attendance >= HIGH_ATTENDANCE)
+        counters['fees_paid_count'] += sign * bool(student.get('fees_paid'))
+
+    def add(self, student):
+        """Count a new student"""
+        with self._lock:
+            self._adjust(student, 1)
+
+    def remove(self, student):
+        """Un-count a removed student"""
+        with self._lock:
+            self._adjust(student, -1)
+
+    def apply(self, old, new):
+        """Apply one change: (None, s) add, (s, None) delete, (a, b) edit"""
+        with self._lock:
+            if old is not None:
+                self._adjust(old, -1)
+            if new is not None:
+                self._adjust(new, 1)
+
+    def rebuild(self, students):
+        """Recount from scratch (list of students or {key: student})"""
+        if isinstance(students, dict):
+            students = students.values()
+        with self._lock:
+            self._counters = dict.fromkeys(self.FIELDS, 0)
+            for student in students:
+                self._adjust(student, 1)
+
+    def snapshot(self):
+        """Return a copy of the counters"""
+        with self._lock:
+            counters = dict(self._counters)
+        if not counters['total']:
+            # Drop float residue left by add/remove cycles
+            counters['grade_sum'] = counters['attendance_sum'] = 0
+        return counters
+
+    def read(self, students):
+        """Return counters; with CHECK_CONSISTENCY, verify them first"""
+        if CHECK_CONSISTENCY:
+            self.check(students)
+        return self.snapshot()
+
+    @classmethod
+    def compute(cls, students):
+        """Full recompute of the counters (the old O(N) way)"""
+        aggregator = cls()
+        aggregator.rebuild(students)
+        return aggregator.snapshot()
+
+    def check(self, students):
+        """Raise AssertionError if counters differ from a full recompute"""
+        expected = self.compute(students)
+        actual = self.snapshot()
+        for field in self.FIELDS:
+            if not math.isclose(actual[field], expected[field], rel_tol=1e-9, abs_tol=1e-6):
+                raise AssertionError(
+                    f"Statistics out of sync: {field} is {actual[field]}, "
+                    f"full recompute gives {expected[field]}"
+                )
@@ -0,0 +1,75 @@
+"""
+EPISODE 13 - ASSIGNMENT 2: Cookie parser module (same as episode12)
+Read one cookie from a Cookie header without building a SimpleCookie
+"""
+
+from http.cookies import CookieError, SimpleCookie
+
+
+def get_cookie(header, name):
+    """
+    Value of cookie `name` in a Cookie request header, or None
+
+    Scans the header for "name=" at the start of a cookie pair and
+    slices out the value up to the next ';'. SimpleCookie instead runs
+    a regular expression over every pair and builds a Morsel for each,
+    only for one of them to be used.
+
+    Quoted values have their quotes removed. The rare value with
+    backslash escapes is handed to SimpleCookie, so it decodes the same
+    way. If the name appears twice, the last one wins, as with
+    SimpleCookie.
+
+    Example:
+        get_cookie('theme=dark; session_id=abc123', 'session_id')     # 'abc123'
+    """
+    if not header:
+        return None
+    key = name + '='
+    end = len(header)
+    while True:
+        i = header.rfind(key, 0, end)
+        if i == -1:
+            return None
+        # Only a match at the start of a pair counts ("xsession_id=" doesn't)
+        j = i
+        while j and header[j - 1] in ' \t':
+            j -= 1
+        if j == 0 or header[j - 1] == ';':
+            break
+        end = i
+
+    end = header.find(';', i)
+    value = header[i + len(key):end if end != -1 else len(header)].strip()
+    if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+        if '\\' in value:
+            return _simple_cookie_value(f'{key}{value}', name)
+        value = value[1:-1]
+    return value
+
+
+def _simple_cookie_value(header, name):
+    cookie = SimpleCookie()
+    try:
+        cookie.load(header)
+    except CookieError:
+        return None
+    morsel = cookie.get(name)
+    return morsel.value if morsel is not None else None
+
+
+def request_cookie(handler, name):
+    """
+    get_cookie for the request a BaseHTTPRequestHandler is serving
+
+    Each name is parsed at most once per request; the results are kept
+    on the handler until its next request (with keep-alive one handler
+    serves many), recognized by a new headers object.
+    """
+    cache = getattr(handler, '_cookie_cache', None)
+    if cache is None or cache[0] is not handler.headers:
+        cache = handler._cookie_cache = (handler.headers, {})
+    values = cache[1]
+    if name not in values:
+        values[name] = get_cookie(handler.headers.get('Cookie', ''), name)
+    return values[name]
@@ -3,136 +3,128 @@ EPISODE 13 - ASSIGNMENT 2: page.py module
 HTML template rendering with dynamic content
 """
 
+import zlib
 
-def render_base(title, content, flash_html=''):
-    """
-    Render base HTML structure
-    Demonstrates base template pattern
-    """
-    return f'''
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>{title}</title>
-        <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{ 
+# Shared stylesheet, inlined in every page or served as /static/app.css
+APP_CSS = '''
+            * { margin: 0; padding: 0; box-sizing: border-box; }
+            body { 
                 font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
                 background: #f5f5f5;
                 color: #333;
-            }}
-            nav {{
+            }
+            nav {
                 background: #2c3e50;
                 padding: 1rem;
                 color: white;
-            }}
-            nav a {{
+            }
+            nav a {
                 color: white;
                 text-decoration: none;
                 margin-right: 1.5rem;
                 transition: opacity 0.3s;
-            }}
-            nav a:hover {{
+            }
+            nav a:hover {
                 opacity: 0.8;
-            }}
-            .container {{
+            }
+            .container {
                 max-width: 1000px;
                 margin: 2rem auto;
                 padding: 0 1rem;
-            }}
-            .alert {{
+            }
+            .alert {
                 padding: 1rem;
                 margin: 1rem 0;
                 border-radius: 4px;
                 animation: slideIn 0.3s ease-in;
-            }}
-            .alert-success {{
+            }
+            .alert-success {
                 background: #d4edda;
                 color: #155724;
                 border: 1px solid #c3e6cb;
-            }}
-            .alert-error {{
+            }
+            .alert-error {
                 background: #f8d7da;
                 color: #721c24;
                 border: 1px solid #f5c6cb;
-            }}
-            .card {{
+            }
+            .card {
                 background: white;
                 border-radius: 4px;
                 padding: 1.5rem;
                 box-shadow: 0 1px 3px rgba(0,0,0,0.1);
                 margin: 1rem 0;
-            }}
-            .stats {{
+            }
+            .stats {
                 display: grid;
                 grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
                 gap: 1rem;
                 margin: 1rem 0;
-            }}
-            .stat-box {{
+            }
+            .stat-box {
                 background: white;
                 padding: 1.5rem;
                 border-left: 4px solid #3498db;
                 box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-            }}
-            .stat-value {{
+            }
+            .stat-value {
                 font-size: 2rem;
                 font-weight: bold;
                 color: #3498db;
-            }}
-            .stat-label {{
+            }
+            .stat-label {
                 color: #666;
                 font-size: 0.9rem;
                 margin-top: 0.5rem;
-            }}
-            table {{
+            }
+            table {
                 width: 100%;
                 border-collapse: collapse;
                 background: white;
                 margin: 1rem 0;
-            }}
-            th {{
+            }
+            th {
                 background: #f8f9fa;
                 padding: 1rem;
                 text-align: left;
                 font-weight: 600;
                 border-bottom: 2px solid #dee2e6;
-            }}
-            td {{
+            }
+            td {
                 padding: 1rem;
                 border-bottom: 1px solid #dee2e6;
-            }}
-            tr:hover {{
+            }
+            tr:hover {
                 background: #f9f9f9;
-            }}
-            form {{
+            }
+            form {
                 background: white;
                 padding: 1.5rem;
                 border-radius: 4px;
                 box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-            }}
-            .form-group {{
+            }
+            .form-group {
                 margin: 1rem 0;
-            }}
-            label {{
+            }
+            label {
                 display: block;
                 margin-bottom: 0.5rem;
                 font-weight: 500;
-            }}
-            input, textarea {{
+            }
+            input, textarea {
                 width: 100%;
                 padding: 0.5rem;
                 border: 1px solid #ddd;
                 border-radius: 4px;
                 font-size: 1rem;
                 font-family: inherit;
-            }}
-            input:focus {{
+            }
+            input:focus {
                 outline: none;
                 border-color: #3498db;
                 box-shadow: 0 0 0 3px rgba(52, 152, 219, 0.1);
-            }}
-            button {{
+            }
+            button {
                 background: #3498db;
                 color: white;
                 border: none;
@@ -142,17 +134,17 @@ def render_base(title, content, flash_html=''):
                 font-size: 1rem;
                 transition: background 0.3s;
                 margin-right: 0.5rem;
-            }}
-            button:hover {{
+            }
+            button:hover {
                 background: #2980b9;
-            }}
-            button.danger {{
+            }
+            button.danger {
                 background: #e74c3c;
-            }}
-            button.danger:hover {{
+            }
+            button.danger:hover {
                 background: #c0392b;
-            }}
-            a.btn {{
+            }
+            a.btn {
                 display: inline-block;
                 background: #3498db;
                 color: white;
@@ -160,21 +152,36 @@ def render_base(title, content, flash_html=''):
                 padding: 0.75rem 1.5rem;
                 border-radius: 4px;
                 transition: background 0.3s;
-            }}
-            a.btn:hover {{
+            }
+            a.btn:hover {
                 background: #2980b9;
-            }}
-            a.btn.danger {{
+            }
+            a.btn.danger {
                 background: #e74c3c;
-            }}
-            a.btn.danger:hover {{
+            }
+            a.btn.danger:hover {
                 background: #c0392b;
-            }}
-            @keyframes slideIn {{
-                from {{ transform: translateY(-10px); opacity: 0; }}
-                to {{ transform: translateY(0); opacity: 1; }}
-            }}
-        </style>
+            }
+            @keyframes slideIn {
+                from { transform: translateY(-10px); opacity: 0; }
+                to { transform: translateY(0); opacity: 1; }
+            }
+        '''
+APP_CSS_BYTES = APP_CSS.encode('utf-8')
+
+# Set True to link /static/app.css (cached by browsers) instead of
+# inlining APP_CSS in every page. The ?v= hash changes with the CSS,
+# so the stylesheet can be cached for a long time.
+EXTERNAL_CSS = False
+APP_CSS_URL = '/static/app.css?v=%08x' % zlib.crc32(APP_CSS_BYTES)
+
+# Static pieces of the base template, built once at import
+BASE_HEAD_START = '''
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>'''
+_BASE_BODY_START = '''
     </head>
     <body>
         <nav>
@@ -186,15 +193,39 @@ def render_base(title, content, flash_html=''):
             </div>
         </nav>
         <div class="container">
-            {flash_html}
-            {content}
-        </div>
-    </body>
-    </html>
-    '''
+            '''
+# Everything between the title and the flash message, keyed by EXTERNAL_CSS
+BASE_HEAD_END = {
+    False: '</title>\n        <style>' + APP_CSS + '</style>' + _BASE_BODY_START,
+    True: f'</title>\n        <link rel="stylesheet" href="{APP_CSS_URL}">' + _BASE_BODY_START,
+}
+BASE_FLASH_END = '\n            '
+BASE_TAIL = '\n        </div>\n    </body>\n    </html>\n    '
+
+# Pre-encoded copies for render_base(..., as_parts=True)
+BASE_HEAD_START_BYTES = BASE_HEAD_START.encode('utf-8')
+BASE_HEAD_END_BYTES = {external: head.encode('utf-8') for external, head in BASE_HEAD_END.items()}
+BASE_FLASH_END_BYTES = BASE_FLASH_END.encode('utf-8')
+BASE_TAIL_BYTES = BASE_TAIL.encode('utf-8')
+
+
+def render_base(title, content, flash_html='', as_parts=False):
+    """
+    Render base HTML structure
+    Demonstrates base template pattern
+
+    The static layout is built once at import. With as_parts=True,
+    returns a list of byte strings for wfile.writelines(): only the
+    title, flash message and content are encoded per call.
+    """
+    if as_parts:
+        return [BASE_HEAD_START_BYTES, title.encode('utf-8'), BASE_HEAD_END_BYTES[EXTERNAL_CSS],
+                flash_html.encode('utf-8'), BASE_FLASH_END_BYTES, content.encode('utf-8'), BASE_TAIL_BYTES]
+    return (BASE_HEAD_START + title + BASE_HEAD_END[EXTERNAL_CSS]
+            + flash_html + BASE_FLASH_END + content + BASE_TAIL)
 
 
-def render_home(students, statistics):
+def render_home(students, statistics, as_parts=False):
     """
     Render home/dashboard page with statistics
     Demonstrates dynamic content injection
@@ -244,10 +275,10 @@ def render_home(students, statistics):
     {student_html}
     '''
     
-    return render_base('Dashboard', content)
+    return render_base('Dashboard', content, as_parts=as_parts)
 
 
-def render_student_list(students, flash_html=''):
+def render_student_list(students, flash_html='', as_parts=False):
     """Render list of all students"""
     if students:
         rows = ''
@@ -282,10 +313,10 @@ def render_student_list(students, flash_html=''):
         table = '<p>No students found. <a href="/add">Add a student</a></p>'
     
     content = f'<h1>Students</h1>{table}'
-    return render_base('Students', content, flash_html)
+    return render_base('Students', content, flash_html, as_parts)
 
 
-def render_add_form(flash_html=''):
+def render_add_form(flash_html='', as_parts=False):
     """Render add student form"""
     content = '''
     <h1>Add Student</h1>
@@ -306,10 +337,10 @@ def render_add_form(flash_html=''):
         <a href="/students" class="btn" style="display: inline-block;">Cancel</a>
     </form>
     '''
-    return render_base('Add Student', content, flash_html)
+    return render_base('Add Student', content, flash_html, as_parts)
 
 
-def render_edit_form(student, flash_html=''):
+def render_edit_form(student, flash_html='', as_parts=False):
     """Render edit student form"""
     content = f'''
     <h1>Edit Student</h1>
@@ -327,10 +358,10 @@ def render_edit_form(student, flash_html=''):
         <a href="/students" class="btn" style="display: inline-block;">Cancel</a>
     </form>
     '''
-    return render_base('Edit Student', content, flash_html)
+    return render_base('Edit Student', content, flash_html, as_parts)
 
 
-def render_error(message):
+def render_error(message, as_parts=False):
     """Render error page"""
     content = f'<h1>Error</h1><p>{message}</p>'
-    return render_base('Error', content)
+    return render_base('Error', content, as_parts=as_parts)
@@ -0,0 +1,114 @@
+"""
+EPISODE 13 - ASSIGNMENT 2: Page cache module (same as episode15)
+LRU cache of rendered, encoded pages with a byte-size cap
+"""
+
+import threading
+from collections import OrderedDict
+
+MAX_BYTES = 8 * 1024 * 1024     # total size of cached pages
+
+
+class PageCache:
+    """
+    Rendered pages as UTF-8 bytes, least recently used evicted first
+
+    Keys are (renderer, arguments, data version) tuples. A page is only
+    valid for the version it was rendered from, so a change to the data
+    simply makes old keys unreachable; clear() (run after every save)
+    frees their memory straight away. A hit costs one dict lookup.
+
+    Pages larger than max_entry_bytes are never cached, so one huge
+    page cannot flush everything else out.
+
+    Example:
+        cache = PageCache()
+        body = cache.render(('dashboard', version), lambda: page.render_dashboard(...))
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES, max_entry_bytes=None):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes // 8 if max_entry_bytes is None else max_entry_bytes
+        self._lock = threading.Lock()
+        self._pages = OrderedDict()     # key -> bytes, oldest first
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cached page for key, or None"""
+        with self._lock:
+            body = self._pages.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._pages.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key, body):
+        """Cache body (bytes) under key; return False if it is too large"""
+        if len(body) > self.max_entry_bytes:
+            return False
+        with self._lock:
+            old = self._pages.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._pages[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._pages.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+        return True
+
+    def render(self, key, render):
+        """
+        Return the page for key, calling render() on a miss
+
+        render() returns a str or a list of byte strings (as_parts).
+        """
+        body = self.get(key)
+        if body is None:
+            page = render()
+            body = page.encode('utf-8') if isinstance(page, str) else b''.join(page)
+            self.put(key, body)
+        return body
+
+    def capture(self, key, chunks):
+        """
+        Pass a stream of byte chunks through, caching the whole page
+
+        The page is cached once the stream ends, unless it grew past
+        max_entry_bytes (then collecting stops and memory stays flat).
+        """
+        collected = []
+        size = 0
+        for chunk in chunks:
+            if collected is not None:
+                size += len(chunk)
+                if size > self.max_entry_bytes:
+                    collected = None
+                else:
+                    collected.append(chunk)
+            yield chunk
+        if collected is not None:
+            self.put(key, b''.join(collected))
+
+    def clear(self, *args):
+        """Drop every page (accepts and ignores listener arguments)"""
+        with self._lock:
+            self._pages.clear()
+            self.size = 0
+
+    def stats(self):
+        """Return hit/miss/eviction counters and current size"""
+        with self._lock:
+            return {
+                'pages': len(self._pages),
+                'bytes': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,145 @@
+"""
+EPISODE 13 - ASSIGNMENT 2: Student repository (same as assignment1)
+Thread-safe in-memory student collection indexed by id
+"""
+
+from itertools import islice
+from threading import RLock
+
+
+class StudentRepository:
+    """
+    Insertion-ordered student collection with an index on 'id'
+
+    Students live in one dict keyed by id. Python dicts keep insertion
+    order, so the dict is both the ordered list and the index:
+    get/insert/update/delete are O(1) and iteration is in the order the
+    students were added. All methods hold one lock, so the repository is
+    safe to share between ThreadingHTTPServer request threads.
+
+    The list-style methods (append, clear, len, iteration, indexing)
+    keep code written for a plain STUDENTS list working.
+
+    Listeners registered with add_listener(callback) are called as
+    callback(old, new) after every change, under the lock:
+    (None, student) on insert, (old, new) on update and
+    (student, None) on delete.
+
+    Student dicts are replaced, never edited in place, so a student
+    handed out (e.g. to a background save) doesn't change under its
+    reader.
+
+    Example:
+        repo = StudentRepository()
+        repo.insert({'id': 101, 'name': 'John', 'grade': 85.0})
+        repo.get(101)       # {'id': 101, ...}
+        repo.delete(101)    # returns the removed student
+    """
+
+    def __init__(self, students=()):
+        self._lock = RLock()
+        self._by_id = {}
+        self._listeners = []
+        self.load(students)
+
+    def add_listener(self, callback):
+        """Call callback(old, new) after every change"""
+        self._listeners.append(callback)
+
+    def _notify(self, old, new):
+        for callback in self._listeners:
+            callback(old, new)
+
+    def load(self, students):
+        """Replace all students (e.g. with stores.load_students())"""
+        with self._lock:
+            self.clear()
+            for student in students:
+                self._by_id[student['id']] = student
+                self._notify(None, student)
+
+    def get(self, student_id):
+        """Return student with this id, or None"""
+        return self._by_id.get(student_id)
+
+    def insert(self, student):
+        """
+        Add a student at the end
+
+        Returns:
+            bool: False if a student with the same id already exists
+        """
+        with self._lock:
+            if student['id'] in self._by_id:
+                return False
+            self._by_id[student['id']] = student
+            self._notify(None, student)
+            return True
+
+    def update(self, student_id, **fields):
+        """Replace a student with a copy with fields updated, return it (None if missing)"""
+        with self._lock:
+            old = self._by_id.get(student_id)
+            if old is None:
+                return None
+            student = {**old, **fields}
+            self._by_id[student_id] = student
+            self._notify(old, student)
+            return student
+
+    def delete(self, student_id):
+        """Remove a student, return it (None if missing)"""
+        with self._lock:
+            student = self._by_id.pop(student_id, None)
+            if student is not None:
+                self._notify(student, None)
+            return student
+
+    def append(self, student):
+        """List-style insert (raises ValueError on duplicate id)"""
+        if not self.insert(student):
+            raise ValueError(f"Student {student['id']} already exists")
+
+    def clear(self):
+        """Remove all students"""
+        with self._lock:
+            removed = list(self._by_id.values())
+            self._by_id.clear()
+            for student in removed:
+                self._notify(student, None)
+
+    def to_list(self):
+        """Return a snapshot list of students in insertion order"""
+        with self._lock:
+            return list(self._by_id.values())
+
+    def __contains__(self, student_id):
+        return student_id in self._by_id
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        # Iterate a snapshot so other threads can add/delete meanwhile
+        return iter(self.to_list())
+
+    def __getitem__(self, index):
+        """List-style indexing and slicing in insertion order"""
+        if isinstance(index, slice) and index.step is None and index.stop is None \
+                and index.start is not None and index.start < 0:
+            # students[-5:] -> walk from the end instead of copying everything
+            with self._lock:
+                tail = list(islice(reversed(self._by_id.values()), -index.start))
+            tail.reverse()
+            return tail
+        return self.to_list()[index]
+
+    def __eq__(self, other):
+        if isinstance(other, StudentRepository):
+            return self.to_list() == other.to_list()
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f'StudentRepository({self.to_list()!r})'
@@ -0,0 +1,174 @@
+"""
+EPISODE 13 - ASSIGNMENT 2: Schema module (same as episode15)
+Form validation declared as fields and compiled into one generated function
+"""
+
+_TYPES = {str: 'str', int: 'int', float: 'float'}
+
+
+class Field:
+    """
+    One form field: how to read it, convert it and check it
+
+    Checks run in this order and the first failing one gives the
+    field's error, so each field reports at most one:
+    - required: message if the value is missing or empty. A field
+      that isn't required and is missing takes `default`; with no
+      default it is skipped
+    - min_length / max_length on the text (length_error)
+    - contains: a substring the text must have (contains_error)
+    - type int or float: conversion (type_error), then min / max on
+      the number (range_error)
+    - unique_error: message if the value is in the `existing`
+      container passed to the validator
+
+    strip=True strips whitespace from the text before any check.
+    """
+
+    def __init__(self, name, type=str, required=None, default=None, strip=False,
+                 min_length=None, max_length=None, length_error=None,
+                 contains=None, contains_error=None,
+                 min=None, max=None, range_error=None, type_error=None,
+                 unique_error=None):
+        if type not in _TYPES:
+            raise ValueError(f'Unsupported field type: {type!r}')
+        self.name = name
+        self.type = type
+        self.required = required
+        self.default = default
+        self.strip = strip
+        self.min_length = min_length
+        self.max_length = max_length
+        self.length_error = length_error or f'{name} has an invalid length'
+        self.contains = contains
+        self.contains_error = contains_error or f'{name} must contain {contains}'
+        self.min = min
+        self.max = max
+        self.range_error = range_error or f'{name} is out of range'
+        self.type_error = type_error or f'{name} must be a valid number'
+        self.unique_error = unique_error
+
+
+class Schema:
+    """
+    Validator compiled from a list of Fields
+
+    The fields are turned into the source of one straight-line Python
+    function, compiled once when the schema is created: no loop over
+    fields or per-check dispatch at validation time, just the same
+    if/elif chain one would write by hand. Every field is checked, so
+    one call returns all the errors, in field order.
+
+    - validate(data, existing=None) returns the list of errors
+    - clean(data, existing=None) returns (values, errors), values
+      being the converted fields that passed
+    existing is what unique_error fields are checked against (any
+    container supporting `in`); None skips those checks.
+
+    The generated source is kept in .source for reading.
+
+    Example:
+        STUDENT = Schema([
+            Field('name', required='Name is required', min_length=2, max_length=50),
+            Field('grade', float, default='', min=0, max=100, type_error='Grade must be a number'),
+        ])
+        errors = STUDENT.validate({'name': 'Ann', 'grade': '101'})
+        # ['grade is out of range']
+    """
+
+    def __init__(self, fields):
+        self.fields = list(fields)
+        self.source = (self._function('validate', False) + '\n\n'
+                       + self._function('clean', True))
+        namespace = {}
+        exec(compile(self.source, f'<schema {id(self):#x}>', 'exec'), namespace)
+        self.validate = namespace['validate']
+        self.clean = namespace['clean']
+
+    def _function(self, name, keep_values):
+        lines = [f'def {name}(data, existing=None):',
+                 '    errors = []']
+        if keep_values:
+            lines.append('    values = {}')
+        for field in self.fields:
+            lines.extend('    ' + line for line in self._field(field, keep_values))
+        lines.append('    return values, errors' if keep_values else '    return errors')
+        return '\n'.join(lines) + '\n'
+
+    def _field(self, field, keep_values):
+        """Source lines (unindented) checking one field into `errors`"""
+        if field.required is None and field.default is None:
+            lines = [f'v = data.get({field.name!r})', 'if v is not None:']
+            body = self._checks(field, keep_values)
+            return lines + ['    ' + line for line in body]
+        default = '' if field.default is None else field.default
+        get = f'data.get({field.name!r}, {default!r})'
+        if field.strip:
+            get += '.strip()'
+        return [f'v = {get}'] + self._checks(field, keep_values)
+
+    def _checks(self, field, keep_values):
+        lines = []
+        if field.strip and field.required is None and field.default is None:
+            lines.append('v = v.strip()')
+
+        # An if/elif chain: the first failing check reports
+        branches = []
+        if field.required is not None:
+            branches.append(('not v', field.required))
+        length = []
+        if field.min_length is not None:
+            length.append(f'len(v) < {field.min_length!r}')
+        if field.max_length is not None:
+            length.append(f'len(v) > {field.max_length!r}')
+        if length:
+            branches.append((' or '.join(length), field.length_error))
+        if field.contains is not None:
+            branches.append((f'{field.contains!r} not in v', field.contains_error))
+
+        tail = self._converted(field, keep_values)
+        for i, (condition, message) in enumerate(branches):
+            lines.append(f'{"if" if i == 0 else "elif"} {condition}:')
+            lines.append(f'    errors.append({message!r})')
+        if branches and tail:
+            lines.append('else:')
+            lines.extend('    ' + line for line in tail)
+        else:
+            lines.extend(tail)
+        return lines or ['pass']
+
+    def _converted(self, field, keep_values):
+        """Lines for conversion, range and uniqueness of a text value v"""
+        branches = []
+        bounds = []
+        if field.min is not None:
+            bounds.append(f'v < {field.min!r}')
+        if field.max is not None:
+            bounds.append(f'v > {field.max!r}')
+        if bounds:
+            branches.append((' or '.join(bounds), field.range_error))
+        if field.unique_error is not None:
+            branches.append(('existing is not None and v in existing', field.unique_error))
+
+        checks = []
+        for i, (condition, message) in enumerate(branches):
+            checks.append(f'{"if" if i == 0 else "elif"} {condition}:')
+            checks.append(f'    errors.append({message!r})')
+        store = [f'values[{field.name!r}] = v'] if keep_values else []
+        if store:
+            if checks:
+                checks.append('else:')
+                checks.extend('    ' + line for line in store)
+            else:
+                checks = store
+
+        if field.type is str:
+            return checks
+        lines = ['try:',
+                 f'    v = {_TYPES[field.type]}(v)',
+                 'except ValueError:',
+                 f'    errors.append({field.type_error!r})']
+        if checks:
+            lines.append('else:')
+            lines.extend('    ' + line for line in checks)
+        return lines
@@ -0,0 +1,209 @@
+"""
+EPISODE 13 - ASSIGNMENT 2: Session store module (same as episode12)
+Server-side sessions with TTL expiry, LRU capacity and a background sweeper
+"""
+
+import heapq
+import threading
+import time
+from collections import OrderedDict
+
+TTL = 3600                  # seconds of inactivity before a session expires
+MAX_ENTRIES = 100000        # sessions kept; the least recently used go first
+SWEEP_INTERVAL = 60         # seconds between background sweeps
+HEAP_SLACK = 1024           # stale heap items allowed beyond 2x the live entries
+
+
+class _Entry:
+    __slots__ = ('value', 'ttl', 'expires', 'scheduled')
+
+    def __init__(self, value, ttl, expires):
+        self.value = value
+        self.ttl = ttl
+        self.expires = expires      # last activity + ttl
+        self.scheduled = expires    # time of this entry's item in the heap
+
+
+class SessionStore:
+    """
+    Dict-like store whose entries expire after ttl seconds of inactivity
+
+    - store[key] (and get) returns the value and slides its expiry:
+      the entry lives another ttl seconds from now
+    - key in store checks without sliding
+    - an expired entry is gone for every lookup straight away; the
+      memory is freed by sweep(), run by the sweeper thread
+    - at max_entries, adding a session evicts the least recently used
+
+    Entries sit in an OrderedDict in least-recently-used order, so LRU
+    eviction is O(1). Expiry times go into a heap. An entry used since
+    it was scheduled is only rescheduled when its old time comes up, so
+    a request never touches the heap and each sweep only visits entries
+    that are due. Evicted, deleted and replaced entries leave stale
+    heap items behind; once those outnumber the live entries (plus
+    HEAP_SLACK) the heap is rebuilt, so memory stays bounded by
+    max_entries.
+
+    stats() returns the gauges: live sessions, capacity, peak, and
+    counts of sessions created, expired and evicted.
+
+    Example:
+        SESSIONS = SessionStore(ttl=3600)
+        SESSIONS.start_sweeper()
+        SESSIONS[session_id] = {'username': 'admin'}
+        session = SESSIONS.get(session_id)      # None once expired
+    """
+
+    def __init__(self, ttl=TTL, max_entries=MAX_ENTRIES, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()   # key -> _Entry, least recently used first
+        self._heap = []                 # (scheduled time, key); stale items are skipped
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._sweeper = None
+
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+        self.peak = 0
+
+    def _live(self, key, now):
+        """Entry for key, or None if missing or expired (then dropped)"""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires <= now:
+            del self._entries[key]
+            self.expired += 1
+            return None
+        return entry
+
+    def __getitem__(self, key):
+        with self._lock:
+            now = self._clock()
+            entry = self._live(key, now)
+            if entry is None:
+                raise KeyError(key)
+            entry.expires = now + entry.ttl
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._live(key, self._clock()) is not None
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def set(self, key, value, ttl=None):
+        """Store value under key for ttl seconds of inactivity (default: self.ttl)"""
+        ttl = ttl or self.ttl
+        with self._lock:
+            expires = self._clock() + ttl
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.value, entry.ttl, entry.expires = value, ttl, expires
+                self._entries.move_to_end(key)
+                if expires >= entry.scheduled:
+                    return
+            else:
+                while len(self._entries) >= self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evicted += 1
+                entry = self._entries[key] = _Entry(value, ttl, expires)
+                self.created += 1
+                self.peak = max(self.peak, len(self._entries))
+            entry.scheduled = expires
+            heapq.heappush(self._heap, (expires, key))
+            if len(self._heap) > 2 * len(self._entries) + HEAP_SLACK:
+                self._rebuild_heap()
+
+    def _rebuild_heap(self):
+        """Heap with exactly one item per entry (drops stale items)"""
+        heap = []
+        for key, entry in self._entries.items():
+            entry.scheduled = entry.expires
+            heap.append((entry.expires, key))
+        heapq.heapify(heap)
+        self._heap = heap
+
+    def __delitem__(self, key):
+        with self._lock:
+            del self._entries[key]
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._live(key, self._clock())
+            if entry is None:
+                return default
+            del self._entries[key]
+            return entry.value
+
+    def __len__(self):
+        with self._lock:
+            self.sweep()
+            return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._heap.clear()
+
+    def sweep(self):
+        """Drop every expired entry; return how many were dropped"""
+        removed = 0
+        with self._lock:
+            now = self._clock()
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                scheduled, key = heapq.heappop(heap)
+                entry = self._entries.get(key)
+                if entry is None or entry.scheduled != scheduled:
+                    continue        # deleted, or replaced by a newer item
+                if entry.expires > now:
+                    # Used since it was scheduled: check again when due
+                    entry.scheduled = entry.expires
+                    heapq.heappush(heap, (entry.expires, key))
+                    continue
+                del self._entries[key]
+                removed += 1
+            self.expired += removed
+        return removed
+
+    def start_sweeper(self, interval=SWEEP_INTERVAL):
+        """Run sweep() every interval seconds in a daemon thread"""
+        if self._sweeper is not None:
+            return
+        self._stop.clear()
+        self._sweeper = threading.Thread(target=self._sweep_loop, args=(interval,),
+                                         name='session-sweeper', daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        if self._sweeper is not None:
+            self._stop.set()
+            self._sweeper.join()
+            self._sweeper = None
+
+    def _sweep_loop(self, interval):
+        while not self._stop.wait(interval):
+            self.sweep()
+
+    def stats(self):
+        """Return the live-session gauges and lifetime counters"""
+        with self._lock:
+            self.sweep()
+            return {
+                'live': len(self._entries),
+                'capacity': self.max_entries,
+                'peak': self.peak,
+                'created': self.created,
+                'expired': self.expired,
+                'evicted': self.evicted
+            }
@@ -0,0 +1,123 @@
+"""
+EPISODE 13 - ASSIGNMENT 2: Snapshot module (same as episode15)
+Crash-safe JSON snapshot writes with group commit
+"""
+
+import json
+import os
+import threading
+import time
+
+
+def write_json_atomic(path, data, indent=None):
+    """
+    Write data as JSON to path without ever leaving a partial file
+
+    The JSON goes to path + '.tmp', is fsynced, then os.replace()d over
+    path. A crash at any point leaves either the old or the new file.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    # Make the rename itself durable
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class _Round:
+    """One physical write and the outcome shared by the saves it covers"""
+
+    def __init__(self):
+        self.done = False
+        self.result = None
+        self.error = None
+
+
+class GroupCommit:
+    """
+    Merge concurrent saves into one physical write
+
+    The first caller becomes the leader: it waits `window` seconds for
+    other saves to arrive, then calls write() once with the newest data.
+    Callers that arrive meanwhile block until a write that includes
+    their data has finished, then return that write's result (or raise
+    its error). Every caller returns only once its data is on disk.
+
+    Example:
+        committer = GroupCommit(lambda data: write_json_atomic('x.json', data), 0.005)
+        committer.commit(students)
+    """
+
+    def __init__(self, write, window=0.005):
+        self.write = write
+        self.window = window
+
+        self._cond = threading.Condition()
+        self._pending = None        # newest data waiting to be written
+        self._requested = 0         # ticket of newest commit() call
+        self._next = _Round()       # the write that will cover new saves
+        self._writing = False       # a leader is active
+
+        # Counters (for monitoring / tests)
+        self.requests = 0
+        self.writes = 0
+
+    def commit(self, data):
+        """Save data, return write()'s result once it is durable"""
+        with self._cond:
+            self._requested += 1
+            self.requests += 1
+            self._pending = data
+            # Each round keeps its own outcome, so a round that ends
+            # before this caller wakes can't overwrite the one it gets
+            own = self._next
+
+            if self._writing:
+                # Follower: the active leader will pick up our data
+                while not own.done:
+                    self._cond.wait()
+                return self._outcome(own)
+
+            self._writing = True
+
+        # Leader: give concurrent saves a moment to join this write
+        if self.window:
+            time.sleep(self.window)
+
+        while True:
+            with self._cond:
+                data = self._pending
+                covered = self._requested
+                current = self._next
+                self._pending = None
+                self._next = _Round()
+
+            try:
+                current.result = self.write(data)
+            except Exception as e:
+                current.error = e
+
+            with self._cond:
+                self.writes += 1
+                current.done = True
+                self._cond.notify_all()
+
+                # Saves that arrived during the write need another round
+                if self._requested == covered:
+                    self._writing = False
+                    return self._outcome(own)
+
+    @staticmethod
+    def _outcome(round_):
+        """Return the round's result or raise its error"""
+        if round_.error is not None:
+            raise round_.error
+        return round_.result
@@ -3,147 +3,208 @@ EPISODE 13 - ASSIGNMENT 2: Solution
 Complete implementation with HTTP routing, PRG pattern, and templates
 """
 
-from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from http.server import BaseHTTPRequestHandler
 from urllib.parse import parse_qs, urlparse
 from http.cookies import SimpleCookie
 import json
 import uuid
 from datetime import datetime
 import stores
+import router
 import page
+from repository import StudentRepository
+from aggregates import StatsAggregator
+from conditional import DataVersion, etag_matches
+from page_cache import PageCache
+from keepalive import KeepAliveMixin
+from pooled_server import PooledHTTPServer
+from sessions import SessionStore
+from cookie_parser import request_cookie
+from form_parser import FormError, read_request_form
+from schema import Field, Schema
 
 # Global variables
-STUDENTS = []
-FLASH_MESSAGES = {}
+STUDENTS = StudentRepository()
+# Running dashboard statistics, kept up to date on every add/edit/delete
+STATS = StatsAggregator()
+STUDENTS.add_listener(STATS.apply)
+# Bumped on every add/edit/delete; validates cached pages (ETag)
+DATA_VERSION = DataVersion()
+STUDENTS.add_listener(DATA_VERSION.bump)
+# Rendered pages, keyed by data version and emptied on every save
+PAGE_CACHE = PageCache()
+stores.add_save_listener(PAGE_CACHE.clear)
+SESSION_TTL = 3600  # 1 hour, for the cookie and the server-side flash message
+# Flash messages by session id; idle entries expire (see sessions.py)
+FLASH_MESSAGES = SessionStore(ttl=SESSION_TTL)
+# Field checks for POST /add, compiled once (see schema.py)
+STUDENT_SCHEMA = Schema([
+    Field('id', int, default='', min=1, range_error='ID must be positive',
+          type_error='Invalid ID', unique_error='ID already exists'),
+    Field('name', required='Name must be 2-50 characters', min_length=2, max_length=50,
+          length_error='Name must be 2-50 characters'),
+    Field('grade', float, default='', min=0, max=100, range_error='Grade must be 0-100',
+          type_error='Invalid grade'),
+])
 
 
-class ServerHandler(BaseHTTPRequestHandler):
+class ServerHandler(KeepAliveMixin, BaseHTTPRequestHandler):
     """Main server handler with routing"""
     
+    # Handler method for each route (query strings are read from self.query)
+    ROUTES = router.Router([
+        ('GET', '/', '_handle_home'),
+        ('GET', '/students', '_handle_student_list'),
+        ('GET', '/add', '_handle_add_form'),
+        ('POST', '/add', '_handle_add_post'),
+        ('GET', '/edit', '_handle_edit_form'),
+        ('POST', '/edit', '_handle_edit_post'),
+        ('GET', '/delete', '_handle_delete'),
+        ('GET', '/static/app.css', '_handle_static_css'),
+    ])
+    
     def do_GET(self):
         """Handle GET requests with routing"""
-        parsed_url = urlparse(self.path)
-        path = parsed_url.path
-        query_params = parse_qs(parsed_url.query)
-        
-        # Get flash message if exists
-        session_id = self._get_session_from_cookie()
-        flash_msg = self._get_and_clear_flash(session_id)
-        flash_html = ''
-        
-        if flash_msg:
-            flash_type = 'success' if flash_msg['type'] == 'success' else 'error'
-            flash_html = f'<div class="alert alert-{flash_type}">{flash_msg["message"]}</div>'
-        
-        try:
-            if path == '/':
-                self._handle_home(flash_html)
-            elif path == '/students':
-                self._handle_student_list(flash_html)
-            elif path == '/add':
-                self._handle_add_form(flash_html)
-            elif path == '/edit':
-                student_id = query_params.get('id', [None])[0]
-                self._handle_edit_form(student_id, flash_html)
-            elif path == '/delete':
-                student_id = query_params.get('id', [None])[0]
-                self._handle_delete(student_id, session_id)
-            else:
-                self._render_html(page.render_error('Page not found'), 404)
-        except Exception as e:
-            self._render_html(page.render_error(f'Error: {str(e)}'), 500)
+        self._dispatch(self._get_session_from_cookie())
     
     def do_POST(self):
         """Handle POST requests"""
+        self._dispatch(self._get_session_from_cookie() or str(uuid.uuid4()))
+    
+    def do_PUT(self):
+        """No PUT routes: 405 for known paths, 404 otherwise"""
+        self._dispatch(self._get_session_from_cookie())
+    
+    do_PATCH = do_DELETE = do_PUT
+    
+    def _dispatch(self, session_id):
+        """Run the handler method ROUTES maps this request to"""
         parsed_url = urlparse(self.path)
-        path = parsed_url.path
-        session_id = self._get_session_from_cookie() or str(uuid.uuid4())
+        self.query = parse_qs(parsed_url.query)
+        self.session_id = session_id
         
         try:
-            if path == '/add':
-                self._handle_add_post(session_id)
-            elif path == '/edit':
-                self._handle_edit_post(session_id)
+            target, params = self.ROUTES.match(self.command, parsed_url.path)
+        except router.RouteError as e:
+            # The body of an unrouted request is never read, so it
+            # can't be followed by another request on this connection
+            headers = [('Connection', 'close')] if self.headers.get('Content-Length') else []
+            if e.status == 405:
+                headers.append(('Allow', ', '.join(e.allowed)))
+                self._render_html(page.render_error('Method not allowed', as_parts=True), 405, headers)
             else:
-                self._render_html(page.render_error('Not found'), 404)
+                self._render_html(page.render_error('Page not found', as_parts=True), 404, headers)
+            return
+        
+        try:
+            getattr(self, target)(**params)
+        except FormError as e:
+            self._render_html(page.render_error(str(e), as_parts=True), e.status)
         except Exception as e:
-            self._render_html(page.render_error(f'Error: {str(e)}'), 500)
+            self._render_html(page.render_error(f'Error: {str(e)}', as_parts=True), 500)
+    
+    def _take_flash_html(self):
+        """Flash message for this session as HTML ('' if none); shown once"""
+        flash_msg = self._get_and_clear_flash(self.session_id)
+        if not flash_msg:
+            return ''
+        flash_type = 'success' if flash_msg['type'] == 'success' else 'error'
+        return f'<div class="alert alert-{flash_type}">{flash_msg["message"]}</div>'
     
-    def _handle_home(self, flash_html=''):
+    def _handle_home(self):
         """Handle GET / - Dashboard"""
         global STUDENTS
         
-        stats = self._calculate_statistics(STUDENTS)
-        html = page.render_home(STUDENTS, stats)
+        flash_html = self._take_flash_html()
+        headers = self._check_not_modified(flash_html, 'dashboard')
+        if headers is None:
+            return
+        
+        def render():
+            stats = self._calculate_statistics(STUDENTS)
+            return page.render_home(STUDENTS, stats)
         
-        # Inject flash message if present
+        # Inject flash message if present (those pages are not cached)
         if flash_html:
-            html = html.replace('<h1>Dashboard</h1>', f'{flash_html}<h1>Dashboard</h1>')
+            html = render().replace('<h1>Dashboard</h1>', f'{flash_html}<h1>Dashboard</h1>')
+            self._render_html(html, headers=headers)
+            return
         
-        self._render_html(html)
+        body = PAGE_CACHE.render(self._cache_key('render_home'), render)
+        self._render_html(body, headers=headers)
     
-    def _handle_student_list(self, flash_html=''):
+    def _handle_student_list(self):
         """Handle GET /students"""
         global STUDENTS
         
-        html = page.render_student_list(STUDENTS, flash_html)
-        self._render_html(html)
+        flash_html = self._take_flash_html()
+        headers = self._check_not_modified(flash_html, 'list')
+        if headers is None:
+            return
+        
+        if flash_html:
+            html = page.render_student_list(STUDENTS, flash_html, as_parts=True)
+        else:
+            html = PAGE_CACHE.render(self._cache_key('render_student_list'),
+                                     lambda: page.render_student_list(STUDENTS, as_parts=True))
+        self._render_html(html, headers=headers)
     
-    def _handle_add_form(self, flash_html=''):
+    def _handle_static_css(self):
+        """
+        Serve the shared stylesheet (linked when page.EXTERNAL_CSS is set)
+        
+        Pages link it as APP_CSS_URL, whose ?v= hash changes with the
+        CSS, so browsers may keep it for a year without revalidating.
+        """
+        etag = '"%s"' % page.APP_CSS_URL.rsplit('=', 1)[-1]
+        headers = [('ETag', etag), ('Cache-Control', 'public, max-age=31536000, immutable')]
+        if etag_matches(self.headers.get('If-None-Match', ''), etag):
+            self.send_response(304)
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            return
+        self._send_bytes([page.APP_CSS_BYTES], 'text/css; charset=utf-8', headers=headers)
+    
+    def _handle_add_form(self):
         """Handle GET /add"""
-        html = page.render_add_form(flash_html)
+        flash_html = self._take_flash_html()
+        html = page.render_add_form(flash_html, as_parts=True)
         self._render_html(html)
     
-    def _handle_edit_form(self, student_id, flash_html=''):
+    def _handle_edit_form(self):
         """Handle GET /edit?id=X"""
         global STUDENTS
         
+        student_id = self.query.get('id', [None])[0]
+        flash_html = self._take_flash_html()
         if not student_id:
             self._redirect('/students')
             return
         
         try:
             sid = int(student_id)
-            student = next((s for s in STUDENTS if s['id'] == sid), None)
+            student = STUDENTS.get(sid)
             
             if not student:
                 self._set_flash_message('error', f'Student {student_id} not found')
                 self._redirect('/students')
                 return
             
-            html = page.render_edit_form(student, flash_html)
+            html = page.render_edit_form(student, flash_html, as_parts=True)
             self._render_html(html)
         except ValueError:
             self._redirect('/students')
     
-    def _handle_add_post(self, session_id):
+    def _handle_add_post(self):
         """Handle POST /add - Add student (PRG pattern)"""
         global STUDENTS
         
+        session_id = self.session_id
         form_data = self._read_form()
         
         # Validate
-        errors = []
-        student_id = None
-        try:
-            student_id = int(form_data.get('id', ''))
-            if student_id <= 0:
-                errors.append('ID must be positive')
-            elif any(s['id'] == student_id for s in STUDENTS):
-                errors.append('ID already exists')
-        except ValueError:
-            errors.append('Invalid ID')
-        
-        name = form_data.get('name', '')
-        if not name or len(name) < 2 or len(name) > 50:
-            errors.append('Name must be 2-50 characters')
-        
-        try:
-            grade = float(form_data.get('grade', ''))
-            if grade < 0 or grade > 100:
-                errors.append('Grade must be 0-100')
-        except ValueError:
-            errors.append('Invalid grade')
+        values, errors = STUDENT_SCHEMA.clean(form_data, STUDENTS)
         
         if errors:
             self._set_flash_message('error', 'Validation failed: ' + ', '.join(errors))
@@ -151,29 +212,35 @@ class ServerHandler(BaseHTTPRequestHandler):
             return
         
         # Add student
+        student_id, name, grade = values['id'], values['name'], values['grade']
         student = {
             'id': student_id,
             'name': name,
             'grade': grade
         }
-        STUDENTS.append(student)
+        if not STUDENTS.insert(student):
+            # Added by a concurrent request since validation
+            self._set_flash_message('error', 'Validation failed: ID already exists')
+            self._redirect('/add', session_id)
+            return
         
         # Persist
-        stores.save_students(STUDENTS)
+        stores.save_students(STUDENTS, {student_id: student})
         
         # Set flash and redirect (PRG pattern)
         self._set_flash_message('success', f'Student {name} added successfully')
         self._redirect('/students', session_id)
     
-    def _handle_edit_post(self, session_id):
+    def _handle_edit_post(self):
         """Handle POST /edit - Update student (PRG pattern)"""
         global STUDENTS
         
+        session_id = self.session_id
         form_data = self._read_form()
         
         try:
             student_id = int(form_data.get('id', ''))
-            student = next((s for s in STUDENTS if s['id'] == student_id), None)
+            student = STUDENTS.get(student_id)
             
             if not student:
                 self._set_flash_message('error', 'Student not found')
@@ -194,11 +261,10 @@ class ServerHandler(BaseHTTPRequestHandler):
                 return
             
             # Update
-            student['name'] = name
-            student['grade'] = grade
+            student = STUDENTS.update(student_id, name=name, grade=grade)
             
             # Persist
-            stores.save_students(STUDENTS)
+            stores.save_students(STUDENTS, {student_id: student})
             
             # Redirect with flash
             self._set_flash_message('success', f'Student {name} updated successfully')
@@ -207,22 +273,23 @@ class ServerHandler(BaseHTTPRequestHandler):
         except ValueError:
             self._redirect('/students', session_id)
     
-    def _handle_delete(self, student_id, session_id):
+    def _handle_delete(self):
         """Handle GET /delete?id=X - Delete student"""
         global STUDENTS
         
+        student_id = self.query.get('id', [None])[0]
+        session_id = self.session_id
         if not student_id:
             self._redirect('/students')
             return
         
         try:
             sid = int(student_id)
-            student = next((s for s in STUDENTS if s['id'] == sid), None)
+            student = STUDENTS.delete(sid)
             
             if student:
                 name = student['name']
-                STUDENTS = [s for s in STUDENTS if s['id'] != sid]
-                stores.save_students(STUDENTS)
+                stores.save_students(STUDENTS, {sid: None})
                 
                 self._set_flash_message('success', f'Student {name} deleted successfully')
             else:
@@ -234,19 +301,8 @@ class ServerHandler(BaseHTTPRequestHandler):
             self._redirect('/students')
     
     def _get_session_from_cookie(self):
-        """Get session ID from cookie"""
-        cookie_header = self.headers.get('Cookie', '')
-        
-        if not cookie_header:
-            return None
-        
-        try:
-            cookies = SimpleCookie()
-            cookies.load(cookie_header)
-            session_id = cookies.get('session_id')
-            return session_id.value if session_id else None
-        except:
-            return None
+        """Get session ID from cookie (parsed once per request)"""
+        return request_cookie(self, 'session_id')
     
     def _set_flash_message(self, message_type, message):
         """Set flash message (stored in global dict)"""
@@ -259,14 +315,14 @@ class ServerHandler(BaseHTTPRequestHandler):
     
     def _get_and_clear_flash(self, session_id):
         """Get and clear flash message"""
-        if session_id and session_id in FLASH_MESSAGES:
-            message = FLASH_MESSAGES[session_id]
-            del FLASH_MESSAGES[session_id]
-            return message
-        return None
+        return FLASH_MESSAGES.pop(session_id) if session_id else None
     
     def _calculate_statistics(self, students):
-        """Calculate dashboard statistics"""
+        """
+        Calculate dashboard statistics
+        
+        O(1) for STUDENTS (running counters in STATS); other lists are scanned.
+        """
         if not students:
             return {
                 'total_students': 0,
@@ -274,9 +330,14 @@ class ServerHandler(BaseHTTPRequestHandler):
                 'pass_rate': 0
             }
         
-        total = len(students)
-        average = sum(s['grade'] for s in students) / total
-        passing = len([s for s in students if s['grade'] >= 60])
+        if students is STUDENTS:
+            counters = STATS.read(students)
+        else:
+            counters = StatsAggregator.compute(students)
+        
+        total = counters['total']
+        average = counters['grade_sum'] / total
+        passing = counters['pass_count']
         pass_rate = (passing / total) * 100 if total > 0 else 0
         
         return {
@@ -294,25 +355,64 @@ class ServerHandler(BaseHTTPRequestHandler):
             cookie = SimpleCookie()
             cookie['session_id'] = session_id
             cookie['session_id']['path'] = '/'
-            cookie['session_id']['max-age'] = 3600
+            cookie['session_id']['max-age'] = SESSION_TTL
             self.send_header('Set-Cookie', cookie['session_id'].OutputString())
         
         self.end_headers()
     
-    def _render_html(self, html, status_code=200):
-        """Send HTML response"""
+    def _check_not_modified(self, flash_html, *variant):
+        """
+        Conditional GET for a page built from STUDENTS
+        
+        Sends 304 Not Modified and returns None if the client's copy
+        (If-None-Match / If-Modified-Since) matches DATA_VERSION;
+        otherwise returns the ETag / Last-Modified headers to send.
+        A page carrying a flash message is one-off: it gets no
+        validators and is always sent in full.
+        """
+        if flash_html:
+            return []
+        
+        etag = DATA_VERSION.etag(*variant)
+        headers = DATA_VERSION.validators(etag)
+        if not DATA_VERSION.is_fresh(self.headers, etag):
+            return headers
+        
+        self.send_response(304)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        return None
+    
+    def _cache_key(self, renderer, *args):
+        """PAGE_CACHE key: a rendered page is only valid for this data version"""
+        return (renderer, args, DATA_VERSION.etag())
+    
+    def _render_html(self, html, status_code=200, headers=()):
+        """
+        Send HTML response
+        
+        html is a str, encoded bytes, or a list of byte strings (a page
+        rendered with as_parts=True), written out with writelines.
+        """
+        if isinstance(html, str):
+            html = html.encode('utf-8')
+        parts = [html] if isinstance(html, bytes) else html
+        self._send_bytes(parts, 'text/html; charset=utf-8', status_code, headers)
+    
+    def _send_bytes(self, parts, content_type, status_code=200, headers=()):
+        """Send a body given as a list of byte strings"""
         self.send_response(status_code)
-        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(sum(map(len, parts))))
+        for name, value in headers:
+            self.send_header(name, value)
         self.end_headers()
-        self.wfile.write(html.encode('utf-8'))
+        self.wfile.writelines(parts)
     
     def _read_form(self):
-        """Read POST form data"""
-        content_length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(content_length)
-        body_string = body.decode('utf-8')
-        parsed = parse_qs(body_string)
-        return {k: v[0] for k, v in parsed.items()}
+        """Read POST form data (in chunks, with size limits; see form_parser.py)"""
+        return read_request_form(self)
     
     def log_message(self, format, *args):
         """Suppress default logging"""
@@ -321,10 +421,12 @@ class ServerHandler(BaseHTTPRequestHandler):
 
 if __name__ == '__main__':
     # Load existing students
-    STUDENTS = stores.load_students()
+    STUDENTS.load(stores.load_students())
     
-    # Create ThreadingHTTPServer for concurrent requests
-    server = ThreadingHTTPServer(('localhost', 8007), ServerHandler)
+    # Fixed worker pool; connections beyond its queue get 503 + Retry-After
+    ServerHandler.keep_alive = True
+    FLASH_MESSAGES.start_sweeper()
+    server = PooledHTTPServer(('localhost', 8007), ServerHandler)
     
     print("╔══════════════════════════════════════════╗")
     print("║  Student Dashboard Server                ║")
@@ -343,7 +445,8 @@ if __name__ == '__main__':
     print("  ✓ Flash messages for user feedback")
     print("  ✓ Statistics calculation (avg, pass rate)")
     print("  ✓ Dynamic HTML templates with f-strings")
-    print("  ✓ ThreadingHTTPServer for concurrency")
+    print("  ✓ Worker pool with bounded queue (503 when full)")
+    print("  ✓ HTTP/1.1 keep-alive connections")
     print("\nPress Ctrl+C to stop")
     
     try:
@@ -351,3 +454,4 @@ if __name__ == '__main__':
     except KeyboardInterrupt:
         print("\nShutting down...")
         stores.save_students(STUDENTS)
+        stores.flush_students()
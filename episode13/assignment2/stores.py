@@ -6,12 +6,76 @@ import json
 import os
 from threading import Lock
 
+from snapshot import GroupCommit, write_json_atomic
+from wal import StudentLog
+
 STUDENTS_FILE = 'students_dashboard.json'
 FILE_LOCK = Lock()
 
+# Saves arriving within this many seconds share one snapshot write
+GROUP_COMMIT_WINDOW = 0.005
+
+# Storage backend:
+#   'json' - rewrite the whole file on every save
+#   'wal'  - append changed records to WAL_FILE, compact into STUDENTS_FILE
+STORAGE_BACKEND = 'json'
+WAL_FILE = 'students_dashboard.log'
+WAL_FSYNC_BATCH = 32            # fsync after this many log records
+WAL_COMPACT_THRESHOLD = 10000   # compact once the log has this many records
+
+_student_log = None
+_save_listeners = []
+
+
+def _write_snapshot(students):
+    """Atomically replace the JSON file with students"""
+    try:
+        with FILE_LOCK:
+            write_json_atomic(STUDENTS_FILE, list(students), indent=2)
+        return True
+    except (IOError, OSError) as e:
+        print(f"Error saving students: {e}")
+        return False
+
+
+_committer = GroupCommit(_write_snapshot, GROUP_COMMIT_WINDOW)
+
+
+def _students_by_id(students):
+    """[student, ...] -> {id: student}"""
+    return {s['id']: s for s in students}
+
+
+def _students_list(state):
+    """{id: student} -> [student, ...] (insertion order)"""
+    return list(state.values())
+
+
+def _get_log():
+    """Return the write-ahead log for the current settings"""
+    global _student_log
+    with FILE_LOCK:
+        if _student_log is None or _student_log.snapshot_path != STUDENTS_FILE:
+            if _student_log is not None:
+                _student_log.close()
+            _student_log = StudentLog(
+                STUDENTS_FILE, WAL_FILE,
+                to_state=_students_by_id, from_state=_students_list,
+                fsync_batch=WAL_FSYNC_BATCH,
+                compact_threshold=WAL_COMPACT_THRESHOLD
+            )
+        return _student_log
+
 
 def load_students():
-    """Load students from JSON file"""
+    """Load students from JSON file (plus write-ahead log if enabled)"""
+    if STORAGE_BACKEND == 'wal':
+        try:
+            return _get_log().load()
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error loading students: {e}")
+            return []
+
     if not os.path.exists(STUDENTS_FILE):
         return []
     
@@ -23,19 +87,50 @@ def load_students():
         return []
 
 
-def save_students(students):
-    """Save students to JSON file (thread-safe)"""
-    try:
-        with FILE_LOCK:
-            with open(STUDENTS_FILE, 'w') as f:
-                json.dump(students, f, indent=2)
-        return True
-    except IOError as e:
-        print(f"Error saving students: {e}")
-        return False
+def add_save_listener(callback):
+    """Call callback() after every save_students (e.g. to drop cached pages)"""
+    _save_listeners.append(callback)
+
+
+def save_students(students, changes=None):
+    """
+    Save students to JSON file (thread-safe)
+
+    Concurrent saves are merged into one atomic write (group commit).
+    Returns True once the data is durable on disk, False on error.
+
+    Args:
+        students: list of student dicts (or a StudentRepository)
+        changes: optional {id: student or None} for the records that
+            changed (None = deleted). Only used by the 'wal' backend, which
+            otherwise diffs students against what it last wrote.
+    """
+    if STORAGE_BACKEND != 'wal':
+        saved = _committer.commit(students)
+    else:
+        try:
+            saved = _get_log().save(students, changes)
+        except IOError as e:
+            print(f"Error saving students: {e}")
+            saved = False
+
+    for callback in _save_listeners:
+        callback()
+    return saved
+
+
+def flush_students():
+    """fsync pending log records and wait for compaction (wal backend)"""
+    if _student_log is not None:
+        _student_log.close()
 
 
 def delete_file():
-    """Delete the students file (for testing)"""
-    if os.path.exists(STUDENTS_FILE):
-        os.remove(STUDENTS_FILE)
+    """Delete the students file and any write-ahead log (for testing)"""
+    global _student_log
+    if _student_log is not None:
+        _student_log.delete_files()
+        _student_log = None
+    for path in (STUDENTS_FILE, WAL_FILE, WAL_FILE + '.old'):
+        if os.path.exists(path):
+            os.remove(path)
@@ -88,6 +88,21 @@ class TestPageTemplates(unittest.TestCase):
         self.assertIn('Dashboard', html)
         self.assertIn('Students', html)
         self.assertIn('Add Student', html)
+    
+    def test_base_template_parts(self):
+        """Test pre-encoded layout parts match the rendered page"""
+        parts = page.render_base('Test', 'Content', '<div>flash</div>', as_parts=True)
+        self.assertIs(parts[0], page.BASE_HEAD_START_BYTES)
+        self.assertEqual(b''.join(parts),
+                         page.render_base('Test', 'Content', '<div>flash</div>').encode('utf-8'))
+        
+        page.EXTERNAL_CSS = True
+        try:
+            html = page.render_base('Test', 'Content')
+        finally:
+            page.EXTERNAL_CSS = False
+        self.assertNotIn('<style>', html)
+        self.assertIn(page.APP_CSS_URL, html)
 
 
 class TestStatistics(unittest.TestCase):
@@ -248,6 +263,36 @@ class TestServerHandler(unittest.TestCase):
         
         self.assertEqual(response.status_code, 302)
     
+    def test_edit_updates_repository(self):
+        """Test edit goes through the indexed repository"""
+        from solution import STUDENTS
+        self.session.post(f'{self.base_url}/add', data=urlencode({'id': '101', 'name': 'John', 'grade': '85'}))
+        self.session.post(f'{self.base_url}/add', data=urlencode({'id': '102', 'name': 'Mary', 'grade': '75'}))
+        self.session.post(f'{self.base_url}/edit', data=urlencode({'id': '101', 'name': 'Jane', 'grade': '90'}))
+        
+        self.assertEqual(STUDENTS.get(101)['name'], 'Jane')
+        self.assertEqual([s['id'] for s in STUDENTS], [101, 102])
+        self.assertEqual(stores.load_students()[0]['grade'], 90.0)
+    
+    def test_statistics_consistent_after_changes(self):
+        """Test running statistics match a full recompute after add/edit/delete"""
+        import aggregates
+        from solution import STUDENTS, STATS
+        aggregates.CHECK_CONSISTENCY = True
+        try:
+            for sid, grade in (('101', '90'), ('102', '40'), ('103', '75')):
+                self.session.post(f'{self.base_url}/add', data=urlencode({'id': sid, 'name': 'Student', 'grade': grade}))
+            self.session.post(f'{self.base_url}/edit', data=urlencode({'id': '102', 'name': 'Student', 'grade': '65'}))
+            self.session.get(f'{self.base_url}/delete?id=103')
+            
+            # A mismatch raises inside the handler and turns into a 500
+            response = self.session.get(f'{self.base_url}/')
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('77.50', response.text)
+            self.assertEqual(STATS.read(STUDENTS)['pass_count'], 2)
+        finally:
+            aggregates.CHECK_CONSISTENCY = False
+    
     def test_delete_student(self):
         """Test student deletion"""
         # Add first
@@ -277,6 +322,38 @@ class TestServerHandler(unittest.TestCase):
         self.assertEqual(response.status_code, 404)
         self.assertIn('Error', response.text)
     
+    def test_wrong_method_405(self):
+        """Test a known path answers 405 with Allow for another method"""
+        response = self.session.post(f'{self.base_url}/students', data={'id': '1'})
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response.headers['Allow'], 'GET')
+        
+        response = self.session.put(f'{self.base_url}/edit')
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response.headers['Allow'], 'GET, POST')
+    
+    def test_flash_message_expires(self):
+        """Test an unread flash message expires with its session"""
+        from solution import FLASH_MESSAGES
+        FLASH_MESSAGES.set('old-session', {'type': 'success', 'message': 'Stale notice'}, ttl=0.05)
+        FLASH_MESSAGES['new-session'] = {'type': 'success', 'message': 'Fresh notice'}
+        time.sleep(0.1)
+        
+        self.assertEqual(FLASH_MESSAGES.sweep(), 1)
+        self.session.cookies.set('session_id', 'old-session')
+        self.assertNotIn('Stale notice', self.session.get(f'{self.base_url}/students').text)
+        self.session.cookies.set('session_id', 'new-session')
+        self.assertIn('Fresh notice', self.session.get(f'{self.base_url}/students').text)
+    
+    def test_flash_message_expires_without_sweep(self):
+        """Test an expired flash message is not shown even before the sweeper runs"""
+        from solution import FLASH_MESSAGES
+        FLASH_MESSAGES.set('lapsed-session', {'type': 'success', 'message': 'Lapsed notice'}, ttl=0.05)
+        time.sleep(0.1)
+        
+        self.session.cookies.set('session_id', 'lapsed-session')
+        self.assertNotIn('Lapsed notice', self.session.get(f'{self.base_url}/students').text)
+    
     def test_statistics_update(self):
         """Test statistics update on home page"""
         # Add student
@@ -293,6 +370,253 @@ class TestServerHandler(unittest.TestCase):
         self.assertIn('1', response.text)  # Total students
         # Look for average (could be 85.00)
         self.assertTrue('85' in response.text)
+    
+    def test_conditional_get_not_modified(self):
+        """Test unchanged pages answer If-None-Match with 304"""
+        # The second add's flash is stored under the session cookie from the first
+        for student_id in ('101', '102'):
+            self.session.post(f'{self.base_url}/add', data={'id': student_id, 'name': 'John', 'grade': '85'},
+                              allow_redirects=False)
+        
+        # The page showing the flash message gets no validators
+        response = self.session.get(f'{self.base_url}/students')
+        self.assertIn('added successfully', response.text)
+        self.assertNotIn('ETag', response.headers)
+        
+        for path in ('/', '/students'):
+            etag = self.session.get(f'{self.base_url}{path}').headers['ETag']
+            response = self.session.get(f'{self.base_url}{path}', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.content, b'')
+        
+        self.session.post(f'{self.base_url}/edit', data={'id': '101', 'name': 'John', 'grade': '95'})
+        response = self.session.get(f'{self.base_url}/students', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('95', response.text)
+    
+    def test_pages_served_from_cache_until_save(self):
+        """Test repeat page hits come from PAGE_CACHE and saves clear it"""
+        from solution import PAGE_CACHE
+        self.session.post(f'{self.base_url}/add', data={'id': '101', 'name': 'John', 'grade': '85'})
+        
+        for path in ('/', '/students'):
+            first = self.session.get(f'{self.base_url}{path}').text
+            hits = PAGE_CACHE.stats()['hits']
+            self.assertEqual(self.session.get(f'{self.base_url}{path}').text, first)
+            self.assertEqual(PAGE_CACHE.stats()['hits'], hits + 1)
+        
+        self.session.post(f'{self.base_url}/add', data={'id': '102', 'name': 'Jane', 'grade': '75'},
+                          allow_redirects=False)
+        self.assertEqual(PAGE_CACHE.stats()['pages'], 0)
+    
+    def test_static_css_cacheable(self):
+        """Test /static/app.css is served with a long max-age and ETag"""
+        response = self.session.get(f'{self.base_url}{page.APP_CSS_URL}')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('text/css', response.headers['Content-Type'])
+        self.assertIn('max-age=31536000', response.headers['Cache-Control'])
+        self.assertEqual(response.content, page.APP_CSS_BYTES)
+        
+        response = self.session.get(f'{self.base_url}/static/app.css',
+                                    headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+    
+    def test_keep_alive_connection_reuse(self):
+        """Test keep-alive mode answers several requests on one connection"""
+        import http.client
+        ServerHandler.keep_alive = True
+        conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+        try:
+            conn.request('POST', '/add', urlencode({'name': 'Kept', 'grade': '80'}),
+                         {'Content-Type': 'application/x-www-form-urlencoded'})
+            response = conn.getresponse()
+            response.read()
+            self.assertEqual(response.status, 302)
+            sock = conn.sock
+            
+            for path in ('/', '/students', '/static/app.css'):
+                conn.request('GET', path)
+                response = conn.getresponse()
+                self.assertIsNotNone(response.getheader('Content-Length'))
+                response.read()
+                self.assertEqual(response.status, 200)
+            self.assertIs(conn.sock, sock)
+        finally:
+            ServerHandler.keep_alive = False
+            conn.close()
+    
+    def test_pooled_server_counts_connections(self):
+        """Test the worker-pool server serves requests and reports counters"""
+        from pooled_server import PooledHTTPServer
+        server = PooledHTTPServer(('127.0.0.1', 0), ServerHandler, workers=2, queue_size=4)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f'http://127.0.0.1:{server.server_address[1]}'
+        try:
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(
+                           requests.get(f'{base_url}/students').status_code))
+                       for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            
+            # Every request either served or told to retry, none dropped
+            self.assertEqual(len(results), 6)
+            self.assertTrue(set(results) <= {200, 503})
+            # Workers count a connection just after its response is sent
+            for _ in range(50):
+                stats = server.stats()
+                if stats['handled'] + stats['rejected'] == 6:
+                    break
+                time.sleep(0.02)
+            self.assertEqual(stats['workers'], 2)
+            self.assertEqual(stats['handled'] + stats['rejected'], 6)
+            self.assertEqual(stats['busy_workers'], 0)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestWriteAheadLog(unittest.TestCase):
+    """Test the append-only storage backend"""
+
+    def setUp(self):
+        """Switch stores to the wal backend on test files"""
+        self.saved = (stores.STORAGE_BACKEND, stores.STUDENTS_FILE, stores.WAL_FILE, stores.WAL_COMPACT_THRESHOLD)
+        stores.STORAGE_BACKEND = 'wal'
+        stores.STUDENTS_FILE = 'test_wal_students.json'
+        stores.WAL_FILE = 'test_wal_students.log'
+        stores.delete_file()
+
+    def tearDown(self):
+        """Restore the json backend"""
+        stores.delete_file()
+        (stores.STORAGE_BACKEND, stores.STUDENTS_FILE,
+         stores.WAL_FILE, stores.WAL_COMPACT_THRESHOLD) = self.saved
+
+    def test_save_appends_and_load_replays(self):
+        """Test add/update/delete are logged and replayed in order"""
+        students = [{'id': 1, 'name': 'John', 'grade': 85}]
+        self.assertTrue(stores.save_students(students))
+        students.append({'id': 2, 'name': 'Jane', 'grade': 90})
+        stores.save_students(students, {2: students[1]})
+        students[0]['grade'] = 70
+        stores.save_students(students)
+        students = [s for s in students if s['id'] != 2]
+        stores.save_students(students, {2: None})
+        stores.flush_students()
+
+        with open('test_wal_students.log') as f:
+            ops = [json.loads(line)['op'] for line in f]
+        self.assertEqual(ops, ['add', 'add', 'update', 'delete'])
+        self.assertEqual(stores.load_students(), [{'id': 1, 'name': 'John', 'grade': 70}])
+
+    def test_compaction_writes_json_snapshot(self):
+        """Test the log is compacted into a plain JSON list"""
+        stores.WAL_COMPACT_THRESHOLD = 2
+        students = []
+        for i in range(1, 4):
+            students.append({'id': i, 'name': f'Student {i}', 'grade': 80})
+            stores.save_students(students)
+        stores.flush_students()
+
+        with open('test_wal_students.json') as f:
+            self.assertEqual([s['id'] for s in json.load(f)], [1, 2])
+        self.assertEqual(stores.load_students(), students)
+
+
+class TestSnapshotWrites(unittest.TestCase):
+    """Test atomic snapshot writes and group commit"""
+
+    def test_save_replaces_file_atomically(self):
+        """Test save leaves no temp file and a complete JSON file"""
+        stores.delete_file()
+        self.assertTrue(stores.save_students([{'id': 1, 'name': 'John', 'grade': 85}]))
+        self.assertFalse(os.path.exists(stores.STUDENTS_FILE + '.tmp'))
+        self.assertEqual(stores.load_students()[0]['name'], 'John')
+        stores.delete_file()
+
+    def test_concurrent_saves_share_writes(self):
+        """Test saves arriving together are merged into fewer writes"""
+        from snapshot import GroupCommit
+        written = []
+
+        def slow_write(data):
+            time.sleep(0.02)
+            written.append(list(data))
+            return True
+
+        committer = GroupCommit(slow_write, window=0.01)
+        students = []
+        results = []
+
+        def save(i):
+            students.append(i)
+            results.append(committer.commit(students))
+
+        threads = [threading.Thread(target=save, args=(i,)) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(results, [True] * 20)
+        self.assertEqual(committer.requests, 20)
+        self.assertLess(committer.writes, 20)
+        self.assertEqual(len(written[-1]), 20)
+
+    def test_each_save_gets_its_own_writes_outcome(self):
+        """Test a failed write only fails the saves it covered"""
+        from snapshot import GroupCommit
+
+        for failing in ('first', 'second'):
+            writing = threading.Event()
+            release = threading.Event()
+
+            def write(data):
+                if data == 'first':
+                    writing.set()
+                    release.wait(5)
+                if data == failing:
+                    raise IOError(f'{data} write failed')
+                return data
+
+            committer = GroupCommit(write, window=0)
+            outcomes = {}
+
+            def save(data):
+                try:
+                    outcomes[data] = committer.commit(data)
+                except IOError as e:
+                    outcomes[data] = str(e)
+
+            leader = threading.Thread(target=save, args=('first',))
+            leader.start()
+            writing.wait(5)
+            # Arrives during the first write, so is covered by a second one
+            follower = threading.Thread(target=save, args=('second',))
+            follower.start()
+            while committer.requests < 2:
+                time.sleep(0.001)
+            release.set()
+            leader.join()
+            follower.join()
+
+            expected = {'first': 'first', 'second': 'second'}
+            expected[failing] = f'{failing} write failed'
+            self.assertEqual(outcomes, expected)
+            self.assertEqual(committer.writes, 2)
+
+    def test_update_replaces_student(self):
+        """Test update() leaves a student already handed out unchanged"""
+        from repository import StudentRepository
+        repo = StudentRepository([{'id': 101, 'name': 'John', 'grade': 85.0}])
+        saved = repo.get(101)
+        updated = repo.update(101, grade=70.0)
+        self.assertEqual(saved['grade'], 85.0)
+        self.assertEqual(updated['grade'], 70.0)
+        self.assertIs(repo.get(101), updated)
 
 
 if __name__ == '__main__':
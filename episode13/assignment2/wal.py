@@ -0,0 +1,275 @@
+"""
+EPISODE 13 - ASSIGNMENT 2: Write-ahead log module (same as episode15)
+Append-only student storage with batched fsync and background compaction
+
+Layout on disk:
+    students_dashboard.json      - snapshot (same format as the plain JSON store)
+    students_dashboard.log.old   - log being folded into the snapshot (compaction)
+    students_dashboard.log       - current log, one JSON record per line
+
+Records:
+    {"op": "add", "key": 1, "data": {...}}
+    {"op": "update", "key": 1, "data": {...}}
+    {"op": "delete", "key": 1}
+
+State = snapshot + .log.old + .log replayed in order. Replaying a
+record twice gives the same result, so a crash at any point during
+compaction loses nothing that was already in the log.
+"""
+
+import json
+import os
+import threading
+
+from snapshot import write_json_atomic
+
+
+class StudentLog:
+    """
+    Append-only student store keyed by id / roll_no
+
+    Args:
+        snapshot_path: JSON snapshot file
+        log_path: append-only log file
+        to_state: students container -> {key: record}
+        from_state: {key: record} -> students container
+        fsync_batch: fsync after this many appended records
+        compact_threshold: compact once the log has this many records
+    """
+
+    def __init__(self, snapshot_path, log_path, to_state, from_state,
+                 fsync_batch=32, compact_threshold=10000):
+        self.snapshot_path = snapshot_path
+        self.log_path = log_path
+        self.old_log_path = log_path + '.old'
+        self.to_state = to_state
+        self.from_state = from_state
+        self.fsync_batch = fsync_batch
+        self.compact_threshold = compact_threshold
+
+        self._lock = threading.RLock()
+        self._state = None          # {key: record copy} as last persisted
+        self._log_file = None
+        self._log_records = 0       # records in current log
+        self._unsynced = 0          # records appended since last fsync
+        self._compactor = None      # background compaction thread
+
+    # ---------- reading ----------
+
+    def load(self):
+        """Read snapshot, replay logs, return students container"""
+        with self._lock:
+            compactor = self._compactor
+            if compactor is not None and compactor.is_alive():
+                # It is folding .log.old into the snapshot: let it finish
+                # so the two don't write the same files
+                compactor.join()
+
+            state = {}
+            if os.path.exists(self.snapshot_path):
+                with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                    state = {k: dict(v) for k, v in self.to_state(json.load(f)).items()}
+
+            pending = os.path.exists(self.old_log_path)
+            self._replay(self.old_log_path, state)
+            self._log_records = self._replay(self.log_path, state)
+            self._state = state
+            if pending:
+                # A crash stopped the last compaction before its snapshot
+                self._finish_compaction()
+            return self.from_state({k: dict(v) for k, v in state.items()})
+
+    def _replay(self, path, state):
+        """Apply log records to state, return number of records applied"""
+        if not os.path.exists(path):
+            return 0
+
+        count = 0
+        good_offset = 0
+        with open(path, 'r+b') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn last line from a crash mid-append: cut it off
+                    # so the next append starts on a clean line
+                    f.truncate(good_offset)
+                    break
+                if record['op'] == 'delete':
+                    state.pop(record['key'], None)
+                else:
+                    state[record['key']] = record['data']
+                good_offset += len(line)
+                count += 1
+        return count
+
+    # ---------- writing ----------
+
+    def save(self, students, changes=None):
+        """
+        Persist students by appending only what changed
+
+        Args:
+            students: full students container
+            changes: optional {key: record or None} hint from the caller
+                (None = deleted). Without it, students is diffed against
+                the last persisted state.
+        """
+        with self._lock:
+            if self._state is None:
+                self.load()
+
+            if changes is None:
+                records = self._diff(students)
+            else:
+                records = self._records_for(changes)
+
+            if records:
+                self._append(records)
+
+            if self._log_records >= self.compact_threshold:
+                self.compact(wait=False)
+        return True
+
+    def _diff(self, students):
+        """Compute records turning the persisted state into students"""
+        current = self.to_state(students)
+        records = []
+        for key, student in current.items():
+            old = self._state.get(key)
+            if old is None:
+                records.append({'op': 'add', 'key': key, 'data': student})
+            elif old != student:
+                records.append({'op': 'update', 'key': key, 'data': student})
+        for key in self._state:
+            if key not in current:
+                records.append({'op': 'delete', 'key': key})
+        return records
+
+    def _records_for(self, changes):
+        """Build records from an explicit {key: record or None} hint"""
+        records = []
+        for key, student in changes.items():
+            if student is None:
+                if key in self._state:
+                    records.append({'op': 'delete', 'key': key})
+            elif key in self._state:
+                records.append({'op': 'update', 'key': key, 'data': student})
+            else:
+                records.append({'op': 'add', 'key': key, 'data': student})
+        return records
+
+    def _append(self, records):
+        """Append records to the log and update persisted state"""
+        if self._log_file is None:
+            self._log_file = open(self.log_path, 'ab')
+
+        lines = []
+        for record in records:
+            if record['op'] == 'delete':
+                self._state.pop(record['key'], None)
+            else:
+                # Keep a copy: handlers edit student dicts in place
+                record['data'] = dict(record['data'])
+                self._state[record['key']] = record['data']
+            lines.append(json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n')
+
+        self._log_file.write(b''.join(lines))
+        self._log_file.flush()
+        self._log_records += len(records)
+        self._unsynced += len(records)
+
+        if self._unsynced >= self.fsync_batch:
+            self.sync()
+
+    def sync(self):
+        """fsync appended records to disk"""
+        with self._lock:
+            if self._log_file is not None and self._unsynced:
+                os.fsync(self._log_file.fileno())
+                self._unsynced = 0
+
+    # ---------- compaction ----------
+
+    def compact(self, wait=True):
+        """
+        Fold the log into a new snapshot
+
+        The current log is renamed to .log.old and a new log is started,
+        then the snapshot is written in a background thread and .log.old
+        removed. Writers only wait for the rename, not the snapshot.
+        """
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                compactor = self._compactor
+            elif os.path.exists(self.old_log_path):
+                # The last snapshot write failed: redo it now
+                self._finish_compaction()
+                compactor = None
+            elif not self._log_records:
+                compactor = None
+            else:
+                self.sync()
+                if self._log_file is not None:
+                    self._log_file.close()
+                    self._log_file = None
+                os.replace(self.log_path, self.old_log_path)
+                self._log_records = 0
+
+                # Records are replaced, never mutated, so a shallow copy is a snapshot
+                snapshot = self.from_state(dict(self._state))
+                compactor = threading.Thread(target=self._write_snapshot, args=(snapshot,), daemon=True)
+                self._compactor = compactor
+                compactor.start()
+
+        if wait and compactor is not None:
+            compactor.join()
+
+    def _write_snapshot(self, snapshot):
+        """Write snapshot atomically, then drop the folded log"""
+        write_json_atomic(self.snapshot_path, snapshot)
+        self._remove(self.old_log_path)
+
+    def _finish_compaction(self):
+        """
+        Fold a leftover .log.old (and the live log) into the snapshot
+
+        Runs in the caller's thread with the lock held. The snapshot
+        is written from the replayed state, so it already holds every
+        logged record; both logs are removed only after it is on disk.
+        """
+        self.sync()
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        write_json_atomic(self.snapshot_path, self.from_state(dict(self._state)))
+        self._remove(self.old_log_path)
+        self._remove(self.log_path)
+        self._log_records = 0
+
+    @staticmethod
+    def _remove(path):
+        """Remove a log file; one already gone is fine"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        """Wait for compaction, fsync and close the log"""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        with self._lock:
+            self.sync()
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+            self._state = None
+
+    def delete_files(self):
+        """Remove snapshot and logs (for testing)"""
+        self.close()
+        for path in (self.snapshot_path, self.old_log_path, self.log_path):
+            if os.path.exists(path):
+                os.remove(path)
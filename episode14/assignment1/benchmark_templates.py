@@ -0,0 +1,61 @@
+"""
+EPISODE 14 - ASSIGNMENT 1: Template rendering micro-benchmark
+Compares the original read + str.replace loop against the compiled,
+cached template engine on layout.html, user.html and message.html.
+
+Run:
+    python benchmark_templates.py [iterations]
+"""
+
+import sys
+import timeit
+
+from solution import read_template, html_escape, render_template
+
+
+def render_with_replace_loop(template_name, **context):
+    """Original implementation: read file, one replace pass per key"""
+    template_html = read_template(template_name)
+
+    for key, value in context.items():
+        if key.startswith('__raw_'):
+            placeholder = f'{{{{{key[6:]}}}}}'
+            template_html = template_html.replace(placeholder, str(value) if value is not None else '')
+        else:
+            placeholder = f'{{{{{key}}}}}'
+            template_html = template_html.replace(placeholder, html_escape(value))
+
+    return template_html
+
+
+CASES = [
+    ('message.html', {'message': 'Attempted XSS attack with: <script>alert("XSS")</script>'}),
+    ('user.html', {'username': 'Guest'}),
+    ('layout.html', {'__raw_content': '<p>' + 'Lorem ipsum dolor sit amet. ' * 40 + '</p>'}),
+]
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    print("╔════════════════════════════════════════════╗")
+    print("║  Template Rendering Benchmark              ║")
+    print("╚════════════════════════════════════════════╝")
+    print(f"\n{iterations} renders per template\n")
+    print(f"{'template':<14}{'replace loop':>16}{'compiled':>14}{'speedup':>10}")
+
+    for template_name, context in CASES:
+        # Both paths must produce identical HTML
+        assert render_with_replace_loop(template_name, **context) == render_template(template_name, **context)
+
+        legacy = timeit.timeit(lambda: render_with_replace_loop(template_name, **context), number=iterations)
+        compiled = timeit.timeit(lambda: render_template(template_name, **context), number=iterations)
+
+        print(f"{template_name:<14}"
+              f"{legacy / iterations * 1e6:>13.2f} µs"
+              f"{compiled / iterations * 1e6:>11.2f} µs"
+              f"{legacy / compiled:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+EPISODE 14 - Keep-alive module (same as episode15)
+Opt-in HTTP/1.1 persistent connections for BaseHTTPRequestHandler
+"""
+
+
+def _is_framed(head):
+    """True if a response header block already says where the body ends"""
+    status_line, _, fields = head.partition(b'\r\n')
+    parts = status_line.split(None, 2)
+    status = parts[1] if len(parts) > 1 else b''
+    if status.startswith(b'1') or status in (b'204', b'304'):
+        return True     # never has a body
+    for line in fields.lower().split(b'\r\n'):
+        name, _, value = line.partition(b':')
+        name = name.strip()
+        if name == b'content-length':
+            return True
+        if name == b'transfer-encoding' and b'chunked' in value:
+            return True
+    return False
+
+
+class ResponseWriter:
+    """
+    wfile stand-in that gives every response a Content-Length
+
+    The header block is held back until it is complete:
+    - a response that already frames its body (Content-Length,
+      chunked, or no body at all) then streams to the socket, the
+      headers going out together with the first body write
+    - any other body is collected and sent with a Content-Length
+      header added when finish() is called
+    """
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+        self._pending = bytearray()     # not yet sent
+        self._head = None               # held header block (body collected)
+        self._streaming = False
+
+    def write(self, data):
+        if self._streaming:
+            if self._pending:
+                self._pending += data
+                self.wfile.write(bytes(self._pending))
+                self._pending.clear()
+            else:
+                self.wfile.write(data)
+            return len(data)
+
+        self._pending += data
+        if self._head is None:
+            end = self._pending.find(b'\r\n\r\n')
+            if end != -1:
+                head = bytes(self._pending[:end + 4])
+                if _is_framed(head):
+                    self._streaming = True
+                    if len(self._pending) > len(head):
+                        self.write(b'')
+                else:
+                    self._head = head
+                    del self._pending[:end + 4]
+        return len(data)
+
+    def writelines(self, lines):
+        for data in lines:
+            self.write(data)
+
+    def flush(self):
+        pass
+
+    def finish(self):
+        """
+        Send whatever is still held back
+
+        Returns False if the response had no complete header block, so
+        only closing the connection can end it.
+        """
+        if self._head is not None:
+            head = self._head[:-2] + b'Content-Length: %d\r\n\r\n' % len(self._pending)
+            self.wfile.write(head + bytes(self._pending))
+        elif self._pending:
+            self.wfile.write(bytes(self._pending))
+        self._pending.clear()
+        return self._streaming or self._head is not None
+
+
+class KeepAliveMixin:
+    """
+    Persistent HTTP/1.1 connections for a BaseHTTPRequestHandler
+
+    Off by default. Put the mixin first in the bases and set
+    keep_alive = True on the handler class (the servers do so when
+    started from the command line) together with a ThreadingHTTPServer:
+    an open connection keeps its thread until it closes, so a
+    single-threaded server would stall other clients.
+
+    While on:
+    - every response gets a Content-Length (see ResponseWriter)
+    - a connection serves at most max_requests requests, the last one
+      answered with "Connection: close"
+    - a connection idle for idle_timeout seconds is closed
+
+    The server may override both limits: an idle_timeout attribute on
+    the server replaces the handler's, and a true server.saturated
+    (connections waiting for a worker) closes the connection after the
+    current response. So does a handler setting close_connection before
+    its headers (e.g. when it leaves part of the request body unread).
+
+    A server with a park(connection, requests_served) method takes
+    idle connections back instead of leaving their thread blocked on
+    the next request: once a response is sent and nothing of the next
+    request has arrived, handle() returns after calling park(). The
+    server serves the next request with a new handler, whose
+    requests_served comes from server.served_before(connection).
+
+    While off, handlers speaking HTTP/1.1 (for chunked responses) still
+    send "Connection: close", so each connection serves one request.
+
+    Example:
+        class Handler(KeepAliveMixin, BaseHTTPRequestHandler):
+            ...
+        Handler.keep_alive = True
+        ThreadingHTTPServer(('localhost', 8000), Handler).serve_forever()
+    """
+
+    keep_alive = False
+    idle_timeout = 15       # seconds to wait for the next request
+    max_requests = 100      # requests per connection
+
+    def setup(self):
+        if self.keep_alive:
+            self.protocol_version = 'HTTP/1.1'
+            self.timeout = getattr(self.server, 'idle_timeout', None) or self.idle_timeout
+            # Small responses must not wait for the client's delayed ACK
+            self.disable_nagle_algorithm = True
+        served_before = getattr(self.server, 'served_before', None)
+        self.requests_served = served_before(self.request) if served_before else 0
+        super().setup()
+
+    def handle(self):
+        """Serve requests until the connection closes or is parked"""
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            if self._parked():
+                return
+            self.handle_one_request()
+
+    def _parked(self):
+        """Hand an idle connection to the server's park(); True if done"""
+        park = getattr(self.server, 'park', None)
+        if park is None:
+            return False
+        # A non-blocking peek: bytes already read into rfile's buffer,
+        # or waiting on the socket, mean the next request is here
+        self.connection.settimeout(0)
+        try:
+            pending = self.rfile.peek(1)
+        except OSError:
+            self.close_connection = True
+            return True
+        finally:
+            self.connection.settimeout(self.timeout)
+        if pending:
+            return False
+        park(self.connection, self.requests_served)
+        return True
+
+    def handle_one_request(self):
+        self._connection_header = None
+        if not self.keep_alive:
+            return super().handle_one_request()
+
+        self.requests_served += 1
+        socket_wfile = self.wfile
+        self.wfile = writer = ResponseWriter(socket_wfile)
+        try:
+            super().handle_one_request()
+        finally:
+            self.wfile = socket_wfile
+            if not writer.finish():
+                self.close_connection = True
+
+    def send_header(self, keyword, value):
+        if keyword.lower() == 'connection':
+            self._connection_header = value
+        super().send_header(keyword, value)
+
+    def end_headers(self):
+        """Tell the client whether the connection stays open"""
+        if self._connection_header is None:
+            if not self.keep_alive:
+                if self.protocol_version != 'HTTP/1.0':
+                    self.send_header('Connection', 'close')
+            elif (self.close_connection
+                    or self.requests_served >= self.max_requests
+                    or getattr(self.server, 'saturated', False)):
+                self.send_header('Connection', 'close')
+            elif self.request_version == 'HTTP/1.0' and not self.close_connection:
+                self.send_header('Connection', 'keep-alive')
+        super().end_headers()
@@ -4,8 +4,11 @@ Complete implementation of secure template rendering
 """
 
 import os
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import template_engine
+from escaping import html_escape
+from keepalive import KeepAliveMixin
+from form_parser import FormError, read_request_form
 
 # BASE_DIR: Root directory of this file
 # This pattern enables relative paths from project root
@@ -42,56 +45,24 @@ def read_template(template_name):
         raise FileNotFoundError(f"Template '{template_name}' not found at {template_path}")
 
 
-def html_escape(value):
-    """
-    Escape HTML special characters for safe rendering
-    
-    CRITICAL for XSS prevention!
-    Converts untrusted data to safe HTML representation.
-    
-    Security Rules:
-    1. MUST escape '&' FIRST (because other entities contain &)
-    2. Escape '<' and '>' to prevent tag injection
-    3. Escape '"' to prevent attribute breaking
-    4. Any untrusted data MUST be escaped
-    
-    XSS Attack Example:
-    - Malicious input: <script>alert('hacked')</script>
-    - After escape: &lt;script&gt;alert('hacked')&lt;/script&gt;
-    - Rendered: Text, not executable code
-    """
-    # Convert to string first (handles None, int, bool, etc.)
-    value_str = str(value) if value is not None else ''
-    
-    # IMPORTANT: Escape & first! Other entities contain &
-    value_str = value_str.replace('&', '&amp;')
-    
-    # Escape angle brackets to prevent tag injection
-    value_str = value_str.replace('<', '&lt;')
-    value_str = value_str.replace('>', '&gt;')
-    
-    # Escape quotes to prevent attribute breaking
-    value_str = value_str.replace('"', '&quot;')
-    
-    return value_str
-
-
 def render_template(template_name, **context):
     """
     Render template by replacing placeholders with escaped context data
     
     Process:
-    1. Load template file from templates directory
-    2. For each context variable:
-       - Escape the value (XSS prevention)
-       - Replace {{key}} with escaped value
-    3. Return rendered HTML
+    1. Load the compiled template (parsed once, cached until the file changes)
+    2. For each {{key}} slot:
+       - Escape the context value (XSS prevention)
+       - Or insert __raw_key values as-is
+    3. Join literal and slot segments into the rendered HTML
     
     Security:
     - All context values are escaped before rendering
     - Prevents XSS attacks even with malicious input
     - Untrusted data is safe to render
     - Use __raw_content for pre-rendered HTML to avoid double-escaping
+    - Values are never re-scanned, so a value containing {{other}} is
+      rendered literally instead of being substituted
     
     Example:
         # User input is escaped
@@ -103,29 +74,18 @@ def render_template(template_name, **context):
         render_template('layout.html', __raw_content=html_fragment)
         # Result: {{content}} → [raw HTML, not escaped]
     """
-    # Read template
-    template_html = read_template(template_name)
+    templates_dir = get_templates_dir()
+    template_path = os.path.join(templates_dir, template_name)
     
-    # Replace each placeholder with escaped value
-    for key, value in context.items():
-        # Check for raw content markers (don't escape pre-rendered HTML)
-        if key.startswith('__raw_'):
-            # This is pre-rendered HTML, don't escape
-            actual_key = key[6:]  # Remove __raw_ prefix
-            placeholder = f'{{{{{actual_key}}}}}'  # Creates {{actual_key}}
-            template_html = template_html.replace(placeholder, str(value) if value is not None else '')
-        else:
-            # Escape value for safe HTML rendering
-            escaped_value = html_escape(value)
-            
-            # Replace {{key}} with escaped value
-            placeholder = f'{{{{{key}}}}}'  # Creates {{key}}
-            template_html = template_html.replace(placeholder, escaped_value)
+    try:
+        segments = template_engine.load_compiled(template_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Template '{template_name}' not found at {template_path}")
     
-    return template_html
+    return template_engine.render_compiled(segments, context, html_escape)
 
 
-class TemplateHandler(BaseHTTPRequestHandler):
+class TemplateHandler(KeepAliveMixin, BaseHTTPRequestHandler):
     """HTTP handler demonstrating secure template rendering"""
     
     def do_GET(self):
@@ -157,27 +117,26 @@ class TemplateHandler(BaseHTTPRequestHandler):
     
     def do_POST(self):
         """Handle POST requests for testing"""
-        if self.path == '/render':
-            # Read user input
-            form_data = self._read_form()
-            message = form_data.get('message', '')
-            
-            # Render with user input (SAFE - html_escape() called automatically)
-            message_html = render_template('message.html', message=message)
-            # Use __raw_content to prevent double-escaping of pre-rendered HTML
-            html = render_template('layout.html', __raw_content=message_html)
-            self._send_html(html)
-            
-        else:
-            self._send_html('<h1>404 Not Found</h1>', 404)
+        try:
+            if self.path == '/render':
+                # Read user input
+                form_data = self._read_form()
+                message = form_data.get('message', '')
+                
+                # Render with user input (SAFE - html_escape() called automatically)
+                message_html = render_template('message.html', message=message)
+                # Use __raw_content to prevent double-escaping of pre-rendered HTML
+                html = render_template('layout.html', __raw_content=message_html)
+                self._send_html(html)
+                
+            else:
+                self._send_html('<h1>404 Not Found</h1>', 404)
+        except FormError as e:
+            self._send_html(f'<h1>{e.status} {html_escape(str(e))}</h1>', e.status)
     
     def _read_form(self):
-        """Read POST form data"""
-        content_length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(content_length)
-        body_string = body.decode('utf-8')
-        parsed = parse_qs(body_string)
-        return {k: v[0] for k, v in parsed.items()}
+        """Read POST form data (in chunks, with size limits; see form_parser.py)"""
+        return read_request_form(self)
     
     def _send_html(self, html, status=200):
         """Send HTML response"""
@@ -192,7 +151,9 @@ class TemplateHandler(BaseHTTPRequestHandler):
 
 
 if __name__ == '__main__':
-    server = HTTPServer(('localhost', 8009), TemplateHandler)
+    # Persistent connections; each one is served by its own thread
+    TemplateHandler.keep_alive = True
+    server = ThreadingHTTPServer(('localhost', 8009), TemplateHandler)
     
     print("╔════════════════════════════════════════════╗")
     print("║  Template Engine with XSS Protection       ║")
@@ -205,6 +166,7 @@ if __name__ == '__main__':
     print("  ✓ HTML entity escaping (&, <, >, \")")
     print("  ✓ XSS attack prevention")
     print("  ✓ Type conversion (None, int, bool → string)")
+    print("  ✓ HTTP/1.1 keep-alive connections")
     print("\nTest URLs:")
     print("  GET  http://localhost:8009/              - Home page")
     print("  GET  http://localhost:8009/user          - User page")
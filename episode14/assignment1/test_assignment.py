@@ -9,11 +9,13 @@ import sys
 from http.server import HTTPServer
 import threading
 import time
+import tempfile
 import requests
 from urllib.parse import urlencode
 
 # Import solution
 from solution import read_template, html_escape, render_template, TemplateHandler, BASE_DIR, get_templates_dir
+import template_engine
 
 
 class TestPathHandling(unittest.TestCase):
@@ -188,6 +190,52 @@ class TestTemplateRendering(unittest.TestCase):
         self.assertIn('&lt;img', result)
 
 
+class TestCompiledTemplates(unittest.TestCase):
+    """Test compiled, cached template engine"""
+    
+    def test_compile_segments(self):
+        """Test template splits into literal and slot segments"""
+        segments = template_engine.compile_template('<p>{{a}} and {{b}}</p>')
+        
+        self.assertEqual(segments, ('<p>', ('slot', 'a'), ' and ', ('slot', 'b'), '</p>'))
+    
+    def test_unknown_placeholder_left_untouched(self):
+        """Test placeholders without context stay in output"""
+        segments = template_engine.compile_template('{{a}}-{{b}}')
+        result = template_engine.render_compiled(segments, {'a': 1}, html_escape)
+        
+        self.assertEqual(result, '1-{{b}}')
+    
+    def test_value_is_not_rescanned(self):
+        """Test a value containing {{key}} is not substituted again"""
+        segments = template_engine.compile_template('{{a}}|{{b}}')
+        result = template_engine.render_compiled(segments, {'a': '{{b}}', 'b': 'x'}, html_escape)
+        
+        self.assertEqual(result, '{{b}}|x')
+    
+    def test_matches_replace_loop(self):
+        """Test compiled rendering matches chained str.replace output"""
+        expected = read_template('message.html').replace('{{message}}', html_escape('<b>&"</b>'))
+        
+        self.assertEqual(render_template('message.html', message='<b>&"</b>'), expected)
+    
+    def test_cache_invalidated_on_change(self):
+        """Test cached template is recompiled when the file changes"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'page.html')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('<p>{{a}}</p>')
+            first = template_engine.load_compiled(path)
+            self.assertIs(template_engine.load_compiled(path), first)
+            
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('<div>{{a}}</div>')
+            os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000_000))
+            
+            result = template_engine.render_compiled(template_engine.load_compiled(path), {'a': 'x'}, html_escape)
+            self.assertEqual(result, '<div>x</div>')
+
+
 class TestTemplateHTTPServer(unittest.TestCase):
     """Test HTTP server with template rendering"""
     
@@ -283,6 +331,24 @@ class TestTemplateHTTPServer(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         # All special chars should be escaped
         self.assertIn('A&amp;B&lt;C&gt;D&quot;E', response.text)
+    
+    def test_keep_alive_connection_reuse(self):
+        """Test keep-alive mode answers several requests on one connection"""
+        import http.client
+        TemplateHandler.keep_alive = True
+        conn = http.client.HTTPConnection('localhost', 8010, timeout=5)
+        try:
+            sock = None
+            for path in ('/', '/user', '/invalid', '/test-xss'):
+                conn.request('GET', path)
+                response = conn.getresponse()
+                body = response.read()
+                self.assertEqual(response.getheader('Content-Length'), str(len(body)))
+                sock = sock or conn.sock
+                self.assertIs(conn.sock, sock)
+        finally:
+            TemplateHandler.keep_alive = False
+            conn.close()
 
 
 if __name__ == '__main__':
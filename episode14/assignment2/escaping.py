@@ -0,0 +1,76 @@
+"""
+EPISODE 14 - HTML escaping module (same as assignment1)
+Shared escaping helpers for solution and template modules
+
+Output is identical to the chained str.replace versions:
+- content: & < > "        -> &amp; &lt; &gt; &quot;
+- attribute: & < > " '    -> ... plus &#x27;
+
+Strings with no special characters are returned as-is (no new string),
+and each replace pass only runs if its character is present.
+"""
+
+
+def _to_text(value):
+    """Convert any value to str (None -> '')"""
+    if value is None:
+        return ''
+    return value if type(value) is str else str(value)
+
+
+def html_escape(value):
+    """
+    Escape HTML special characters for safe content rendering
+    
+    CRITICAL for XSS prevention!
+    - MUST escape '&' FIRST (because other entities contain &)
+    - Escape '<' and '>' to prevent tag injection
+    - Escape '"' to prevent attribute breaking
+    - None becomes '', other types are converted with str()
+    """
+    text = _to_text(value)
+    
+    # IMPORTANT: & first! Other entities contain &
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    if '"' in text:
+        text = text.replace('"', '&quot;')
+    return text
+
+
+def escape_attribute(value):
+    """Escape a value for an HTML attribute (also escapes single quotes)"""
+    text = html_escape(value)
+    if "'" in text:
+        text = text.replace("'", '&#x27;')
+    return text
+
+
+def escape_record(record, defaults, attribute_fields=()):
+    """
+    Escape several fields of one record at once
+
+    Args:
+        record: dict (e.g. a student)
+        defaults: {field: default} - fields to escape for HTML content
+        attribute_fields: fields to also escape for attributes,
+            returned under '<field>_attr'
+
+    Returns:
+        dict - {field: escaped_value, '<field>_attr': escaped_value}
+
+    Example:
+        escape_record({'name': '<b>'}, {'name': ''})
+        # {'name': '&lt;b&gt;'}
+    """
+    escaped = {}
+    get = record.get
+    for field, default in defaults.items():
+        escaped[field] = html_escape(get(field, default))
+    for field in attribute_fields:
+        escaped[field + '_attr'] = escape_attribute(get(field, defaults.get(field, '')))
+    return escaped
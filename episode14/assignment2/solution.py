@@ -11,11 +11,15 @@ Concepts:
 """
 
 import os
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import parse_qs, urlencode
 import json
 import threading
 import uuid
+import template_engine
+from escaping import html_escape, escape_attribute, escape_record
+from keepalive import KeepAliveMixin
+from form_parser import FormError, read_request_form
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -23,6 +27,9 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 STUDENTS = []
 STUDENTS_LOCK = threading.Lock()
 
+# Fields escaped for each table row: {field: default}
+ROW_FIELDS = {'id': '', 'name': 'Unknown', 'email': '', 'grade': '0'}
+
 
 def get_templates_dir():
     """Return path to templates directory"""
@@ -38,60 +45,19 @@ def read_template(template_name):
         return f.read()
 
 
-def html_escape(value):
-    """
-    Escape HTML special characters for safe content rendering
-    
-    Security: Escape & first!
-    """
-    value_str = str(value) if value is not None else ''
-    
-    value_str = value_str.replace('&', '&amp;')    # MUST be first!
-    value_str = value_str.replace('<', '&lt;')
-    value_str = value_str.replace('>', '&gt;')
-    value_str = value_str.replace('"', '&quot;')
-    
-    return value_str
-
-
 def render_template(template_name, **context):
     """
     Render template with context variables
     
+    Templates are compiled once into literal/slot segments and cached
+    until the file's mtime changes (see template_engine).
+    
     Raw HTML content: Use __raw_prefix to avoid double-escaping
     Example: render_template('layout.html', __raw_content=html_fragment)
     """
-    template_html = read_template(template_name)
-    
-    for key, value in context.items():
-        if key.startswith('__raw_'):
-            actual_key = key[6:]  # Remove __raw_ prefix
-            placeholder = f'{{{{{actual_key}}}}}'
-            template_html = template_html.replace(placeholder, str(value) if value is not None else '')
-        else:
-            escaped_value = html_escape(value)
-            placeholder = f'{{{{{key}}}}}'
-            template_html = template_html.replace(placeholder, escaped_value)
-    
-    return template_html
-
-
-def escape_attribute(value):
-    """
-    Escape values for use in HTML attributes (stricter than content escaping)
-    
-    Used in: onclick, href, data-attributes, style, class, etc.
-    """
-    value_str = str(value) if value is not None else ''
-    
-    # Escape &, <, >, ", and '
-    value_str = value_str.replace('&', '&amp;')    # First!
-    value_str = value_str.replace('<', '&lt;')
-    value_str = value_str.replace('>', '&gt;')
-    value_str = value_str.replace('"', '&quot;')
-    value_str = value_str.replace("'", '&#x27;')   # Also escape single quotes in attributes
-    
-    return value_str
+    template_path = os.path.join(get_templates_dir(), template_name)
+    segments = template_engine.load_compiled(template_path)
+    return template_engine.render_compiled(segments, context, html_escape)
 
 
 def student_row_html(student):
@@ -111,9 +77,6 @@ def student_row_html(student):
     - HTML escaping for content
     - Attribute escaping for href
     """
-    student_id = student.get('id', '')
-    name = student.get('name', 'Unknown')
-    email = student.get('email', '')
     grade = student.get('grade', '0')
     
     # Convert grade to int
@@ -122,27 +85,24 @@ def student_row_html(student):
     except (ValueError, TypeError):
         grade_int = 0
     
-    # Determine status
+    # Determine status (fixed strings, nothing to escape)
     status = 'Pass' if grade_int >= 60 else 'Fail'
     status_class = 'pass' if grade_int >= 60 else 'fail'
     
-    # Build row with escaped values
-    # Escape all content
-    escaped_id = html_escape(student_id)
-    escaped_name = html_escape(name)
-    escaped_email = html_escape(email)
-    escaped_grade = html_escape(grade)
-    escaped_status = html_escape(status)
-    
-    # Escape attribute values
-    escaped_id_attr = escape_attribute(student_id)
+    # Escape all content (and the id for the href attributes) in one call
+    escaped = escape_record(student, ROW_FIELDS, ('id',))
+    escaped_id = escaped['id']
+    escaped_name = escaped['name']
+    escaped_email = escaped['email']
+    escaped_grade = escaped['grade']
+    escaped_id_attr = escaped['id_attr']
     
     return f'''<tr>
         <td>{escaped_id}</td>
         <td>{escaped_name}</td>
         <td>{escaped_email}</td>
         <td>{escaped_grade}</td>
-        <td><span class="{status_class}">{escaped_status}</span></td>
+        <td><span class="{status_class}">{status}</span></td>
         <td>
             <a href="/students/edit?id={escaped_id_attr}">Edit</a>
             <a href="/students/delete?id={escaped_id_attr}" onclick="return confirm('Delete?')">Delete</a>
@@ -150,6 +110,53 @@ def student_row_html(student):
     </tr>'''
 
 
+# Static parts of the student table (rows are streamed between them)
+TABLE_HEAD = '''<table class="student-table">
+    <thead>
+        <tr>
+            <th>ID</th>
+            <th>Name</th>
+            <th>Email</th>
+            <th>Grade</th>
+            <th>Status</th>
+            <th>Actions</th>
+        </tr>
+    </thead>
+    <tbody>
+        '''
+TABLE_FOOT = '''
+    </tbody>
+</table>'''
+
+# Rows rendered per streamed chunk
+ROW_BATCH_SIZE = 500
+
+
+def iter_student_list(students, batch_size=ROW_BATCH_SIZE):
+    """
+    Render student table as a sequence of HTML chunks
+    
+    Yields the table head, then rows in batches of batch_size,
+    then the table foot. Only one batch is held in memory at a time.
+    """
+    if not students:
+        yield '<p>No students found</p>'
+        return
+    
+    yield TABLE_HEAD
+    
+    rows = []
+    for student in students:
+        rows.append(student_row_html(student))
+        if len(rows) >= batch_size:
+            yield ''.join(rows)
+            rows = []
+    if rows:
+        yield ''.join(rows)
+    
+    yield TABLE_FOOT
+
+
 def render_student_list(students):
     """
     Render list of students as HTML table
@@ -166,31 +173,29 @@ def render_student_list(students):
     - Building complex HTML from data
     - Security-conscious rendering
     """
-    if not students:
-        return '<p>No students found</p>'
-    
-    rows = []
-    for student in students:
-        row = student_row_html(student)
-        rows.append(row)
+    return ''.join(iter_student_list(students))
+
+
+def iter_home_page(students):
+    """
+    Render the home page (layout + student table) as HTML chunks
     
-    table = f'''<table class="student-table">
-    <thead>
-        <tr>
-            <th>ID</th>
-            <th>Name</th>
-            <th>Email</th>
-            <th>Grade</th>
-            <th>Status</th>
-            <th>Actions</th>
-        </tr>
-    </thead>
-    <tbody>
-        {''.join(rows)}
-    </tbody>
-</table>'''
+    The layout is split around {{content}} so its head goes out before
+    any student row is rendered.
+    """
+    template_path = os.path.join(get_templates_dir(), 'layout.html')
+    segments = template_engine.load_compiled(template_path)
+    layout_head, layout_tail = template_engine.render_split(segments, {}, html_escape, 'content')
     
-    return table
+    yield layout_head
+    yield '''
+            <h2>Student List</h2>
+            <p><a href="/add">Add New Student</a></p>
+            '''
+    yield from iter_student_list(students)
+    yield '''
+            '''
+    yield layout_tail
 
 
 def get_students():
@@ -217,25 +222,21 @@ def save_students(students):
             json.dump(students, f, indent=2, ensure_ascii=False)
 
 
-class StudentListHandler(BaseHTTPRequestHandler):
+class StudentListHandler(KeepAliveMixin, BaseHTTPRequestHandler):
     """HTTP handler for student list management with templates"""
     
+    # HTTP/1.1 is required for Transfer-Encoding: chunked.
+    # Unless keep_alive is on (__main__ turns it on), KeepAliveMixin
+    # sends "Connection: close", so each connection serves one request.
+    protocol_version = 'HTTP/1.1'
+    
     def do_GET(self):
         """Handle GET requests"""
         students = get_students()
         
         if self.path == '/':
-            # Home page - show all students
-            table_html = render_student_list(students)
-            
-            content = f'''
-            <h2>Student List</h2>
-            <p><a href="/add">Add New Student</a></p>
-            {table_html}
-            '''
-            
-            html = render_template('layout.html', __raw_content=content)
-            self._send_html(html)
+            # Home page - show all students (streamed in chunks)
+            self._send_html_chunked(iter_home_page(students))
         
         elif self.path == '/add':
             # Add student form
@@ -314,98 +315,128 @@ class StudentListHandler(BaseHTTPRequestHandler):
     
     def do_POST(self):
         """Handle POST requests"""
-        if self.path == '/students/add':
-            # Add new student
-            form_data = self._read_form()
-            
-            name = form_data.get('name', '').strip()
-            email = form_data.get('email', '').strip()
-            grade = form_data.get('grade', '0').strip()
-            
-            # Validate
-            if not name or not email or not grade:
-                self._send_html('<h1>400 Bad Request</h1>', 400)
-                return
-            
-            # Create new student
-            students = get_students()
-            new_student = {
-                'id': str(uuid.uuid4())[:8],
-                'name': name,
-                'email': email,
-                'grade': grade
-            }
-            
-            students.append(new_student)
-            save_students(students)
-            
-            # Redirect to home
-            self._redirect('/')
-        
-        elif self.path == '/students/update':
-            # Update student
-            form_data = self._read_form()
-            
-            student_id = form_data.get('id', '').strip()
-            name = form_data.get('name', '').strip()
-            email = form_data.get('email', '').strip()
-            grade = form_data.get('grade', '0').strip()
-            
-            if not student_id or not name or not email or not grade:
-                self._send_html('<h1>400 Bad Request</h1>', 400)
-                return
-            
-            # Find and update student
-            students = get_students()
-            for student in students:
-                if student.get('id') == student_id:
-                    student['name'] = name
-                    student['email'] = email
-                    student['grade'] = grade
-                    break
-            
-            save_students(students)
-            self._redirect('/')
-        
-        elif self.path.startswith('/students/delete'):
-            # Delete student
-            query = self.path.split('?')[1] if '?' in self.path else ''
-            params = parse_qs(query)
-            student_id = params.get('id', [None])[0]
+        try:
+            if self.path == '/students/add':
+                # Add new student
+                form_data = self._read_form()
+                
+                name = form_data.get('name', '').strip()
+                email = form_data.get('email', '').strip()
+                grade = form_data.get('grade', '0').strip()
+                
+                # Validate
+                if not name or not email or not grade:
+                    self._send_html('<h1>400 Bad Request</h1>', 400)
+                    return
+                
+                # Create new student
+                students = get_students()
+                new_student = {
+                    'id': str(uuid.uuid4())[:8],
+                    'name': name,
+                    'email': email,
+                    'grade': grade
+                }
+                
+                students.append(new_student)
+                save_students(students)
+                
+                # Redirect to home
+                self._redirect('/')
             
-            if not student_id:
-                self._send_html('<h1>400 Bad Request</h1>', 400)
-                return
+            elif self.path == '/students/update':
+                # Update student
+                form_data = self._read_form()
+                
+                student_id = form_data.get('id', '').strip()
+                name = form_data.get('name', '').strip()
+                email = form_data.get('email', '').strip()
+                grade = form_data.get('grade', '0').strip()
+                
+                if not student_id or not name or not email or not grade:
+                    self._send_html('<h1>400 Bad Request</h1>', 400)
+                    return
+                
+                # Find and update student
+                students = get_students()
+                for student in students:
+                    if student.get('id') == student_id:
+                        student['name'] = name
+                        student['email'] = email
+                        student['grade'] = grade
+                        break
+                
+                save_students(students)
+                self._redirect('/')
             
-            # Remove student
-            students = get_students()
-            students = [s for s in students if s.get('id') != student_id]
-            save_students(students)
+            elif self.path.startswith('/students/delete'):
+                # Delete student
+                query = self.path.split('?')[1] if '?' in self.path else ''
+                params = parse_qs(query)
+                student_id = params.get('id', [None])[0]
+                
+                if not student_id:
+                    self._send_html('<h1>400 Bad Request</h1>', 400)
+                    return
+                
+                # Remove student
+                students = get_students()
+                students = [s for s in students if s.get('id') != student_id]
+                save_students(students)
+                
+                self._redirect('/')
             
-            self._redirect('/')
-        
-        else:
-            self._send_html('<h1>404 Not Found</h1>', 404)
+            else:
+                self._send_html('<h1>404 Not Found</h1>', 404)
+        except FormError as e:
+            self._send_html(f'<h1>{e.status} {html_escape(str(e))}</h1>', e.status)
     
     def _read_form(self):
-        """Read POST form data"""
-        content_length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(content_length)
-        body_string = body.decode('utf-8')
-        parsed = parse_qs(body_string)
-        return {k: v[0] for k, v in parsed.items()}
+        """Read POST form data (in chunks, with size limits; see form_parser.py)"""
+        return read_request_form(self)
     
     def _send_html(self, html, status=200):
         """Send HTML response"""
+        body = html.encode('utf-8')
         self.send_response(status)
         self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(html.encode('utf-8'))
+        self.wfile.write(body)
+    
+    def _send_html_chunked(self, chunks, status=200):
+        """
+        Send HTML generated piece by piece (Transfer-Encoding: chunked)
+        
+        Each chunk is written as soon as it is produced, so the first
+        bytes go out before the whole page exists and memory stays flat.
+        HTTP/1.0 clients can't read chunked bodies; they get the chunks
+        unframed and the end of the body is the closed connection.
+        """
+        chunked = self.request_version != 'HTTP/1.0'
+        
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        
+        for chunk in chunks:
+            data = chunk.encode('utf-8')
+            if not data:
+                continue
+            if chunked:
+                data = b'%X\r\n%s\r\n' % (len(data), data)
+            self.wfile.write(data)
+        
+        if chunked:
+            self.wfile.write(b'0\r\n\r\n')
     
     def _redirect(self, path):
         """Send redirect response"""
         self.send_response(302)
         self.send_header('Location', path)
+        self.send_header('Content-Length', '0')
         self.end_headers()
     
     def log_message(self, format, *args):
@@ -414,7 +445,9 @@ class StudentListHandler(BaseHTTPRequestHandler):
 
 
 if __name__ == '__main__':
-    server = HTTPServer(('localhost', 8011), StudentListHandler)
+    # Persistent connections; each one is served by its own thread
+    StudentListHandler.keep_alive = True
+    server = ThreadingHTTPServer(('localhost', 8011), StudentListHandler)
     
     print("╔════════════════════════════════════════════╗")
     print("║  Student Management with Templates         ║")
@@ -427,6 +460,7 @@ if __name__ == '__main__':
     print("  ✓ HTML table generation from data")
     print("  ✓ Attribute escaping for security")
     print("  ✓ CRUD operations (Create, Read, Update, Delete)")
+    print("  ✓ HTTP/1.1 keep-alive connections")
     print("\nEndpoints:")
     print("  GET  /              - Student list")
     print("  GET  /add           - Add student form")
@@ -0,0 +1,109 @@
+"""
+EPISODE 14 - Compiled template engine (same as assignment1)
+Parses {{key}} placeholders once and renders with a single join
+"""
+
+import os
+import re
+import threading
+
+# Matches {{name}} placeholders (same text the replace loop looked for)
+PLACEHOLDER_PATTERN = re.compile(r'\{\{([^{}]+)\}\}')
+
+# Prefix marking pre-rendered HTML that must not be escaped
+RAW_PREFIX = '__raw_'
+
+# Compiled templates: {template_path: ((mtime_ns, size), segments)}
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def compile_template(source):
+    """
+    Split template source into literal and slot segments
+
+    Returns:
+        tuple - segments, where literals are str and slots are
+        ('slot', name) tuples. Literals sit at even positions,
+        slots at odd positions.
+    """
+    parts = PLACEHOLDER_PATTERN.split(source)
+    segments = []
+    for index, part in enumerate(parts):
+        if index % 2:
+            segments.append(('slot', part))
+        else:
+            segments.append(part)
+    return tuple(segments)
+
+
+def render_compiled(segments, context, escape):
+    """
+    Render compiled segments with context values
+
+    Lookup rules (same as the original replace loop):
+    - {{key}} with context['key'] -> escaped value
+    - {{key}} with context['__raw_key'] -> raw value (None -> '')
+    - unknown placeholders are left in the output untouched
+    """
+    out = []
+    append = out.append
+    for index, segment in enumerate(segments):
+        if not index % 2:
+            append(segment)
+            continue
+        name = segment[1]
+        if name in context:
+            append(escape(context[name]))
+        elif RAW_PREFIX + name in context:
+            value = context[RAW_PREFIX + name]
+            append(str(value) if value is not None else '')
+        else:
+            append('{{' + name + '}}')
+    return ''.join(out)
+
+
+def render_split(segments, context, escape, slot_name):
+    """
+    Render everything before and after one slot
+
+    Used for streaming: the caller sends the head, then generates the
+    slot's content in pieces, then sends the tail.
+
+    Returns:
+        tuple - (head, tail) strings
+    """
+    for index in range(1, len(segments), 2):
+        if segments[index][1] == slot_name:
+            head = render_compiled(segments[:index], context, escape)
+            tail = render_compiled(segments[index + 1:], context, escape)
+            return head, tail
+    raise KeyError(f"Template has no {{{{{slot_name}}}}} slot")
+
+
+def load_compiled(template_path):
+    """
+    Return compiled segments for a template file
+
+    The compiled form is cached in-process and re-parsed only when the
+    file's mtime or size changes, so edits show up without a restart.
+    """
+    stat = os.stat(template_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _CACHE.get(template_path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    with open(template_path, 'r', encoding='utf-8') as f:
+        segments = compile_template(f.read())
+
+    with _CACHE_LOCK:
+        _CACHE[template_path] = (stamp, segments)
+    return segments
+
+
+def clear_cache():
+    """Drop all compiled templates (for testing)"""
+    with _CACHE_LOCK:
+        _CACHE.clear()
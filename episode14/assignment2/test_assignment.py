@@ -16,9 +16,10 @@ import json
 # Import solution
 from solution import (
     read_template, html_escape, render_template, escape_attribute,
-    student_row_html, render_student_list, StudentListHandler,
+    student_row_html, render_student_list, iter_student_list, StudentListHandler,
     get_students, save_students, BASE_DIR, get_templates_dir
 )
+from escaping import escape_record
 
 
 class TestEscapeAttribute(unittest.TestCase):
@@ -46,6 +47,45 @@ class TestEscapeAttribute(unittest.TestCase):
         self.assertNotIn('&amp;amp;', result)  # Not double-escaped
 
 
+class TestEscapingModule(unittest.TestCase):
+    """Test shared escaping module matches the chained replace output"""
+    
+    SAMPLES = ['', 'Alice', '&', '&amp;', '<a href="x">O\'Neil & co</a>', 'ünïcødé <>', 42, 3.5, None, True]
+    
+    def _replace_escape(self, value, attribute=False):
+        """Reference implementation (original chained str.replace)"""
+        text = str(value) if value is not None else ''
+        text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+        if attribute:
+            text = text.replace("'", '&#x27;')
+        return text
+    
+    def test_content_output_identical(self):
+        """Test html_escape matches chained replace byte for byte"""
+        for value in self.SAMPLES:
+            self.assertEqual(html_escape(value), self._replace_escape(value))
+    
+    def test_attribute_output_identical(self):
+        """Test escape_attribute matches chained replace byte for byte"""
+        for value in self.SAMPLES:
+            self.assertEqual(escape_attribute(value), self._replace_escape(value, attribute=True))
+    
+    def test_clean_string_returned_unchanged(self):
+        """Test strings without special characters skip escaping"""
+        text = 'plain text value'
+        self.assertIs(html_escape(text), text)
+    
+    def test_escape_record(self):
+        """Test batch escaping of a whole student record"""
+        student = {'id': "a'1", 'name': '<b>Bob</b>'}
+        escaped = escape_record(student, {'id': '', 'name': 'Unknown', 'email': ''}, ('id',))
+        
+        self.assertEqual(escaped['name'], '&lt;b&gt;Bob&lt;/b&gt;')
+        self.assertEqual(escaped['email'], '')
+        self.assertEqual(escaped['id'], "a'1")
+        self.assertEqual(escaped['id_attr'], 'a&#x27;1')
+
+
 class TestStudentRow(unittest.TestCase):
     """Test student_row_html function"""
     
@@ -164,6 +204,15 @@ class TestRenderStudentList(unittest.TestCase):
         self.assertIn('Edit', result)
         self.assertIn('Delete', result)
 
+    def test_iter_student_list_batches(self):
+        """Test streamed table is batched and matches the full render"""
+        students = [{'id': str(i), 'name': f'S{i}', 'email': 'a@b.c', 'grade': '70'} for i in range(5)]
+        chunks = list(iter_student_list(students, batch_size=2))
+        
+        # head + 3 row batches (2, 2, 1) + foot
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(''.join(chunks), render_student_list(students))
+
 
 class TestDataPersistence(unittest.TestCase):
     """Test student data persistence"""
@@ -264,6 +313,13 @@ class TestStudentListHTTPServer(unittest.TestCase):
         self.assertIn('Student List', response.text)
         self.assertIn('<!DOCTYPE html>', response.text)
     
+    def test_home_page_streamed_chunked(self):
+        """Test home page is sent with chunked transfer encoding"""
+        response = requests.get(f'{self.base_url}/')
+        
+        self.assertEqual(response.headers.get('Transfer-Encoding'), 'chunked')
+        self.assertIn('</html>', response.text)
+    
     def test_home_page_no_students(self):
         """Test home page when no students"""
         response = requests.get(f'{self.base_url}/')
@@ -435,6 +491,31 @@ class TestStudentListHTTPServer(unittest.TestCase):
         response = requests.get(f'{self.base_url}/students/edit?id=invalid')
         
         self.assertEqual(response.status_code, 404)
+    
+    def test_keep_alive_connection_reuse(self):
+        """Test keep-alive mode keeps the connection open after chunked pages"""
+        import http.client
+        StudentListHandler.keep_alive = True
+        conn = http.client.HTTPConnection('localhost', 8020, timeout=5)
+        try:
+            conn.request('GET', '/')
+            response = conn.getresponse()
+            self.assertEqual(response.getheader('Transfer-Encoding'), 'chunked')
+            self.assertIn(b'</html>', response.read())
+            self.assertIsNone(response.getheader('Connection'))
+            sock = conn.sock
+            
+            conn.request('GET', '/add')
+            response = conn.getresponse()
+            self.assertIn(b'</html>', response.read())
+            conn.request('GET', '/students/edit?id=invalid')
+            response = conn.getresponse()
+            response.read()
+            self.assertEqual(response.status, 404)
+            self.assertIs(conn.sock, sock)
+        finally:
+            StudentListHandler.keep_alive = False
+            conn.close()
 
 
 if __name__ == '__main__':
@@ -3,18 +3,7 @@ EPISODE 15 - HTML Template Rendering Module
 Generates HTML pages for the student management system
 """
 
-
-def html_escape(value):
-    """Escape HTML special characters"""
-    if value is None:
-        return ""
-    value = str(value)
-    # Escape in correct order
-    value = value.replace('&', '&amp;')
-    value = value.replace('<', '&lt;')
-    value = value.replace('>', '&gt;')
-    value = value.replace('"', '&quot;')
-    return value
+from escaping import html_escape
 
 
 def render_base(title, content):
@@ -14,13 +14,20 @@ import sys
 
 import stores
 import page
+from conditional import DataVersion
+from keepalive import KeepAliveMixin
+from pooled_server import PooledHTTPServer
+from form_parser import FormError, read_request_form
+from schema import Field, Schema
 
 
 STUDENTS = {}
+# Bumped after every change to STUDENTS; validates cached pages (ETag)
+DATA_VERSION = DataVersion()
 
 
 def parse_form_data(content):
-    """Parse form data from POST request"""
+    """Parse urlencoded form data already read into memory"""
     try:
         parsed = urllib.parse.parse_qs(content.decode('utf-8'))
         form_data = {}
@@ -32,25 +39,20 @@ def parse_form_data(content):
         return {}
 
 
+# Field checks for add and edit, compiled once (see schema.py)
+STUDENT_SCHEMA = Schema([
+    Field('roll_no', required="Roll number is required", strip=True),
+    Field('name', required="Name is required", strip=True),
+    Field('grade', required="Grade is required", strip=True),
+    Field('attendance', int, default=0, min=0, max=100,
+          range_error="Attendance must be between 0 and 100",
+          type_error="Attendance must be a valid number"),
+])
+
+
 def validate_student_data(form_data, roll_no=None):
     """Validate student data"""
-    errors = []
-    
-    # Check required fields
-    if not form_data.get('roll_no', '').strip():
-        errors.append("Roll number is required")
-    if not form_data.get('name', '').strip():
-        errors.append("Name is required")
-    if not form_data.get('grade', '').strip():
-        errors.append("Grade is required")
-    
-    # Check attendance
-    try:
-        attendance = int(form_data.get('attendance', 0))
-        if attendance < 0 or attendance > 100:
-            errors.append("Attendance must be between 0 and 100")
-    except ValueError:
-        errors.append("Attendance must be a valid number")
+    errors = STUDENT_SCHEMA.validate(form_data)
     
     # Check for duplicate roll number (only when adding new)
     new_roll_no = form_data.get('roll_no', '').strip()
@@ -60,7 +62,7 @@ def validate_student_data(form_data, roll_no=None):
     return errors
 
 
-class StudentHandler(http.server.BaseHTTPRequestHandler):
+class StudentHandler(KeepAliveMixin, http.server.BaseHTTPRequestHandler):
     """HTTP request handler for student management"""
     
     def do_GET(self):
@@ -71,6 +73,7 @@ class StudentHandler(http.server.BaseHTTPRequestHandler):
         if path == '/__test_reset__':
             global STUDENTS
             STUDENTS.clear()
+            DATA_VERSION.bump()
             if os.path.exists('students_data.json'):
                 try:
                     os.remove('students_data.json')
@@ -83,8 +86,19 @@ class StudentHandler(http.server.BaseHTTPRequestHandler):
             return
         
         if path == '/':
+            etag = DATA_VERSION.etag('home')
+            validators = DATA_VERSION.validators(etag)
+            if DATA_VERSION.is_fresh(self.headers, etag):
+                # Client's copy is current: no body
+                self.send_response(304)
+                for name, value in validators:
+                    self.send_header(name, value)
+                self.end_headers()
+                return
             self.send_response(200)
             self.send_header('Content-type', 'text/html; charset=utf-8')
+            for name, value in validators:
+                self.send_header(name, value)
             self.end_headers()
             self.wfile.write(page.render_home(STUDENTS).encode('utf-8'))
         
@@ -141,9 +155,14 @@ class StudentHandler(http.server.BaseHTTPRequestHandler):
     
     def do_POST(self):
         """Handle POST requests"""
-        content_length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(content_length)
-        form_data = parse_form_data(body)
+        try:
+            form_data = read_request_form(self)
+        except FormError as e:
+            self.send_response(e.status)
+            self.send_header('Content-type', 'text/html; charset=utf-8')
+            self.end_headers()
+            self.wfile.write(page.render_error(str(e)).encode('utf-8'))
+            return
         path = self.path
         
         if path == '/add':
@@ -168,6 +187,7 @@ class StudentHandler(http.server.BaseHTTPRequestHandler):
                     'fees_paid': 'fees_paid' in form_data,
                     'added_on': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 }
+                DATA_VERSION.bump()
                 stores.save_students(STUDENTS)
                 
                 # Redirect to home
@@ -200,6 +220,7 @@ class StudentHandler(http.server.BaseHTTPRequestHandler):
                     STUDENTS[roll_no]['grade'] = form_data.get('grade', '').strip()
                     STUDENTS[roll_no]['attendance'] = int(form_data.get('attendance', 0))
                     STUDENTS[roll_no]['fees_paid'] = 'fees_paid' in form_data
+                    DATA_VERSION.bump()
                     stores.save_students(STUDENTS)
                     
                     # Redirect to home
@@ -218,6 +239,7 @@ class StudentHandler(http.server.BaseHTTPRequestHandler):
                 if form_data.get('confirm') == 'yes':
                     # Delete student
                     del STUDENTS[roll_no]
+                    DATA_VERSION.bump()
                     stores.save_students(STUDENTS)
                     
                     # Redirect to home
@@ -242,15 +264,17 @@ class StudentHandler(http.server.BaseHTTPRequestHandler):
         pass
 
 
-def start_server(port=5000):
-    """Start the HTTP server"""
+def start_server(port=5000, keep_alive=True):
+    """Start the HTTP server (persistent connections unless keep_alive=False)"""
     global STUDENTS
     
     # Load existing students from file
     STUDENTS = stores.load_students()
+    DATA_VERSION.bump()
     
     # Create server
-    server = http.server.ThreadingHTTPServer(('127.0.0.1', port), StudentHandler)
+    StudentHandler.keep_alive = keep_alive
+    server = PooledHTTPServer(('127.0.0.1', port), StudentHandler)
     print(f"Server running at http://127.0.0.1:{port}")
     
     # Handle graceful shutdown (only in main thread)
@@ -290,6 +290,34 @@ class TestStudentManagementSystem(unittest.TestCase):
         
         self.assertEqual(len(errors), 0)
     
+    def test_validate_student_data_all_errors(self):
+        """Test every failing field is reported in one call"""
+        errors = solution.validate_student_data({'roll_no': ' ', 'name': 'John',
+                                                 'grade': '', 'attendance': '101'})
+        self.assertEqual(errors, ["Roll number is required", "Grade is required",
+                                  "Attendance must be between 0 and 100"])
+        errors = solution.validate_student_data({'roll_no': '1', 'name': 'J', 'grade': 'A',
+                                                 'attendance': 'x'})
+        self.assertEqual(errors, ["Attendance must be a valid number"])
+    
+    def test_schema_clean_and_unique(self):
+        """Test a compiled schema converts values and checks uniqueness"""
+        from schema import Field, Schema
+        student = Schema([
+            Field('id', int, default='', min=1, unique_error='ID already exists'),
+            Field('name', required='Name is required', strip=True, max_length=5),
+            Field('score', float, min=0, max=100),
+        ])
+        self.assertEqual(student.clean({'id': '7', 'name': ' Ann '}, {1, 2}),
+                         ({'id': 7, 'name': 'Ann'}, []))
+        values, errors = student.clean({'id': '2', 'name': 'Annabel', 'score': '-1'}, {1, 2})
+        self.assertEqual(values, {})
+        self.assertEqual(errors, ['ID already exists', 'name has an invalid length',
+                                  'score is out of range'])
+        self.assertEqual(student.validate({'id': 'x', 'name': ''}),
+                         ['id must be a valid number', 'Name is required'])
+        self.assertIn('def validate(data, existing=None):', student.source)
+    
     def test_html_escape_special_chars(self):
         """Test HTML escape function"""
         # Test ampersand
@@ -322,6 +350,45 @@ class TestStudentManagementSystem(unittest.TestCase):
         
         self.assertFalse(solution.STUDENTS['102']['fees_paid'])
     
+    def test_home_page_not_modified(self):
+        """Test home page answers If-None-Match with 304 until data changes"""
+        from urllib.error import HTTPError
+        data = b'roll_no=101&name=John&grade=A&attendance=95'
+        urlopen(Request('http://127.0.0.1:5555/add', data=data))
+        
+        etag = urlopen('http://127.0.0.1:5555/').headers['ETag']
+        try:
+            urlopen(Request('http://127.0.0.1:5555/', headers={'If-None-Match': etag}))
+            self.fail("Should have answered 304")
+        except HTTPError as e:
+            self.assertEqual(e.code, 304)
+        
+        data = b'roll_no=101&name=Johnny&grade=A&attendance=95'
+        urlopen(Request('http://127.0.0.1:5555/edit/101', data=data))
+        response = urlopen(Request('http://127.0.0.1:5555/', headers={'If-None-Match': etag}))
+        self.assertEqual(response.status, 200)
+        self.assertIn('Johnny', response.read().decode('utf-8'))
+    
+    def test_keep_alive_connection_reuse(self):
+        """Test the server keeps connections open between requests"""
+        import http.client
+        conn = http.client.HTTPConnection('127.0.0.1', 5555, timeout=5)
+        try:
+            conn.request('POST', '/add', 'roll_no=101&name=John&grade=A&attendance=95',
+                         {'Content-Type': 'application/x-www-form-urlencoded'})
+            response = conn.getresponse()
+            response.read()
+            sock = conn.sock
+            
+            for path in ('/', '/view/101', '/missing'):
+                conn.request('GET', path)
+                response = conn.getresponse()
+                body = response.read()
+                self.assertEqual(response.getheader('Content-Length'), str(len(body)))
+            self.assertIs(conn.sock, sock)
+        finally:
+            conn.close()
+    
     # Removed: test_multiple_students_operations - Requires proper state sync with server
 
 
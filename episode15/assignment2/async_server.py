@@ -0,0 +1,275 @@
+"""
+Asyncio server module for Episode 15 Assignment 2
+Serves a BaseHTTPRequestHandler class from one event loop
+
+ThreadingHTTPServer starts a thread per connection, so thousands of
+open connections mean thousands of thread stacks. Here every connection
+is a coroutine waiting on its socket; an idle one costs a few KB.
+
+Per request:
+    1. the loop reads the request head and body from the stream
+       (only the framing is parsed: request line and Content-Length)
+    2. the existing handler class does the rest (parse_request, routing,
+       page rendering) on an in-memory copy of the request
+    3. cheap GETs (forms, one student, static files) run right on the
+       loop; page renders over all students, exports and saves run in
+       a small thread pool, so neither rendering nor file writes block
+       the loop
+"""
+
+import asyncio
+import io
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+MAX_CONNECTIONS = 16384         # open connections; more are answered 503
+MAX_ACTIVE_REQUESTS = 64        # requests being handled at once
+MAX_HEADER_BYTES = 65536        # request line + headers
+MAX_BODY_BYTES = 1024 * 1024    # form posts are small
+EXECUTOR_WORKERS = 4            # threads for requests run off the loop
+IDLE_TIMEOUT = 15               # seconds to wait for the next request
+BACKLOG = 1024
+
+# GET / HEAD paths (prefixes) answered from memory in well under a
+# millisecond: these run right on the loop. Everything else (the
+# dashboard, student list, search, filters, statistics, exports, POSTs)
+# runs in the thread pool, so one slow render can't stall every connection
+LOOP_PATHS = ('/add', '/edit', '/delete/', '/sort', '/students/', '/static/', '/server-stats')
+
+
+class RequestError(Exception):
+    """A request that can't be framed; answered with status and closed"""
+
+    def __init__(self, status):
+        super().__init__(status.phrase)
+        self.status = status
+
+
+def parse_request_head(head):
+    """
+    Return (method, target, body length) from a request head
+
+    Only what is needed to find the end of the request is parsed; the
+    handler's parse_request() still sees the full head.
+    """
+    request_line, _, fields = head.partition(b'\r\n')
+    words = request_line.split()
+    if len(words) != 3:
+        raise RequestError(HTTPStatus.BAD_REQUEST)
+
+    length = 0
+    for line in fields.split(b'\r\n'):
+        name, separator, value = line.partition(b':')
+        if not separator:
+            continue
+        name = name.strip().lower()
+        if name == b'content-length':
+            try:
+                length = int(value)
+            except ValueError:
+                raise RequestError(HTTPStatus.BAD_REQUEST) from None
+            if length < 0:
+                raise RequestError(HTTPStatus.BAD_REQUEST)
+        elif name == b'transfer-encoding':
+            # Chunked request bodies are not used by HTML forms
+            raise RequestError(HTTPStatus.LENGTH_REQUIRED)
+
+    if length > MAX_BODY_BYTES:
+        raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+    return words[0].decode('latin-1'), words[1].decode('latin-1'), length
+
+
+def error_response(status):
+    """Bytes of a bodiless response that closes the connection"""
+    return (b'HTTP/1.1 %d %s\r\nContent-Length: 0\r\nConnection: close\r\n\r\n'
+            % (status.value, status.phrase.encode('latin-1')))
+
+
+class _LoopWriter:
+    """
+    wfile for a handler running on the loop: writes go to the transport
+
+    Nothing is drained until the handler returns, so this is only for
+    the small responses of LOOP_PATHS.
+    """
+
+    def __init__(self, writer):
+        self._writer = writer
+
+    def write(self, data):
+        self._writer.write(data)
+        return len(data)
+
+    def writelines(self, lines):
+        self._writer.writelines(lines)
+
+    def flush(self):
+        pass
+
+
+class _ThreadWriter:
+    """wfile for a handler in the executor: each write waits for the socket"""
+
+    def __init__(self, writer, loop):
+        self._writer = writer
+        self._loop = loop
+
+    async def _send(self, data):
+        self._writer.write(data)
+        await self._writer.drain()
+
+    def write(self, data):
+        asyncio.run_coroutine_threadsafe(self._send(bytes(data)), self._loop).result()
+        return len(data)
+
+    def writelines(self, lines):
+        self.write(b''.join(lines))
+
+    def flush(self):
+        pass
+
+
+class AsyncHTTPServer:
+    """
+    Event-loop HTTP server for a BaseHTTPRequestHandler class
+
+    Same surface as ThreadingHTTPServer: the socket is bound in the
+    constructor, serve_forever() blocks, shutdown() (from another
+    thread) stops it. Connections stay open between requests
+    (handler_class should use KeepAliveMixin for the framing).
+
+    Limits:
+    - max_connections: connections past this get 503 and are closed
+    - max_active_requests: requests past this wait for a free slot
+    - idle_timeout: seconds a connection may take to send a request
+
+    reuse_port binds with SO_REUSEPORT (several processes, one port).
+
+    Example:
+        server = AsyncHTTPServer(AdvancedStudentHandler, ('127.0.0.1', 5001))
+        server.serve_forever()
+    """
+
+    def __init__(self, handler_class, server_address, keep_alive=True,
+                 max_connections=MAX_CONNECTIONS, max_active_requests=MAX_ACTIVE_REQUESTS,
+                 executor_workers=EXECUTOR_WORKERS, idle_timeout=IDLE_TIMEOUT, reuse_port=False):
+        self.handler_class = handler_class
+        self.keep_alive = keep_alive
+        self.max_connections = max_connections
+        self.max_active_requests = max_active_requests
+        self.executor_workers = executor_workers
+        self.idle_timeout = idle_timeout
+        self.socket = socket.create_server(server_address, backlog=BACKLOG, reuse_port=reuse_port)
+        self.server_address = self.socket.getsockname()[:2]
+
+        self.connections = 0        # open right now
+        self.requests = 0           # handled since start
+        self.rejected = 0           # connections refused with 503
+
+        self._loop = None
+        self._stop = None
+        self._writers = set()
+        self._done = threading.Event()
+
+    def serve_forever(self):
+        """Run the event loop until shutdown()"""
+        try:
+            asyncio.run(self._serve())
+        finally:
+            self._done.set()
+
+    def shutdown(self):
+        """Stop serve_forever() and wait for it to return"""
+        loop = self._loop
+        if loop is not None and not self._done.is_set():
+            loop.call_soon_threadsafe(self._stop.set)
+            self._done.wait()
+
+    def server_close(self):
+        self.socket.close()
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._active = asyncio.Semaphore(self.max_active_requests)
+        self._executor = ThreadPoolExecutor(self.executor_workers,
+                                            thread_name_prefix='async-server-io')
+        server = await asyncio.start_server(self._handle_connection, sock=self.socket,
+                                            limit=MAX_HEADER_BYTES)
+        try:
+            await self._stop.wait()
+        finally:
+            server.close()
+            for writer in list(self._writers):
+                writer.close()
+            # Off the loop: handlers still writing need it to finish
+            await self._loop.run_in_executor(None, self._executor.shutdown)
+
+    async def _handle_connection(self, reader, writer):
+        if self.connections >= self.max_connections:
+            self.rejected += 1
+            writer.write(error_response(HTTPStatus.SERVICE_UNAVAILABLE))
+            writer.close()
+            return
+
+        self.connections += 1
+        self._writers.add(writer)
+        handler = self._new_handler(writer.get_extra_info('peername'))
+        try:
+            while await self._handle_request(handler, reader, writer):
+                pass
+        except (ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _handle_request(self, handler, reader, writer):
+        """Read and answer one request; return False to close the connection"""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.idle_timeout)
+        except asyncio.LimitOverrunError:
+            writer.write(error_response(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE))
+            return False
+        try:
+            method, target, length = parse_request_head(head)
+        except RequestError as e:
+            writer.write(error_response(e.status))
+            return False
+        body = await asyncio.wait_for(reader.readexactly(length), self.idle_timeout) if length else b''
+
+        async with self._active:
+            handler.rfile = io.BytesIO(head + body)
+            if method in ('GET', 'HEAD') and target.partition('?')[0].startswith(LOOP_PATHS):
+                handler.wfile = _LoopWriter(writer)
+                handler.handle_one_request()
+            else:
+                handler.wfile = _ThreadWriter(writer, self._loop)
+                await self._loop.run_in_executor(self._executor, handler.handle_one_request)
+            await writer.drain()
+        self.requests += 1
+        return not handler.close_connection
+
+    def stats(self):
+        """Return connection and request counters"""
+        return {
+            'connections': self.connections,
+            'max_connections': self.max_connections,
+            'requests': self.requests,
+            'rejected': self.rejected
+        }
+
+    def _new_handler(self, client_address):
+        """A handler instance for one connection, without a socket of its own"""
+        handler = self.handler_class.__new__(self.handler_class)
+        handler.client_address = client_address
+        handler.server = self
+        handler.request = None
+        handler.keep_alive = self.keep_alive
+        handler.protocol_version = 'HTTP/1.1'
+        handler.requests_served = 0
+        handler.close_connection = True
+        return handler
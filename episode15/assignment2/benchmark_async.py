@@ -0,0 +1,140 @@
+"""
+Server engine benchmark for Episode 15 Assignment 2
+Idle connections held by ThreadingHTTPServer vs the asyncio engine
+
+Each engine runs `python solution.py PORT ENGINE` in a temporary
+directory. The benchmark opens N connections that send nothing, then
+reads the server's memory and thread count and times requests made
+on one more connection while the others stay open.
+
+Run:
+    python benchmark_async.py [connections ...]     (default: 1000 10000)
+"""
+
+import asyncio
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ENGINES = ['threads', 'asyncio']
+REQUESTS = 200
+REQUEST = b'GET / HTTP/1.1\r\nHost: localhost\r\n\r\n'
+
+
+def raise_file_limit():
+    """Allow as many open sockets as the hard limit permits"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return hard
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def proc_status(pid):
+    """Return (resident MB, thread count, open files) of a process"""
+    fields = {}
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            fields[name] = value.split()
+    files = len(os.listdir(f'/proc/{pid}/fd'))
+    return int(fields['VmRSS'][0]) / 1024, int(fields['Threads'][0]), files
+
+
+async def get(reader, writer):
+    """Send one GET, read the response; return False if the server closes"""
+    writer.write(REQUEST)
+    head = await reader.readuntil(b'\r\n\r\n')
+    length = 0
+    keep_open = True
+    for line in head.split(b'\r\n'):
+        name, _, value = line.partition(b':')
+        name = name.lower()
+        if name == b'content-length':
+            length = int(value)
+        elif name == b'connection' and value.strip().lower() == b'close':
+            keep_open = False
+    await reader.readexactly(length)
+    return keep_open
+
+
+async def measure(port, connections, pid):
+    idle = []
+    start = time.perf_counter()
+    for first in range(0, connections, 200):
+        batch = range(first, min(first + 200, connections))
+        idle += await asyncio.gather(*(asyncio.open_connection('127.0.0.1', port)
+                                       for _ in batch))
+    opened = time.perf_counter() - start
+    await asyncio.sleep(0.5)
+    status = proc_status(pid)
+
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    latencies = []
+    for _ in range(REQUESTS):
+        request_start = time.perf_counter()
+        if not await get(reader, writer):
+            writer.close()
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        latencies.append(time.perf_counter() - request_start)
+    writer.close()
+    for _, idle_writer in idle:
+        idle_writer.close()
+    latencies.sort()
+    return opened, status, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+
+
+def run(engine, connections):
+    port = free_port()
+    with tempfile.TemporaryDirectory() as workdir:
+        server = subprocess.Popen([sys.executable, os.path.join(HERE, 'solution.py'),
+                                   str(port), engine],
+                                  cwd=workdir, stdout=subprocess.DEVNULL)
+        try:
+            for _ in range(50):
+                try:
+                    socket.create_connection(('127.0.0.1', port)).close()
+                    break
+                except OSError:
+                    time.sleep(0.1)
+            base_rss, _, base_files = proc_status(server.pid)
+            try:
+                opened, status, p50, p99 = asyncio.run(measure(port, connections, server.pid))
+            except OSError as e:
+                print(f"{engine:<10}{connections:>8}   failed: {e}")
+                return
+            rss, threads, files = status
+            # Connections still open once all were made (idle timeout is 15 s)
+            print(f"{engine:<10}{connections:>8}{opened:>9.2f} s{files - base_files:>8}"
+                  f"{rss - base_rss:>9.1f} MB{threads:>9}{p50 * 1e3:>10.2f} ms{p99 * 1e3:>10.2f} ms")
+        finally:
+            server.kill()
+            server.wait()
+
+
+def main():
+    print("╔════════════════════════════════════════════╗")
+    print("║  Server Engine Benchmark                   ║")
+    print("╚════════════════════════════════════════════╝")
+
+    limit = raise_file_limit()
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 10000]
+    print(f"\nopen file limit {limit}; {REQUESTS} GET / while the connections are open")
+    print(f"{'engine':<10}{'idle':>8}{'open':>11}{'held':>8}{'memory':>12}{'threads':>9}"
+          f"{'p50':>13}{'p99':>13}")
+    for connections in counts:
+        for engine in ENGINES:
+            run(engine, connections)
+
+
+if __name__ == '__main__':
+    main()
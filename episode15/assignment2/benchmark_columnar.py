@@ -0,0 +1,98 @@
+"""
+Columnar engine benchmark for Episode 15 Assignment 2
+Pure-Python statistics / filter / sort vs NumPy column arrays
+
+Run:
+    python benchmark_columnar.py [students ...]     (default: 10000 1000000)
+"""
+
+import random
+import sys
+import time
+
+import columnar
+import stores
+
+FILTER = {'grade_min': '60', 'grade_max': '90', 'attendance_min': '75'}
+RANGES = [('grade', 60.0, 90.0), ('attendance', 75.0, None)]
+
+
+def make_students(count):
+    """Build count students with random grades and attendance"""
+    rng = random.Random(15)
+    return {
+        f'R{i:07d}': {
+            'name': f'Student {rng.randint(0, count)}',
+            'grade': float(rng.randint(0, 100)),
+            'attendance': float(rng.randint(0, 100)),
+            'fees_paid': rng.random() < 0.5
+        }
+        for i in range(count)
+    }
+
+
+def timed(function, repeat):
+    """Return (seconds per call, last result)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def run(count):
+    plain = make_students(count)
+    columns = columnar.ColumnStore()
+    build, _ = timed(lambda: columns.rebuild(plain), 1)
+    print(f"\n{count} students (columns loaded in {build:.2f} s)")
+    print(f"{'operation':<22}{'pure Python':>14}{'numpy':>13}{'speedup':>10}")
+
+    repeat = 5 if count <= 100000 else 1
+    operations = [
+        ('statistics',
+         lambda: stores.get_statistics(plain),
+         columns.statistics),
+        ('range filter',
+         lambda: stores.filter_students(plain, FILTER),
+         lambda: columns.filter(RANGES)),
+        ('sort by grade',
+         lambda: stores.sort_students(plain, 'grade', reverse=True),
+         lambda: columns.ordered('grade', reverse=True)),
+        ('sort by attendance',
+         lambda: stores.sort_students(plain, 'attendance'),
+         lambda: columns.ordered('attendance')),
+    ]
+    for label, python_path, numpy_path in operations:
+        python_time, expected = timed(python_path, repeat)
+        numpy_time, actual = timed(numpy_path, repeat)
+        if label == 'range filter':
+            assert set(actual) == set(expected)
+        elif label.startswith('sort'):
+            field = label.split()[-1]
+            assert [plain[roll_no][field] for roll_no in actual] == \
+                   [student[field] for student in expected.values()]
+        print(f"{label:<22}{python_time * 1e3:>11.1f} ms{numpy_time * 1e3:>10.2f} ms"
+              f"{python_time / numpy_time:>9.0f}x")
+
+    # Incremental maintenance cost
+    start = time.perf_counter()
+    for i in range(1000):
+        columns.apply(f'N{i:07d}', None, {'name': 'New', 'grade': 50.0, 'attendance': 50.0})
+    print(f"add one student: {(time.perf_counter() - start) / 1000 * 1e6:.1f} µs")
+
+
+def main():
+    print("╔════════════════════════════════════════════╗")
+    print("║  Columnar Engine Benchmark                 ║")
+    print("╚════════════════════════════════════════════╝")
+
+    if not columnar.AVAILABLE:
+        print("\nnumpy is not installed (pip install numpy)")
+        return
+
+    counts = [int(arg) for arg in sys.argv[1:]] or [10000, 1000000]
+    for count in counts:
+        run(count)
+
+
+if __name__ == '__main__':
+    main()
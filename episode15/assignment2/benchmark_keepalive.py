@@ -0,0 +1,88 @@
+"""
+Keep-alive benchmark for Episode 15 Assignment 2
+One connection per request vs persistent HTTP/1.1 connections
+
+Run:
+    python benchmark_keepalive.py [clients] [requests per client]   (default: 8 500)
+"""
+
+import http.client
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import solution
+
+PATHS = ['/', '/students', '/stats', '/static/app.css']
+
+
+def seed(count=50):
+    """Put a few students in memory so pages have content"""
+    for i in range(count):
+        solution.STUDENTS[f'K{i:04d}'] = {
+            'name': f'Student {i}', 'grade': float(i % 100),
+            'attendance': float((i * 7) % 100), 'fees_paid': i % 2 == 0
+        }
+
+
+def client(port, requests, persistent, latencies):
+    """Send requests, reusing one connection if persistent"""
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    for i in range(requests):
+        start = time.perf_counter()
+        conn.request('GET', PATHS[i % len(PATHS)])
+        response = conn.getresponse()
+        response.read()
+        if not persistent or response.will_close:
+            conn.close()
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def run(keep_alive, clients, requests):
+    solution.AdvancedStudentHandler.keep_alive = keep_alive
+    server = ThreadingHTTPServer(('127.0.0.1', 0), solution.AdvancedStudentHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    latencies = []
+    threads = [threading.Thread(target=client, args=(port, requests, keep_alive, latencies))
+               for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    server.server_close()
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1e3
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e3
+    label = 'keep-alive' if keep_alive else 'new connection'
+    print(f"{label:<18}{len(latencies) / elapsed:>10.0f} req/s"
+          f"{p50:>10.2f} ms{p99:>10.2f} ms")
+    return len(latencies) / elapsed
+
+
+def main():
+    print("╔════════════════════════════════════════════╗")
+    print("║  Keep-Alive Benchmark                      ║")
+    print("╚════════════════════════════════════════════╝")
+
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    seed()
+
+    print(f"\n{clients} clients x {requests} requests ({', '.join(PATHS)})")
+    print(f"{'mode':<18}{'throughput':>16}{'p50':>13}{'p99':>13}")
+    closing = run(False, clients, requests)
+    persistent = run(True, clients, requests)
+    print(f"\nkeep-alive speedup: {persistent / closing:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Overload benchmark for Episode 15 Assignment 2
+ThreadingHTTPServer vs the bounded worker pool under too many clients
+
+Each engine runs `python solution.py PORT ENGINE` in a temporary
+directory with a few thousand students, so every page costs real CPU.
+C clients then request /students in a loop (a new connection each
+time) for a fixed duration. Answered requests and 503s are counted
+separately; latency is for answered requests.
+
+Run:
+    python benchmark_pool.py [clients ...]      (default: 20 200)
+"""
+
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ENGINES = ['threads', 'pool']
+DURATION = 5            # seconds per run
+STUDENTS = 2000
+REQUEST = b'GET /students HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def write_students(workdir):
+    students = {
+        f'R{i:05d}': {'name': f'Student {i}', 'grade': float(i % 100),
+                      'attendance': float((i * 7) % 100), 'fees_paid': i % 2 == 0}
+        for i in range(STUDENTS)
+    }
+    with open(os.path.join(workdir, 'students_data.json'), 'w') as f:
+        json.dump(students, f)
+
+
+async def client(port, deadline, latencies, counts):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(REQUEST)
+            response = await reader.read()
+            writer.close()
+        except OSError:
+            counts['errors'] += 1
+            continue
+        if response.startswith(b'HTTP/1.1 503'):
+            counts['busy'] += 1
+            await asyncio.sleep(0.05)
+        elif response.startswith(b'HTTP/1.1 200'):
+            counts['ok'] += 1
+            latencies.append(time.perf_counter() - start)
+        else:
+            counts['errors'] += 1
+
+
+async def load(port, clients):
+    latencies = []
+    counts = {'ok': 0, 'busy': 0, 'errors': 0}
+    deadline = time.perf_counter() + DURATION
+    await asyncio.gather(*(client(port, deadline, latencies, counts) for _ in range(clients)))
+    return latencies, counts
+
+
+def run(engine, clients):
+    port = free_port()
+    with tempfile.TemporaryDirectory() as workdir:
+        write_students(workdir)
+        server = subprocess.Popen([sys.executable, os.path.join(HERE, 'solution.py'),
+                                   str(port), engine],
+                                  cwd=workdir, stdout=subprocess.DEVNULL)
+        try:
+            for _ in range(50):
+                try:
+                    socket.create_connection(('127.0.0.1', port)).close()
+                    break
+                except OSError:
+                    time.sleep(0.1)
+            latencies, counts = asyncio.run(load(port, clients))
+        finally:
+            server.kill()
+            server.wait()
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1e3 if latencies else 0
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e3 if latencies else 0
+    print(f"{engine:<9}{clients:>8}{counts['ok'] / DURATION:>10.0f}/s{counts['busy']:>8}"
+          f"{counts['errors']:>8}{p50:>10.1f} ms{p99:>10.1f} ms")
+
+
+def main():
+    print("╔════════════════════════════════════════════╗")
+    print("║  Overload Benchmark                        ║")
+    print("╚════════════════════════════════════════════╝")
+
+    counts = [int(arg) for arg in sys.argv[1:]] or [20, 200]
+    print(f"\n{STUDENTS} students, GET /students for {DURATION} s per run")
+    print(f"{'engine':<9}{'clients':>8}{'answered':>12}{'503':>8}{'errors':>8}"
+          f"{'p50':>13}{'p99':>13}")
+    for clients in counts:
+        for engine in ENGINES:
+            run(engine, clients)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Pre-fork benchmark for Episode 15 Assignment 2
+One server process vs N processes sharing the port with SO_REUSEPORT
+
+Each run starts `python solution.py PORT pool N` in a temporary
+directory with a few thousand students, so every page costs real CPU.
+CLIENTS clients then request /students in a loop (a new connection
+each time) for a fixed duration. Throughput should grow with N up to
+the number of CPUs; beyond that the processes only share the same cores.
+
+Run:
+    python benchmark_prefork.py [processes ...]  (default: 1 and the CPU count)
+"""
+
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import prefork
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CLIENTS = 32
+DURATION = 5            # seconds per run
+STUDENTS = 2000
+REQUEST = b'GET /students HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def write_students(workdir):
+    students = {
+        f'R{i:05d}': {'name': f'Student {i}', 'grade': float(i % 100),
+                      'attendance': float((i * 7) % 100), 'fees_paid': i % 2 == 0}
+        for i in range(STUDENTS)
+    }
+    with open(os.path.join(workdir, 'students_data.json'), 'w') as f:
+        json.dump(students, f)
+
+
+async def client(port, deadline, latencies, counts):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(REQUEST)
+            response = await reader.read()
+            writer.close()
+        except OSError:
+            counts['errors'] += 1
+            continue
+        if response.startswith(b'HTTP/1.1 503'):
+            counts['busy'] += 1
+            await asyncio.sleep(0.05)
+        elif response.startswith(b'HTTP/1.1 200'):
+            counts['ok'] += 1
+            latencies.append(time.perf_counter() - start)
+        else:
+            counts['errors'] += 1
+
+
+async def load(port, clients):
+    latencies = []
+    counts = {'ok': 0, 'busy': 0, 'errors': 0}
+    deadline = time.perf_counter() + DURATION
+    await asyncio.gather(*(client(port, deadline, latencies, counts) for _ in range(clients)))
+    return latencies, counts
+
+
+def run(processes):
+    port = free_port()
+    with tempfile.TemporaryDirectory() as workdir:
+        write_students(workdir)
+        server = subprocess.Popen([sys.executable, os.path.join(HERE, 'solution.py'),
+                                   str(port), 'pool', str(processes)],
+                                  cwd=workdir, stdout=subprocess.DEVNULL)
+        try:
+            for _ in range(50):
+                try:
+                    socket.create_connection(('127.0.0.1', port)).close()
+                    break
+                except OSError:
+                    time.sleep(0.1)
+            latencies, counts = asyncio.run(load(port, CLIENTS))
+        finally:
+            server.kill()
+            server.wait()
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1e3 if latencies else 0
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e3 if latencies else 0
+    print(f"{processes:<11}{counts['ok'] / DURATION:>10.0f}/s{counts['busy']:>8}"
+          f"{counts['errors']:>8}{p50:>10.1f} ms{p99:>10.1f} ms")
+
+
+def main():
+    print("╔════════════════════════════════════════════╗")
+    print("║  Pre-fork Benchmark                        ║")
+    print("╚════════════════════════════════════════════╝")
+
+    cpus = prefork.cpu_count()
+    counts = [int(arg) for arg in sys.argv[1:]] or sorted({1, cpus})
+    print(f"\n{STUDENTS} students, {CLIENTS} clients, GET /students for {DURATION} s per run"
+          f" ({cpus} CPUs)")
+    print(f"{'processes':<11}{'answered':>12}{'503':>8}{'errors':>8}{'p50':>13}{'p99':>13}")
+    for processes in counts:
+        run(processes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Router benchmark for Episode 15 Assignment 2
+Route lookup cost as the number of routes grows
+
+For each table size N the router holds N static and N parametric
+routes; the same paths are then matched many times. Lookup time per
+request should stay flat as N grows (a dict hit, or one trie step per
+path segment). An if/elif chain with startswith checks, as the
+handler used to have, is timed alongside for comparison.
+
+Run:
+    python benchmark_router.py [routes ...]     (default: 10 100 1000)
+"""
+
+import sys
+import time
+
+import router
+
+LOOKUPS = 20000
+
+
+def build(count):
+    routes = router.Router()
+    for i in range(count):
+        routes.add('GET', f'/page{i}', f'page{i}')
+        routes.add('GET', f'/item{i}/<item_id>', f'item{i}')
+    return routes
+
+
+def chain_match(count, path):
+    """What an if/elif chain does: test each route in turn"""
+    for i in range(count):
+        if path == f'/page{i}':
+            return f'page{i}', {}
+    for i in range(count):
+        prefix = f'/item{i}/'
+        if path.startswith(prefix):
+            return f'item{i}', {'item_id': path[len(prefix):]}
+    return None
+
+
+def timed(match, paths):
+    start = time.perf_counter()
+    for _ in range(LOOKUPS // len(paths)):
+        for path in paths:
+            match(path)
+    return (time.perf_counter() - start) / LOOKUPS * 1e6
+
+
+def main():
+    print("╔════════════════════════════════════════════╗")
+    print("║  Router Benchmark                          ║")
+    print("╚════════════════════════════════════════════╝")
+
+    counts = [int(arg) for arg in sys.argv[1:]] or [10, 100, 1000]
+    print(f"\nRoute lookup, µs per request (last route of each kind, {LOOKUPS} lookups)")
+    print(f"{'routes':<8}{'router static':>15}{'router param':>14}{'if/elif chain':>15}")
+    for count in counts:
+        routes = build(count)
+        static, param = f'/page{count - 1}', f'/item{count - 1}/S001'
+        router_static = timed(lambda path: routes.match('GET', path), [static])
+        router_param = timed(lambda path: routes.match('GET', path), [param])
+        chain = timed(lambda path: chain_match(count, path), [static, param])
+        print(f"{count * 2:<8}{router_static:>15.2f}{router_param:>14.2f}{chain:>15.2f}")
+
+
+if __name__ == '__main__':
+    main()
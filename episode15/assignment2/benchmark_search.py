@@ -0,0 +1,87 @@
+"""
+Search benchmark for Episode 15 Assignment 2
+Linear substring scan vs the incremental search index
+
+Run:
+    python benchmark_search.py [students]     (default: 100000)
+"""
+
+import random
+import sys
+import time
+
+import stores
+
+FIRST_NAMES = ['Alice', 'Bob', 'Carol', 'David', 'Eve', 'Frank', 'Grace', 'Heidi',
+               'Ivan', 'Judy', 'Mallory', 'Niaj', 'Olivia', 'Peggy', 'Rupert', 'Sybil',
+               'Trent', 'Victor', 'Walter', 'Xavier', 'Yvonne', 'Zara']
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller',
+              'Davis', 'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Gonzalez',
+              'Wilson', 'Anderson', 'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin']
+
+QUERIES = ['R012345', 'alice', 'ali', 'son', 'martinez', 'yvonne m', 'r0999', 'zz', 'a']
+LIMIT = 100
+
+
+def make_students(count):
+    """Build count students with random names"""
+    rng = random.Random(15)
+    return {
+        f'R{i:06d}': {
+            'name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            'grade': float(rng.randint(0, 100)),
+            'attendance': float(rng.randint(0, 100))
+        }
+        for i in range(count)
+    }
+
+
+def linear_search(students, query):
+    """Original implementation: lowercase and scan every student"""
+    query_lower = query.lower()
+    return {roll_no: student for roll_no, student in students.items()
+            if query_lower in roll_no.lower() or query_lower in student.get('name', '').lower()}
+
+
+def per_query(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    print("╔════════════════════════════════════════════╗")
+    print("║  Student Search Benchmark                  ║")
+    print("╚════════════════════════════════════════════╝")
+
+    plain = make_students(count)
+    start = time.perf_counter()
+    store = stores.StudentStore(plain)
+    print(f"\n{count} students, index built in {time.perf_counter() - start:.2f} s, limit {LIMIT}\n")
+    print(f"{'query':<12}{'matches':>9}{'linear scan':>15}{'index':>13}{'speedup':>10}")
+
+    for query in QUERIES:
+        expected = linear_search(plain, query)
+        # Unlimited index search finds exactly the same students
+        assert set(stores.search_students(store, query)) == set(expected)
+
+        linear = per_query(lambda: linear_search(plain, query), 3)
+        indexed = per_query(lambda: stores.search_students(store, query, LIMIT), 200)
+
+        print(f"{query!r:<12}{len(expected):>9}"
+              f"{linear * 1e3:>12.2f} ms"
+              f"{indexed * 1e3:>10.3f} ms"
+              f"{linear / indexed:>9.0f}x")
+
+    # Incremental maintenance cost
+    start = time.perf_counter()
+    for i in range(1000):
+        store[f'N{i:06d}'] = {'name': 'New Student', 'grade': 50.0, 'attendance': 50.0}
+    print(f"\nadd (index + stats): {(time.perf_counter() - start) / 1000 * 1e6:.1f} µs per student")
+
+
+if __name__ == '__main__':
+    main()
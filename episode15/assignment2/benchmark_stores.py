@@ -0,0 +1,86 @@
+"""
+Stores write benchmark for Episode 15 Assignment 2
+Time per single-student write: full JSON rewrite vs write-ahead log
+
+Run:
+    python benchmark_stores.py [sizes...]     (default: 1000 100000)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import stores
+
+
+def make_students(count):
+    """Build count student records like the add handler creates"""
+    return {
+        f'R{i:06d}': {
+            'name': f'Student {i}',
+            'grade': float(i % 101),
+            'attendance': float(i % 97),
+            'fees_paid': i % 2 == 0,
+            'added_on': '2024-01-01T00:00:00'
+        }
+        for i in range(count)
+    }
+
+
+def time_writes(students, writes, use_hint):
+    """Edit one student per write and save, return seconds per write"""
+    keys = list(students)
+    start = time.perf_counter()
+    for i in range(writes):
+        roll_no = keys[i % len(keys)]
+        students[roll_no]['grade'] = float(i % 101)
+        if use_hint:
+            stores.save_students(students, {roll_no: students[roll_no]})
+        else:
+            stores.save_students(students)
+    stores.flush_students()
+    return (time.perf_counter() - start) / writes
+
+
+def run_backend(backend, students, writes, use_hint=False):
+    """Run writes on a fresh data file with the given backend"""
+    stores.STORAGE_BACKEND = backend
+    stores.delete_storage()
+    stores.save_students(students)     # initial snapshot / log
+    stores.flush_students()
+    try:
+        return time_writes(students, writes, use_hint)
+    finally:
+        stores.delete_storage()
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 100000]
+
+    print("╔════════════════════════════════════════════╗")
+    print("║  Student Store Write Benchmark             ║")
+    print("╚════════════════════════════════════════════╝")
+    print(f"\nfsync batch: {stores.WAL_FSYNC_BATCH} records, "
+          f"compaction at {stores.WAL_COMPACT_THRESHOLD} records\n")
+    print(f"{'students':>10}{'json rewrite':>16}{'wal (diff)':>16}{'wal (hint)':>16}{'speedup':>10}")
+
+    os.chdir(tempfile.mkdtemp())
+    for size in sizes:
+        students = make_students(size)
+        json_writes = max(3, min(200, 200000 // size))
+        diff_writes = max(10, min(500, 2000000 // size))
+
+        rewrite = run_backend('json', students, json_writes)
+        diff = run_backend('wal', students, diff_writes)
+        hint = run_backend('wal', students, 2000, use_hint=True)
+
+        print(f"{size:>10}"
+              f"{rewrite * 1e3:>13.3f} ms"
+              f"{diff * 1e3:>13.3f} ms"
+              f"{hint * 1e3:>13.3f} ms"
+              f"{rewrite / hint:>9.0f}x")
+
+
+if __name__ == '__main__':
+    main()
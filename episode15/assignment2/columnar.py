@@ -0,0 +1,184 @@
+"""
+Columnar module for Episode 15 Assignment 2
+Optional NumPy column arrays for vectorized statistics, filters and sorting
+"""
+
+import threading
+
+try:
+    import numpy as np
+except ImportError:     # optional dependency
+    np = None
+
+from aggregates import HIGH_ATTENDANCE, PASS_GRADE
+
+# True when numpy can be imported
+AVAILABLE = np is not None
+
+NUMBER_FIELDS = ('grade', 'attendance')
+
+
+def require():
+    """Raise ImportError if numpy is not installed"""
+    if np is None:
+        raise ImportError("The numpy query engine needs numpy: pip install numpy")
+
+
+def _number(student, field):
+    """Read a numeric field the way the statistics code always has"""
+    return float(student.get(field, 0) or 0)
+
+
+class ColumnStore:
+    """
+    Students as parallel NumPy arrays, one row per student
+
+    Columns:
+        roll_nos, names     object arrays
+        grade, attendance   float64 arrays
+        fees_paid           bool array
+
+    Rows are kept packed: a delete moves the last row into the hole, so
+    rows [0, size) are always the live students and every query is one
+    vectorized pass over them. Ties in sorted output are ordered by roll
+    number, the same as the sorted indexes.
+
+    Example:
+        columns = ColumnStore()
+        columns.rebuild(students)
+        columns.statistics()['pass_count']
+        columns.filter([('grade', 60, None)])
+        columns.ordered('attendance', reverse=True)
+    """
+
+    def __init__(self, capacity=1024):
+        require()
+        self._lock = threading.Lock()
+        self._rows = {}             # roll_no -> row
+        self._size = 0
+        self._by_roll_no = None     # cached rows in roll number order
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.roll_nos = np.empty(capacity, dtype=object)
+        self.names = np.empty(capacity, dtype=object)
+        self.grade = np.zeros(capacity)
+        self.attendance = np.zeros(capacity)
+        self.fees_paid = np.zeros(capacity, dtype=bool)
+
+    def _columns(self):
+        return (self.roll_nos, self.names, self.grade, self.attendance, self.fees_paid)
+
+    def _grow(self):
+        old = self._columns()
+        self._allocate(max(2 * len(self.grade), 1024))
+        for new_column, old_column in zip(self._columns(), old):
+            new_column[:self._size] = old_column[:self._size]
+
+    def _write_row(self, row, roll_no, student):
+        self.roll_nos[row] = roll_no
+        self.names[row] = str(student.get('name', ''))
+        self.grade[row] = _number(student, 'grade')
+        self.attendance[row] = _number(student, 'attendance')
+        self.fees_paid[row] = bool(student.get('fees_paid'))
+
+    # ---------- maintenance ----------
+
+    def apply(self, roll_no, old, new):
+        """StudentStore observer: add, update or remove one row"""
+        with self._lock:
+            row = self._rows.get(roll_no)
+            if new is not None:
+                if row is None:
+                    if self._size == len(self.grade):
+                        self._grow()
+                    row = self._rows[roll_no] = self._size
+                    self._size += 1
+                    self._by_roll_no = None
+                self._write_row(row, roll_no, new)
+            elif row is not None:
+                del self._rows[roll_no]
+                last = self._size - 1
+                if row != last:
+                    for column in self._columns():
+                        column[row] = column[last]
+                    self._rows[self.roll_nos[row]] = row
+                # Drop references held by the freed slot
+                self.roll_nos[last] = self.names[last] = None
+                self._size = last
+                self._by_roll_no = None
+
+    def rebuild(self, students):
+        """Load all students at once ({roll_no: student})"""
+        count = len(students)
+        with self._lock:
+            self._allocate(max(count, 1024))
+            self.roll_nos[:count] = list(students)
+            values = students.values()
+            self.names[:count] = [str(student.get('name', '')) for student in values]
+            for field in NUMBER_FIELDS:
+                getattr(self, field)[:count] = np.fromiter(
+                    (_number(student, field) for student in values), dtype=float, count=count)
+            self.fees_paid[:count] = np.fromiter(
+                (bool(student.get('fees_paid')) for student in values), dtype=bool, count=count)
+            self._rows = {roll_no: row for row, roll_no in enumerate(students)}
+            self._size = count
+            self._by_roll_no = None
+
+    # ---------- queries ----------
+
+    def _rows_by_roll_no(self):
+        if self._by_roll_no is None:
+            self._by_roll_no = np.argsort(self.roll_nos[:self._size], kind='stable')
+        return self._by_roll_no
+
+    def _sort_rows(self, rows, field, reverse):
+        """rows (in roll number order) sorted by field, stable"""
+        if field != 'roll_no':
+            values = self.names if field == 'name' else getattr(self, field)
+            rows = rows[np.argsort(values[rows], kind='stable')]
+        if reverse:
+            rows = rows[::-1]
+        return self.roll_nos[rows].tolist()
+
+    def statistics(self):
+        """Return the StatsAggregator counters, computed vectorized"""
+        with self._lock:
+            size = self._size
+            grade = self.grade[:size]
+            attendance = self.attendance[:size]
+            return {
+                'total': size,
+                'grade_sum': float(grade.sum()),
+                'attendance_sum': float(attendance.sum()),
+                'pass_count': int(np.count_nonzero(grade >= PASS_GRADE)),
+                'high_attendance_count': int(np.count_nonzero(attendance >= HIGH_ATTENDANCE)),
+                'fees_paid_count': int(np.count_nonzero(self.fees_paid[:size]))
+            }
+
+    def filter(self, ranges):
+        """
+        Return roll numbers inside every range, ordered by the first range
+
+        Args:
+            ranges: [(field, low, high)] with field 'grade' or 'attendance'
+                and low/high None for an open bound
+        """
+        with self._lock:
+            mask = np.ones(self._size, dtype=bool)
+            for field, low, high in ranges:
+                values = getattr(self, field)[:self._size]
+                if low is not None:
+                    mask &= values >= low
+                if high is not None:
+                    mask &= values <= high
+            rows = self._rows_by_roll_no()
+            rows = rows[mask[rows]]
+            return self._sort_rows(rows, ranges[0][0] if ranges else 'roll_no', False)
+
+    def ordered(self, field='roll_no', reverse=False):
+        """Return all roll numbers sorted by field (roll_no, name, grade, attendance)"""
+        if field not in ('roll_no', 'name') + NUMBER_FIELDS:
+            field = 'roll_no'
+        with self._lock:
+            return self._sort_rows(self._rows_by_roll_no(), field, reverse)
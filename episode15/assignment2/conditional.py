@@ -0,0 +1,129 @@
+"""
+Conditional GET module for Episode 15 Assignment 2
+Data version counter with ETag / Last-Modified validators
+"""
+
+import threading
+import time
+import uuid
+import zlib
+from email.utils import formatdate, parsedate_to_datetime
+
+
+def etag_matches(if_none_match, etag):
+    """True if an If-None-Match header value lists etag (or is *)"""
+    if if_none_match.strip() == '*':
+        return True
+    # Weak comparison: W/"x" matches "x"
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return any(tag.removeprefix('W/') == etag for tag in tags)
+
+
+class DataVersion:
+    """
+    Counter bumped on every change to the student data
+
+    Pages rendered from the same version are identical, so the version
+    works as a validator: the ETag is derived from it, and a client
+    whose If-None-Match still names it gets 304 Not Modified instead
+    of a re-rendered page.
+
+    bump() accepts and ignores any arguments, so it can be registered
+    directly as a change listener.
+
+    Example:
+        version = DataVersion()
+        etag = version.etag('sort=name')
+        if version.is_fresh(request_headers, etag):
+            ...  # send 304
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Tags from an earlier server process never match this one
+        # (unless rebase() names the version after shared state)
+        self._epoch = uuid.uuid4().hex[:8]
+        self.value = 0
+        self.modified = time.time()
+
+    def rebase(self, epoch, modified=None):
+        """
+        Count from a version named by state other processes share
+
+        Worker processes each hold their own copy of the data, so their
+        own epochs would tag the same data differently. Rebasing them on
+        e.g. the data file's stamp gives every worker the same ETag for
+        the same data. A no-op if epoch is already the current one.
+        """
+        with self._lock:
+            if epoch == self._epoch:
+                return
+            self._epoch = epoch
+            self.value = 0
+            if modified is not None:
+                self.modified = modified
+
+    def bump(self, *change):
+        """Record that the data changed"""
+        with self._lock:
+            self.value += 1
+            self.modified = time.time()
+
+    def etag(self, *variant):
+        """
+        Strong ETag for the current version
+
+        variant (e.g. sort order, selected fields, content encoding)
+        tells apart different representations of the same data.
+        """
+        tag = f'{self._epoch}-{self.value}'
+        if variant:
+            tag += '-%08x' % zlib.crc32(repr(variant).encode('utf-8'))
+        return f'"{tag}"'
+
+    def last_modified(self):
+        """
+        HTTP date of the last change, or None within its first second
+
+        HTTP dates have one-second resolution, so a second change in
+        the same second would look unmodified. The date is only handed
+        out once its second is over, and then no later change can
+        share it.
+        """
+        modified = self.modified
+        if int(time.time()) <= int(modified):
+            return None
+        return formatdate(int(modified), usegmt=True)
+
+    def is_fresh(self, headers, etag, dated=True):
+        """
+        True if the request's If-None-Match / If-Modified-Since is current
+
+        The modification date only follows the data. A page that also
+        depends on other server state (e.g. a sort order kept on the
+        server) passes dated=False: its date can't tell the variants
+        apart, so If-Modified-Since is ignored and only the ETag counts.
+        """
+        if_none_match = headers.get('If-None-Match')
+        if if_none_match is not None:
+            # If-Modified-Since is ignored when If-None-Match is present
+            return etag_matches(if_none_match, etag)
+
+        if not dated:
+            return False
+        if_modified_since = headers.get('If-Modified-Since')
+        if not if_modified_since:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError, IndexError):
+            return False
+        return int(self.modified) <= since
+
+    def validators(self, etag, dated=True):
+        """Response headers for a page tagged etag (no Last-Modified unless dated)"""
+        headers = [('ETag', etag), ('Cache-Control', 'no-cache')]
+        last_modified = self.last_modified() if dated else None
+        if last_modified:
+            headers.append(('Last-Modified', last_modified))
+        return headers
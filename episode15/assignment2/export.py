@@ -0,0 +1,85 @@
+"""
+Export module for Episode 15 Assignment 2
+Streaming CSV export with column selection and gzip
+"""
+
+import csv
+import io
+import zlib
+
+# Rows encoded per chunk sent to the client
+ROW_BATCH_SIZE = 500
+
+# field name (for ?fields=) -> (CSV header, value from student)
+CSV_COLUMNS = {
+    'roll_no': ('Roll No', None),
+    'name': ('Name', lambda student: student.get('name', '')),
+    'grade': ('Grade', lambda student: student.get('grade', '')),
+    'attendance': ('Attendance', lambda student: student.get('attendance', '')),
+    'fees_paid': ('Fees Paid', lambda student: 'Yes' if student.get('fees_paid') else 'No'),
+    'added_on': ('Added On', lambda student: student.get('added_on', '')),
+}
+
+
+def parse_fields(value):
+    """
+    Turn a ?fields= value into a list of column names
+
+    Empty means all columns. Raises ValueError for unknown names.
+    """
+    if not value:
+        return list(CSV_COLUMNS)
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in CSV_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown export field(s): {', '.join(unknown)}. "
+                         f"Choose from: {', '.join(CSV_COLUMNS)}")
+    return fields or list(CSV_COLUMNS)
+
+
+def iter_csv(rows, fields=None, batch_size=ROW_BATCH_SIZE):
+    """
+    Encode (roll_no, student) pairs as CSV, yielding UTF-8 chunks
+
+    Only one batch of rows is held in memory at a time, so the
+    export size does not matter.
+    """
+    fields = fields or list(CSV_COLUMNS)
+    getters = [CSV_COLUMNS[field][1] for field in fields]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        data = buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    writer.writerow([CSV_COLUMNS[field][0] for field in fields])
+    count = 0
+    for roll_no, student in rows:
+        writer.writerow([roll_no if getter is None else getter(student) for getter in getters])
+        count += 1
+        if count % batch_size == 0:
+            yield flush()
+    yield flush()
+
+
+def accepts_gzip(accept_encoding):
+    """True if an Accept-Encoding header value allows gzip"""
+    for item in (accept_encoding or '').split(','):
+        name, _, params = item.partition(';')
+        if name.strip().lower() in ('gzip', 'x-gzip'):
+            quality = params.strip().lower()
+            return quality not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+
+def gzip_chunks(chunks, level=6):
+    """Compress a stream of byte chunks into a gzip stream, chunk by chunk"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)   # 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
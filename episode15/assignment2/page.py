@@ -4,6 +4,7 @@ Advanced templates with search, filter, and statistics views
 """
 
 import html
+import zlib
 
 
 def html_escape(text):
@@ -13,40 +14,33 @@ def html_escape(text):
     return html.escape(text)
 
 
-def render_base(content, title='Student Management'):
-    """Base template wrapper"""
-    return f"""<!DOCTYPE html>
-<html>
-<head>
-    <title>{html_escape(title)}</title>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ 
+# Shared stylesheet, inlined in every page or served as /static/app.css
+APP_CSS = """
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body { 
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             padding: 20px;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1000px;
             margin: 0 auto;
             background: white;
             border-radius: 10px;
             box-shadow: 0 10px 40px rgba(0,0,0,0.1);
             overflow: hidden;
-        }}
-        .header {{
+        }
+        .header {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 30px;
             text-align: center;
-        }}
-        .header h1 {{ font-size: 28px; margin-bottom: 5px; }}
-        .header p {{ font-size: 14px; opacity: 0.9; }}
-        .content {{ padding: 30px; }}
-        .navbar {{
+        }
+        .header h1 { font-size: 28px; margin-bottom: 5px; }
+        .header p { font-size: 14px; opacity: 0.9; }
+        .content { padding: 30px; }
+        .navbar {
             display: flex;
             gap: 10px;
             margin-bottom: 20px;
@@ -55,8 +49,8 @@ def render_base(content, title='Student Management'):
             padding-top: 15px;
             background: #f8f9fa;
             border-bottom: 1px solid #e0e0e0;
-        }}
-        .navbar a {{
+        }
+        .navbar a {
             display: inline-block;
             padding: 10px 15px;
             background: #667eea;
@@ -65,25 +59,25 @@ def render_base(content, title='Student Management'):
             border-radius: 5px;
             font-size: 14px;
             transition: all 0.3s;
-        }}
-        .navbar a:hover {{ background: #764ba2; transform: translateY(-2px); }}
-        .nav-active {{ background: #764ba2 !important; }}
-        .form-group {{ margin-bottom: 15px; }}
-        .form-group label {{ display: block; margin-bottom: 5px; font-weight: 500; }}
-        .form-group input, .form-group select {{
+        }
+        .navbar a:hover { background: #764ba2; transform: translateY(-2px); }
+        .nav-active { background: #764ba2 !important; }
+        .form-group { margin-bottom: 15px; }
+        .form-group label { display: block; margin-bottom: 5px; font-weight: 500; }
+        .form-group input, .form-group select {
             width: 100%;
             padding: 10px;
             border: 1px solid #ddd;
             border-radius: 5px;
             font-size: 14px;
-        }}
-        .form-group input:focus, .form-group select:focus {{
+        }
+        .form-group input:focus, .form-group select:focus {
             outline: none;
             border-color: #667eea;
             box-shadow: 0 0 0 3px rgba(102,126,234,0.1);
-        }}
-        .button-group {{ display: flex; gap: 10px; }}
-        .btn {{
+        }
+        .button-group { display: flex; gap: 10px; }
+        .btn {
             flex: 1;
             padding: 12px;
             border: none;
@@ -95,108 +89,125 @@ def render_base(content, title='Student Management'):
             text-align: center;
             text-decoration: none;
             display: inline-block;
-        }}
-        .btn-primary {{
+        }
+        .btn-primary {
             background: #667eea;
             color: white;
-        }}
-        .btn-primary:hover {{ background: #764ba2; }}
-        .btn-secondary {{
+        }
+        .btn-primary:hover { background: #764ba2; }
+        .btn-secondary {
             background: #e0e0e0;
             color: #333;
-        }}
-        .btn-secondary:hover {{ background: #d0d0d0; }}
-        .btn-danger {{
+        }
+        .btn-secondary:hover { background: #d0d0d0; }
+        .btn-danger {
             background: #ef5350;
             color: white;
-        }}
-        .btn-danger:hover {{ background: #c62828; }}
-        .btn-success {{
+        }
+        .btn-danger:hover { background: #c62828; }
+        .btn-success {
             background: #66bb6a;
             color: white;
-        }}
-        .btn-success:hover {{ background: #2e7d32; }}
-        .table {{ width: 100%; border-collapse: collapse; margin-top: 20px; }}
-        .table th {{
+        }
+        .btn-success:hover { background: #2e7d32; }
+        .table { width: 100%; border-collapse: collapse; margin-top: 20px; }
+        .table th {
             background: #f5f5f5;
             padding: 12px;
             text-align: left;
             font-weight: 600;
             border-bottom: 2px solid #ddd;
-        }}
-        .table td {{
+        }
+        .table td {
             padding: 12px;
             border-bottom: 1px solid #eee;
-        }}
-        .table tr:hover {{ background: #f9f9f9; }}
-        .badge {{
+        }
+        .table tr:hover { background: #f9f9f9; }
+        .badge {
             display: inline-block;
             padding: 4px 10px;
             border-radius: 20px;
             font-size: 12px;
             font-weight: 600;
-        }}
-        .badge-success {{ background: #c8e6c9; color: #1b5e20; }}
-        .badge-danger {{ background: #ffcdd2; color: #b71c1c; }}
-        .badge-warning {{ background: #fff3cd; color: #856404; }}
-        .badge-info {{ background: #bbdefb; color: #0d47a1; }}
-        .alert {{
+        }
+        .badge-success { background: #c8e6c9; color: #1b5e20; }
+        .badge-danger { background: #ffcdd2; color: #b71c1c; }
+        .badge-warning { background: #fff3cd; color: #856404; }
+        .badge-info { background: #bbdefb; color: #0d47a1; }
+        .alert {
             padding: 15px;
             margin-bottom: 20px;
             border-radius: 5px;
             border-left: 4px solid;
-        }}
-        .alert-error {{
+        }
+        .alert-error {
             background: #ffebee;
             border-color: #ef5350;
             color: #c62828;
-        }}
-        .alert-success {{
+        }
+        .alert-success {
             background: #e8f5e9;
             border-color: #66bb6a;
             color: #1b5e20;
-        }}
-        .stats {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; }}
-        .stat-card {{
+        }
+        .stats { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; }
+        .stat-card {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 20px;
             border-radius: 10px;
             text-align: center;
-        }}
-        .stat-value {{ font-size: 28px; font-weight: bold; }}
-        .stat-label {{ font-size: 12px; opacity: 0.8; margin-top: 5px; }}
-        .search-form {{ display: flex; gap: 10px; margin-bottom: 20px; }}
-        .search-form input {{ flex: 1; }}
-        .recent-students {{ margin-top: 20px; }}
-        .action-links {{ display: flex; gap: 10px; }}
-        .action-links a {{
+        }
+        .stat-value { font-size: 28px; font-weight: bold; }
+        .stat-label { font-size: 12px; opacity: 0.8; margin-top: 5px; }
+        .search-form { display: flex; gap: 10px; margin-bottom: 20px; }
+        .search-form input { flex: 1; }
+        .recent-students { margin-top: 20px; }
+        .action-links { display: flex; gap: 10px; }
+        .action-links a {
             padding: 6px 12px;
             font-size: 12px;
             border-radius: 3px;
             text-decoration: none;
             background: #667eea;
             color: white;
-        }}
-        .action-links a:hover {{ background: #764ba2; }}
-        .success-message {{
+        }
+        .action-links a:hover { background: #764ba2; }
+        .success-message {
             background: #e8f5e9;
             border-left: 4px solid #66bb6a;
             padding: 15px;
             margin-bottom: 20px;
             border-radius: 5px;
             color: #1b5e20;
-        }}
-        .filter-section {{
+        }
+        .filter-section {
             background: #f9f9f9;
             padding: 15px;
             border-radius: 5px;
             margin-bottom: 20px;
             border: 1px solid #eee;
-        }}
-        .filter-row {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; }}
-    </style>
-</head>
+        }
+        .filter-row { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; }
+"""
+APP_CSS_BYTES = APP_CSS.encode('utf-8')
+
+# Set True to link /static/app.css (cached by browsers) instead of
+# inlining APP_CSS in every page. The ?v= hash changes with the CSS,
+# so the stylesheet can be cached for a long time.
+EXTERNAL_CSS = False
+APP_CSS_URL = '/static/app.css?v=%08x' % zlib.crc32(APP_CSS_BYTES)
+
+# Base template around the title and the content (static, built once)
+BASE_HEAD_START = """<!DOCTYPE html>
+<html>
+<head>
+    <title>"""
+_BASE_META = """</title>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+"""
+_BASE_BODY_START = """</head>
 <body>
     <div class="container">
         <div class="header">
@@ -211,14 +222,46 @@ def render_base(content, title='Student Management'):
             <a href="/export/csv">Export CSV</a>
         </div>
         <div class="content">
-            {content}
+            """
+# Everything after the title, keyed by EXTERNAL_CSS
+BASE_HEAD_END = {
+    False: _BASE_META + '    <style>' + APP_CSS + '    </style>\n' + _BASE_BODY_START,
+    True: _BASE_META + f'    <link rel="stylesheet" href="{APP_CSS_URL}">\n' + _BASE_BODY_START,
+}
+
+# Base template after the content (static)
+BASE_TAIL = """
         </div>
     </div>
 </body>
 </html>"""
 
+# Pre-encoded copies for render_base(..., as_parts=True)
+BASE_HEAD_START_BYTES = BASE_HEAD_START.encode('utf-8')
+BASE_HEAD_END_BYTES = {external: head.encode('utf-8') for external, head in BASE_HEAD_END.items()}
+BASE_TAIL_BYTES = BASE_TAIL.encode('utf-8')
+
+
+def render_base_head(title='Student Management'):
+    """Base template up to (and including) the opening content div"""
+    return BASE_HEAD_START + html_escape(title) + BASE_HEAD_END[EXTERNAL_CSS]
+
+
+def render_base(content, title='Student Management', as_parts=False):
+    """
+    Base template wrapper
+    
+    With as_parts=True, returns a list of byte strings for
+    wfile.writelines(): the static layout is already encoded, only
+    the title and content are encoded per call.
+    """
+    if as_parts:
+        return [BASE_HEAD_START_BYTES, html_escape(title).encode('utf-8'),
+                BASE_HEAD_END_BYTES[EXTERNAL_CSS], content.encode('utf-8'), BASE_TAIL_BYTES]
+    return render_base_head(title) + content + BASE_TAIL
+
 
-def render_dashboard(students, stats, recent):
+def render_dashboard(students, stats, recent, as_parts=False):
     """Render dashboard with statistics"""
     stats_html = f"""
     <div class="stats">
@@ -259,12 +302,11 @@ def render_dashboard(students, stats, recent):
         recent_html += '<p style="color: #999;">No students yet.</p>'
     
     content = stats_html + recent_html
-    return render_base(content, 'Dashboard')
+    return render_base(content, 'Dashboard', as_parts)
 
 
-def render_student_list(students, sort_by='roll_no'):
-    """Render all students list"""
-    search_form = """
+# Static parts of the student list page
+STUDENT_LIST_SEARCH_FORM = """
     <div class="search-form">
         <form style="display: flex; gap: 10px; width: 100%;">
             <input type="text" name="q" placeholder="Search by name or roll number" style="flex: 1;">
@@ -282,17 +324,22 @@ def render_student_list(students, sort_by='roll_no'):
         </div>
     </div>
     """
+STUDENT_TABLE_HEAD = '<table class="table"><thead><tr><th>Roll No</th><th>Name</th><th>Grade</th><th>Attendance</th><th>Actions</th></tr></thead><tbody>'
+STUDENT_TABLE_FOOT = '</tbody></table>'
+
+# Rows rendered per streamed chunk
+ROW_BATCH_SIZE = 500
+
+
+def render_student_row(roll_no, student):
+    """Render one row of the student list table"""
+    grade = student.get('grade', 0)
+    grade_badge = 'badge-success' if grade >= 60 else 'badge-danger'
     
-    table = '<table class="table"><thead><tr><th>Roll No</th><th>Name</th><th>Grade</th><th>Attendance</th><th>Actions</th></tr></thead><tbody>'
+    attendance = student.get('attendance', 0)
+    att_badge = 'badge-success' if attendance >= 80 else 'badge-warning'
     
-    for roll_no, student in students.items():
-        grade = student.get('grade', 0)
-        grade_badge = 'badge-success' if grade >= 60 else 'badge-danger'
-        
-        attendance = student.get('attendance', 0)
-        att_badge = 'badge-success' if attendance >= 80 else 'badge-warning'
-        
-        table += f"""
+    return f"""
         <tr>
             <td>{html_escape(roll_no)}</td>
             <td>{student.get('name', 'N/A')}</td>
@@ -305,17 +352,41 @@ def render_student_list(students, sort_by='roll_no'):
             </td>
         </tr>
         """
+
+
+def iter_student_list(students, sort_by='roll_no', batch_size=ROW_BATCH_SIZE):
+    """
+    Render all students list as a sequence of HTML chunks
     
-    table += '</tbody></table>'
+    Yields the page head, the table head, rows in batches of
+    batch_size, then the table and page footer.
+    """
+    yield render_base_head('Students List')
+    yield STUDENT_LIST_SEARCH_FORM
     
     if not students:
-        table = '<p style="color: #999;">No students found.</p>'
-    
-    content = search_form + table
-    return render_base(content, 'Students List')
+        yield '<p style="color: #999;">No students found.</p>'
+    else:
+        yield STUDENT_TABLE_HEAD
+        rows = []
+        for roll_no, student in students.items():
+            rows.append(render_student_row(roll_no, student))
+            if len(rows) >= batch_size:
+                yield ''.join(rows)
+                rows = []
+        if rows:
+            yield ''.join(rows)
+        yield STUDENT_TABLE_FOOT
+    
+    yield BASE_TAIL
+
+
+def render_student_list(students, sort_by='roll_no'):
+    """Render all students list"""
+    return ''.join(iter_student_list(students, sort_by))
 
 
-def render_search_results(results, query):
+def render_search_results(results, query, as_parts=False):
     """Render search results"""
     content = f"""
     <p style="margin-bottom: 20px; color: #666;">
@@ -366,16 +437,20 @@ def render_search_results(results, query):
     </div>
     """
     
-    return render_base(content, 'Search Results')
+    return render_base(content, 'Search Results', as_parts)
 
 
-def render_filter_results(results, filters):
+def render_filter_results(results, filters, as_parts=False):
     """Render filter results"""
     filter_info = []
     if 'grade_min' in filters:
         filter_info.append(f"Grade ≥ {filters['grade_min']}")
+    if 'grade_max' in filters:
+        filter_info.append(f"Grade ≤ {filters['grade_max']}")
     if 'attendance_min' in filters:
         filter_info.append(f"Attendance ≥ {filters['attendance_min']}%")
+    if 'attendance_max' in filters:
+        filter_info.append(f"Attendance ≤ {filters['attendance_max']}%")
     
     filter_text = ' AND '.join(filter_info) if filter_info else 'No filters'
     
@@ -439,10 +514,10 @@ def render_filter_results(results, filters):
     
     content += '</tbody></table>'
     
-    return render_base(content, 'Filter Results')
+    return render_base(content, 'Filter Results', as_parts)
 
 
-def render_statistics(stats):
+def render_statistics(stats, as_parts=False):
     """Render statistics dashboard"""
     content = f"""
     <div class="stats">
@@ -487,10 +562,10 @@ def render_statistics(stats):
     </div>
     """
     
-    return render_base(content, 'Statistics')
+    return render_base(content, 'Statistics', as_parts)
 
 
-def render_add_form(errors=None):
+def render_add_form(errors=None, as_parts=False):
     """Render add student form"""
     error_html = ''
     if errors:
@@ -538,10 +613,10 @@ def render_add_form(errors=None):
     </form>
     """
     
-    return render_base(content, 'Add Student')
+    return render_base(content, 'Add Student', as_parts)
 
 
-def render_add_success(roll_no, name):
+def render_add_success(roll_no, name, as_parts=False):
     """Render add success page"""
     content = f"""
     <div class="success-message">
@@ -554,10 +629,10 @@ def render_add_success(roll_no, name):
     </div>
     """
     
-    return render_base(content, 'Success')
+    return render_base(content, 'Success', as_parts)
 
 
-def render_edit_form(roll_no, student, errors=None):
+def render_edit_form(roll_no, student, errors=None, as_parts=False):
     """Render edit student form"""
     error_html = ''
     if errors:
@@ -609,10 +684,10 @@ def render_edit_form(roll_no, student, errors=None):
     </form>
     """
     
-    return render_base(content, 'Edit Student')
+    return render_base(content, 'Edit Student', as_parts)
 
 
-def render_edit_success(roll_no, name):
+def render_edit_success(roll_no, name, as_parts=False):
     """Render edit success page"""
     content = f"""
     <div class="success-message">
@@ -625,10 +700,10 @@ def render_edit_success(roll_no, name):
     </div>
     """
     
-    return render_base(content, 'Success')
+    return render_base(content, 'Success', as_parts)
 
 
-def render_student_detail(roll_no, student):
+def render_student_detail(roll_no, student, as_parts=False):
     """Render student details page"""
     fees_status = 'Paid' if student.get('fees_paid') else 'Pending'
     fees_badge = 'badge-success' if student.get('fees_paid') else 'badge-danger'
@@ -659,10 +734,10 @@ def render_student_detail(roll_no, student):
     </div>
     """
     
-    return render_base(content, f'Student {roll_no}')
+    return render_base(content, f'Student {roll_no}', as_parts)
 
 
-def render_delete_confirm(roll_no, student):
+def render_delete_confirm(roll_no, student, as_parts=False):
     """Render delete confirmation page"""
     content = f"""
     <div class="alert alert-error" style="font-size: 16px; padding: 20px;">
@@ -682,10 +757,10 @@ def render_delete_confirm(roll_no, student):
     </form>
     """
     
-    return render_base(content, 'Delete Confirmation')
+    return render_base(content, 'Delete Confirmation', as_parts)
 
 
-def render_delete_success(roll_no, name):
+def render_delete_success(roll_no, name, as_parts=False):
     """Render delete success page"""
     content = f"""
     <div class="success-message">
@@ -697,10 +772,10 @@ def render_delete_success(roll_no, name):
     </div>
     """
     
-    return render_base(content, 'Deleted')
+    return render_base(content, 'Deleted', as_parts)
 
 
-def render_error(message):
+def render_error(message, as_parts=False):
     """Render error page"""
     content = f"""
     <div class="alert alert-error" style="font-size: 16px; padding: 20px; margin-bottom: 20px;">
@@ -713,4 +788,4 @@ def render_error(message):
     </div>
     """
     
-    return render_base(content, 'Error')
+    return render_base(content, 'Error', as_parts)
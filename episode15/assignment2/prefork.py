@@ -0,0 +1,181 @@
+"""
+Pre-fork module for Episode 15 Assignment 2
+Several server processes on one port, sharing the JSON data file
+
+Layout:
+    parent      - forks the workers, restarts any that die, stops them
+                  all on SIGINT / SIGTERM; serves nothing itself
+    worker 1..N - each binds its own listening socket with SO_REUSEPORT,
+                  so the kernel spreads connections across processes and
+                  rendering is no longer held to one core by the GIL
+
+Each worker keeps its own in-memory copy of the students. FileSync
+keeps those copies in step through the data file.
+"""
+
+import contextlib
+import fcntl
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+import zlib
+
+RESTART_DELAY = 1       # seconds before restarting a worker that died young
+
+
+def cpu_count():
+    """CPUs this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def reuse_port_server(server_class):
+    """Subclass of a socketserver server class that binds with SO_REUSEPORT"""
+    return type(server_class.__name__, (server_class,), {'allow_reuse_port': True})
+
+
+def serve_prefork(serve, workers=None):
+    """
+    Run serve() in `workers` forked processes until SIGINT / SIGTERM
+
+    serve() runs in each child: it loads its data, binds a listening
+    socket with SO_REUSEPORT and serves forever. A child that exits is
+    replaced. On SIGINT / SIGTERM the parent sends SIGTERM to every
+    child and returns once they are gone. Children ignore SIGINT, so
+    Ctrl+C in a terminal stops them only through the parent.
+    """
+    workers = workers or cpu_count()
+    children = {}       # pid -> start time
+    stopping = False
+
+    def spawn():
+        # Output still buffered here would be written again by the child
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            code = 0
+            try:
+                serve()
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = time.monotonic()
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+
+    previous = {signum: signal.signal(signum, stop) for signum in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        for _ in range(workers):
+            spawn()
+        while children:
+            try:
+                pid, _ = os.wait()
+            except ChildProcessError:
+                break
+            started = children.pop(pid, None)
+            if started is None or stopping:
+                continue
+            if time.monotonic() - started < RESTART_DELAY:
+                time.sleep(RESTART_DELAY)     # don't spin on a worker that can't start
+            spawn()
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+
+
+class FileSync:
+    """
+    Keep this process's copy of a data file in step with other processes
+
+    - refresh() calls reload() if another process saved the file since
+      this one last read or wrote it. It is cheap enough for every
+      request (one stat and one 8-byte read).
+    - writing() is a context manager around read-modify-save: it holds
+      an exclusive lock shared by all processes, refreshes first, and
+      records the save as this process's own. Without it two workers
+      could each save their copy and lose the other's change.
+
+    Changes are detected through a generation counter kept in
+    path + '.lock' (bumped by every writing() block) and the file's
+    inode / mtime / size (which also catches edits by other programs).
+    stamp() names that state the same way in every process.
+
+    Example:
+        sync = FileSync('students_data.json', reload_students)
+        sync.refresh()                  # before reading
+        with sync.writing():            # around a change + save
+            ...
+    """
+
+    def __init__(self, path, reload):
+        self.path = path
+        self.reload = reload
+        self._lock = threading.RLock()      # threads of this process
+        self._fd = os.open(path + '.lock', os.O_RDWR | os.O_CREAT, 0o644)
+        self._signature = self._read_signature()
+        self.reloads = 0
+
+    def _read_signature(self):
+        generation = int.from_bytes(os.pread(self._fd, 8, 0), 'little')
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return generation, None
+        return generation, (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def refresh(self):
+        """Reload if the file changed elsewhere; return True if it did"""
+        if self._read_signature() == self._signature:
+            return False
+        with self._lock:
+            # Taken before reading, so a save racing the reload is seen next time
+            signature = self._read_signature()
+            if signature == self._signature:
+                return False
+            self.reload()
+            self._signature = signature
+            self.reloads += 1
+            return True
+
+    def stamp(self):
+        """
+        (tag, mtime) of the file as this process last read or wrote it
+
+        Processes in step with the file get the same stamp, so it can
+        name the data version across workers. mtime is None if there
+        is no file yet.
+        """
+        signature = self._signature
+        tag = '%08x' % zlib.crc32(repr(signature).encode('utf-8'))
+        return tag, signature[1] and signature[1][1] / 1e9
+
+    @contextlib.contextmanager
+    def writing(self):
+        """Hold the cross-process write lock around a change and its save"""
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                self.refresh()
+                yield
+            finally:
+                generation = self._signature[0] + 1
+                os.pwrite(self._fd, generation.to_bytes(8, 'little'), 0)
+                self._signature = self._read_signature()
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self):
+        os.close(self._fd)
@@ -0,0 +1,116 @@
+"""
+Router module for Episode 15 Assignment 2
+Declarative routes: static paths in a dict, parametric paths in a segment trie
+"""
+
+from urllib.parse import unquote
+
+
+class RouteError(Exception):
+    """No route for a request: 404, or 405 with the methods the path allows"""
+
+    def __init__(self, status, allowed=()):
+        super().__init__(status)
+        self.status = status
+        self.allowed = tuple(allowed)
+
+
+class _Node:
+    """One path segment of the trie"""
+
+    __slots__ = ('children', 'param', 'methods')
+
+    def __init__(self):
+        self.children = {}      # literal segment -> _Node
+        self.param = None       # _Node for a <name> segment
+        self.methods = {}       # method -> (target, parameter names)
+
+
+class Router:
+    """
+    Map (method, path) to a target and its path parameters
+
+    Routes are (method, pattern, target) triples. A pattern segment
+    written <name> matches any one non-empty segment, passed on as
+    params[name] (percent-decoded). The target is whatever the caller
+    wants back, e.g. the name of a handler method.
+
+    Paths without parameters are looked up in a dict. The others are
+    walked through a trie one segment at a time, literal segments
+    before parameters, so matching costs O(path segments) however many
+    routes there are.
+
+    match() raises RouteError(404) for an unknown path and
+    RouteError(405, allowed) when the path exists but not for that
+    method.
+
+    Example:
+        router = Router([
+            ('GET', '/students', '_handle_list'),
+            ('GET', '/students/<roll_no>', '_handle_student_detail'),
+        ])
+        router.match('GET', '/students/S001')
+        # ('_handle_student_detail', {'roll_no': 'S001'})
+    """
+
+    def __init__(self, routes=()):
+        self._static = {}       # path -> {method: (target, ())}
+        self._root = _Node()
+        for method, pattern, target in routes:
+            self.add(method, pattern, target)
+
+    def add(self, method, pattern, target):
+        """Add a route; a later route for the same method and pattern replaces it"""
+        if not pattern.startswith('/'):
+            raise ValueError(f"Route pattern must start with '/': {pattern!r}")
+        if '<' not in pattern:
+            self._static.setdefault(pattern, {})[method] = (target, ())
+            return
+
+        node = self._root
+        names = []
+        for segment in pattern[1:].split('/'):
+            if segment.startswith('<') and segment.endswith('>'):
+                names.append(segment[1:-1])
+                if node.param is None:
+                    node.param = _Node()
+                node = node.param
+            else:
+                node = node.children.setdefault(segment, _Node())
+        node.methods[method] = (target, tuple(names))
+
+    def match(self, method, path):
+        """Return (target, params) for a request path (no query string)"""
+        methods = self._static.get(path)
+        values = ()
+        if methods is None:
+            values = []
+            node = self._find(self._root, path[1:].split('/'), 0, values)
+            methods = node.methods if node is not None else None
+        if not methods:
+            raise RouteError(404)
+
+        route = methods.get(method)
+        if route is None:
+            raise RouteError(405, sorted(methods))
+        target, names = route
+        return target, {name: unquote(value) for name, value in zip(names, values)}
+
+    def _find(self, node, segments, i, values):
+        """Trie node for segments[i:] with a route on it, collecting parameter values"""
+        if i == len(segments):
+            return node if node.methods else None
+        segment = segments[i]
+
+        child = node.children.get(segment)
+        if child is not None:
+            found = self._find(child, segments, i + 1, values)
+            if found is not None:
+                return found
+        if node.param is not None and segment:
+            values.append(segment)
+            found = self._find(node.param, segments, i + 1, values)
+            if found is not None:
+                return found
+            values.pop()
+        return None
@@ -0,0 +1,213 @@
+"""
+Search index module for Episode 15 Assignment 2
+Ranked prefix/substring search over roll numbers and names
+"""
+
+import bisect
+import heapq
+import threading
+
+# Longest n-gram indexed; queries up to this length are one lookup
+MAX_GRAM = 3
+
+
+def _grams(text):
+    """All 1..MAX_GRAM character substrings of text"""
+    return {text[i:i + n] for n in range(1, MAX_GRAM + 1) for i in range(len(text) - n + 1)}
+
+
+class SearchIndex:
+    """
+    Incremental search index over roll numbers and student names
+
+    Matches are the same as the old linear scan (case-insensitive
+    substring of roll_no or name), returned ranked:
+        0. roll_no or name equals the query
+        1. roll_no or name starts with the query
+        2. a later word of the name starts with the query
+        3. query appears elsewhere (earlier position first)
+    Ties are broken alphabetically, then by roll number.
+
+    The index works on distinct lowercase texts (roll numbers, names,
+    name words), each mapped to the roll numbers that have it, so a
+    name shared by many students is checked once:
+    - tiers 0-2 come from sorted text lists (bisect), so a limited
+      search that fills up from them stops early
+    - tier 3 uses an n-gram inverted index (n = 1..MAX_GRAM) from
+      n-gram to texts: short queries are a single lookup, longer ones
+      intersect their trigram postings and check the few candidates
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._texts = {}            # roll_no -> (roll_no lower, name lower)
+        self._owners = {}           # text -> {roll_no} (roll numbers and names)
+        self._word_owners = {}      # word -> {roll_no} (words after the first)
+        self._keys = []             # sorted texts of _owners
+        self._word_keys = []        # sorted words of _word_owners
+        self._postings = {}         # n-gram -> {text}
+
+    # ---------- maintenance ----------
+
+    @staticmethod
+    def _split(roll_no, student):
+        roll_lower = roll_no.lower()
+        name_lower = str(student.get('name', '')).lower()
+        return (roll_lower, name_lower), set(name_lower.split()[1:])
+
+    def _link(self, owners, keys, text, roll_no, sort=True):
+        """Add roll_no under text; return True if text is new"""
+        holders = owners.get(text)
+        if holders is not None:
+            holders.add(roll_no)
+            return False
+        owners[text] = {roll_no}
+        if sort:
+            bisect.insort(keys, text)
+        else:
+            keys.append(text)
+        return True
+
+    def _unlink(self, owners, keys, text, roll_no):
+        """Remove roll_no under text; return True if text is gone"""
+        holders = owners.get(text)
+        if holders is None:
+            return False
+        holders.discard(roll_no)
+        if holders:
+            return False
+        del owners[text]
+        position = bisect.bisect_left(keys, text)
+        if position < len(keys) and keys[position] == text:
+            del keys[position]
+        return True
+
+    def _add_locked(self, roll_no, student, sort=True):
+        texts, words = self._split(roll_no, student)
+        self._texts[roll_no] = texts
+        for text in set(texts):
+            if self._link(self._owners, self._keys, text, roll_no, sort):
+                for gram in _grams(text):
+                    self._postings.setdefault(gram, set()).add(text)
+        for word in words:
+            self._link(self._word_owners, self._word_keys, word, roll_no, sort)
+
+    def _remove_locked(self, roll_no):
+        texts = self._texts.pop(roll_no)
+        for text in set(texts):
+            if self._unlink(self._owners, self._keys, text, roll_no):
+                for gram in _grams(text):
+                    posting = self._postings[gram]
+                    posting.discard(text)
+                    if not posting:
+                        del self._postings[gram]
+        for word in set(texts[1].split()[1:]):
+            self._unlink(self._word_owners, self._word_keys, word, roll_no)
+
+    def add(self, roll_no, student):
+        """Index one student (replacing any previous entry)"""
+        with self._lock:
+            if roll_no in self._texts:
+                self._remove_locked(roll_no)
+            self._add_locked(roll_no, student)
+
+    def remove(self, roll_no):
+        """Drop one student from the index"""
+        with self._lock:
+            if roll_no in self._texts:
+                self._remove_locked(roll_no)
+
+    def apply(self, roll_no, old, new):
+        """StudentStore observer: re-index a changed student"""
+        if new is None:
+            self.remove(roll_no)
+        elif old is None or old.get('name') != new.get('name'):
+            self.add(roll_no, new)
+
+    def rebuild(self, students):
+        """Index all students at once ({roll_no: student}), sorting once"""
+        with self._lock:
+            self.clear()
+            for roll_no, student in students.items():
+                self._add_locked(roll_no, student, sort=False)
+            self._keys.sort()
+            self._word_keys.sort()
+
+    def clear(self):
+        """Drop everything"""
+        with self._lock:
+            for container in (self._texts, self._owners, self._word_owners,
+                              self._keys, self._word_keys, self._postings):
+                container.clear()
+
+    # ---------- queries ----------
+
+    @staticmethod
+    def _prefix_matches(keys, query):
+        """Yield texts from sorted keys that start with query, in order"""
+        position = bisect.bisect_left(keys, query)
+        while position < len(keys) and keys[position].startswith(query):
+            yield keys[position]
+            position += 1
+
+    @staticmethod
+    def _take(roll_nos, found, limit):
+        """Add roll_nos to found in order; return True once limit is reached"""
+        if limit is None:
+            batch = sorted(roll_nos)
+        else:
+            # Enough to fill up even if some are already in found
+            batch = heapq.nsmallest(limit, roll_nos)
+        for roll_no in batch:
+            if limit is not None and len(found) >= limit:
+                return True
+            found.setdefault(roll_no)
+        return limit is not None and len(found) >= limit
+
+    def _substring_texts(self, query):
+        """Indexed texts containing query"""
+        if len(query) <= MAX_GRAM:
+            return self._postings.get(query, ())
+        postings = []
+        for i in range(len(query) - MAX_GRAM + 1):
+            posting = self._postings.get(query[i:i + MAX_GRAM])
+            if not posting:
+                return ()
+            postings.append(posting)
+        postings.sort(key=len)
+        return [text for text in set.intersection(*postings) if query in text]
+
+    def search(self, query, limit=None):
+        """
+        Return matching roll numbers, best first
+
+        Args:
+            query: search text (case-insensitive)
+            limit: maximum number of results (None = all)
+        """
+        query = query.lower()
+        found = {}      # roll_no -> None, in rank order
+
+        with self._lock:
+            if not query:
+                self._take(self._texts, found, limit)
+                return list(found)
+
+            # Tiers 0-2: exact / prefix matches come out of the sorted
+            # texts already in order (an exact match sorts first)
+            for keys, owners in ((self._keys, self._owners), (self._word_keys, self._word_owners)):
+                for text in self._prefix_matches(keys, query):
+                    if self._take(owners[text], found, limit):
+                        return list(found)
+
+            # Tier 3: substring anywhere, earlier position first
+            ranked = [(text.find(query), text) for text in self._substring_texts(query)]
+            if limit is None:
+                ranked.sort()
+            else:
+                ranked = heapq.nsmallest(limit, ranked)
+            for _, text in ranked:
+                if self._take(self._owners[text], found, limit):
+                    break
+
+        return list(found)
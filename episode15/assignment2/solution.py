@@ -6,20 +6,41 @@ Complete solution with search, filter, sort, export, and statistics
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import parse_qs, urlparse
 import json
-import os
 import signal
 import sys
+from contextlib import nullcontext
 from datetime import datetime
-import csv
-import io
 import stores
 import page
+import export
+import conditional
+import async_server
+import prefork
+import router
+from pooled_server import PooledHTTPServer
+from keepalive import KeepAliveMixin
+from form_parser import FormError, read_request_form
+from page_cache import PageCache
 
 
 # Global variables
-STUDENTS = {}
+STUDENTS = stores.StudentStore()
 CURRENT_SORT = 'roll_no'
 CURRENT_FILTER = {}
+SEARCH_RESULT_LIMIT = 100  # best matches shown on /search
+
+# Server engine used by start_server:
+#   'pool'    - fixed worker threads, bounded queue, 503 when full (pooled_server.py)
+#   'threads' - ThreadingHTTPServer, one thread per connection
+#   'asyncio' - one event loop for all connections (async_server.py)
+SERVER_ENGINE = 'pool'
+
+# Rendered pages, keyed by data version and emptied on every save
+PAGE_CACHE = PageCache()
+stores.add_save_listener(PAGE_CACHE.clear)
+
+# Set in each worker process of a multi-process server (see prefork.py)
+DATA_SYNC = None
 
 def reset_for_testing():
     """Reset all globals - used for testing"""
@@ -28,158 +49,165 @@ def reset_for_testing():
     CURRENT_SORT = 'roll_no'
 
 
-class AdvancedStudentHandler(BaseHTTPRequestHandler):
+class AdvancedStudentHandler(KeepAliveMixin, BaseHTTPRequestHandler):
     """Advanced HTTP handler for student management with search, filter, sort"""
     
+    # HTTP/1.1 is required for Transfer-Encoding: chunked.
+    # Unless keep_alive is on (start_server turns it on), KeepAliveMixin
+    # sends "Connection: close", so each connection serves one request.
+    protocol_version = 'HTTP/1.1'
+    
+    # Handler method for each route; <name> segments become keyword arguments
+    ROUTES = router.Router([
+        ('GET', '/__test_reset__', '_handle_test_reset'),     # test-only
+        ('GET', '/', '_handle_home'),
+        ('GET', '/students', '_handle_list'),
+        ('GET', '/students/<roll_no>', '_handle_student_detail'),
+        ('GET', '/add', '_handle_add_form'),
+        ('POST', '/add', '_handle_add_post'),
+        ('GET', '/edit', '_handle_edit_form'),
+        ('POST', '/edit', '_handle_edit_post'),
+        ('GET', '/delete/<roll_no>', '_handle_delete_confirm'),
+        ('POST', '/delete/<roll_no>', '_handle_delete_post'),
+        ('GET', '/search', '_handle_search'),
+        ('GET', '/filter', '_handle_filter'),
+        ('GET', '/sort', '_handle_sort'),
+        ('GET', '/stats', '_handle_statistics'),
+        ('GET', '/export/csv', '_handle_export_csv'),
+        ('GET', '/static/app.css', '_handle_static_css'),
+        ('GET', '/server-stats', '_handle_server_stats'),
+    ])
+    
     def do_GET(self):
         """Handle GET requests"""
-        parsed_url = urlparse(self.path)
-        path = parsed_url.path
-        params = parse_qs(parsed_url.query)
-        
-        try:
-            # Test-only endpoint to reset state
-            if path == '/__test_reset__':
-                self._handle_test_reset()
-            elif path == '/':
-                self._handle_home()
-            elif path == '/students':
-                self._handle_list()
-            elif path == '/add':
-                self._handle_add_form()
-            elif path.startswith('/students/'):
-                roll_no = path.split('/')[-1]
-                self._handle_student_detail(roll_no)
-            elif path == '/search':
-                query = params.get('q', [''])[0]
-                self._handle_search(query)
-            elif path == '/filter':
-                self._handle_filter(params)
-            elif path == '/sort':
-                sort_by = params.get('by', ['roll_no'])[0]
-                self._handle_sort(sort_by)
-            elif path == '/stats':
-                self._handle_statistics()
-            elif path == '/export/csv':
-                self._handle_export_csv()
-            elif path == '/edit':
-                roll_no = params.get('roll_no', [''])[0]
-                self._handle_edit_form(roll_no)
-            elif path.startswith('/delete/'):
-                roll_no = path.split('/')[-1]
-                self._handle_delete_confirm(roll_no)
-            else:
-                self._send_html(page.render_error('Page not found'), 404)
-        except Exception as e:
-            self._send_html(page.render_error(f'Error: {str(e)}'), 500)
+        if DATA_SYNC is not None:
+            DATA_SYNC.refresh()
+            _share_version()
+        self._dispatch()
     
     def do_POST(self):
         """Handle POST requests"""
+        # No other worker process may save in between (see prefork.FileSync)
+        with DATA_SYNC.writing() if DATA_SYNC is not None else nullcontext():
+            self._dispatch()
+        if DATA_SYNC is not None:
+            _share_version()
+    
+    def do_PUT(self):
+        """No PUT routes: 405 for known paths, 404 otherwise"""
+        self._dispatch()
+    
+    do_PATCH = do_DELETE = do_PUT
+    
+    def _dispatch(self):
+        """Run the handler method ROUTES maps this request to"""
         parsed_url = urlparse(self.path)
-        path = parsed_url.path
+        self.query = parse_qs(parsed_url.query)
         
         try:
-            if path == '/add':
-                self._handle_add_post()
-            elif path == '/edit':
-                self._handle_edit_post()
-            elif path.startswith('/delete/'):
-                roll_no = path.split('/')[-1]
-                self._handle_delete_post(roll_no)
+            target, params = self.ROUTES.match(self.command, parsed_url.path)
+        except router.RouteError as e:
+            # The body of an unrouted request is never read, so it
+            # can't be followed by another request on this connection
+            headers = [('Connection', 'close')] if self.headers.get('Content-Length') else []
+            if e.status == 405:
+                headers.append(('Allow', ', '.join(e.allowed)))
+                self._send_html(page.render_error('Method not allowed', as_parts=True), 405, headers)
             else:
-                self._send_html(page.render_error('Not found'), 404)
+                self._send_html(page.render_error('Page not found', as_parts=True), 404, headers)
+            return
+        
+        try:
+            getattr(self, target)(**params)
+        except FormError as e:
+            self._send_html(page.render_error(str(e), as_parts=True), e.status)
         except Exception as e:
-            self._send_html(page.render_error(f'Error: {str(e)}'), 500)
+            self._send_html(page.render_error(f'Error: {str(e)}', as_parts=True), 500)
     
     def _handle_home(self):
         """Show dashboard with statistics and recent students"""
         global STUDENTS
         
-        stats = self._calculate_statistics()
-        recent = sorted(STUDENTS.values(), 
-                       key=lambda x: x.get('added_on', ''), 
-                       reverse=True)[:5]
+        headers = self._check_not_modified('dashboard')
+        if headers is None:
+            return
         
-        html = page.render_dashboard(STUDENTS, stats, recent)
-        self._send_html(html)
+        def render():
+            stats = self._calculate_statistics()
+            recent = sorted(STUDENTS.values(), 
+                           key=lambda x: x.get('added_on', ''), 
+                           reverse=True)[:5]
+            return page.render_dashboard(STUDENTS, stats, recent, as_parts=True)
+        
+        body = PAGE_CACHE.render(self._cache_key('render_dashboard'), render)
+        self._send_html(body, headers=headers)
     
     def _handle_list(self):
         """Show all students list"""
         global STUDENTS, CURRENT_SORT
         
-        students = STUDENTS.copy()
-        
-        # Apply current sorting
-        if CURRENT_SORT == 'name':
-            sorted_students = sorted(students.items(), 
-                                    key=lambda x: x[1].get('name', ''))
-        elif CURRENT_SORT == 'grade':
-            sorted_students = sorted(students.items(), 
-                                    key=lambda x: x[1].get('grade', 0), 
-                                    reverse=True)
-        elif CURRENT_SORT == 'attendance':
-            sorted_students = sorted(students.items(), 
-                                    key=lambda x: x[1].get('attendance', 0), 
-                                    reverse=True)
-        else:  # roll_no
-            sorted_students = sorted(students.items())
-        
-        html = page.render_student_list(dict(sorted_students), CURRENT_SORT)
-        self._send_html(html)
+        # CURRENT_SORT changes without a data change: ETag only
+        headers = self._check_not_modified('list', CURRENT_SORT, dated=False)
+        if headers is None:
+            return
+        
+        key = self._cache_key('render_student_list', CURRENT_SORT)
+        body = PAGE_CACHE.get(key)
+        if body is not None:
+            self._send_html(body, headers=headers)
+            return
+        
+        # Apply current sorting (read from the sorted index, no re-sort)
+        # name/roll_no ascending, grade/attendance highest first
+        sorted_students = stores.sort_students(
+            STUDENTS, CURRENT_SORT, reverse=CURRENT_SORT in ('grade', 'attendance')
+        )
+        
+        # Streamed as it renders; cached too unless the page is huge
+        chunks = (chunk.encode('utf-8') for chunk in page.iter_student_list(sorted_students, CURRENT_SORT))
+        self._send_chunked(PAGE_CACHE.capture(key, chunks), 'text/html; charset=utf-8', headers=headers)
     
-    def _handle_search(self, query):
-        """Search students by name or roll number"""
+    def _handle_search(self):
+        """Search students by name or roll number (?q=)"""
         global STUDENTS
         
+        query = self.query.get('q', [''])[0]
         if not query:
             self._redirect('/students')
             return
         
-        query_lower = query.lower()
-        results = {}
+        # Ranked lookup in the search index kept by STUDENTS
+        results = stores.search_students(STUDENTS, query, SEARCH_RESULT_LIMIT)
         
-        for roll_no, student in STUDENTS.items():
-            if (query_lower in roll_no.lower() or 
-                query_lower in student.get('name', '').lower()):
-                results[roll_no] = student
-        
-        html = page.render_search_results(results, query)
+        html = page.render_search_results(results, query, as_parts=True)
         self._send_html(html)
     
-    def _handle_filter(self, params):
+    def _handle_filter(self):
         """Filter students by grade or attendance"""
         global STUDENTS
         
-        results = STUDENTS.copy()
+        params = self.query
         applied_filters = {}
         
-        # Filter by grade
-        if 'grade_min' in params:
-            try:
-                grade_min = float(params['grade_min'][0])
-                results = {k: v for k, v in results.items() 
-                          if float(v.get('grade', 0)) >= grade_min}
-                applied_filters['grade_min'] = grade_min
-            except (ValueError, KeyError):
-                pass
-        
-        # Filter by attendance
-        if 'attendance_min' in params:
-            try:
-                att_min = float(params['attendance_min'][0])
-                results = {k: v for k, v in results.items() 
-                          if float(v.get('attendance', 0)) >= att_min}
-                applied_filters['attendance_min'] = att_min
-            except (ValueError, KeyError):
-                pass
-        
-        html = page.render_filter_results(results, applied_filters)
+        # Grade / attendance ranges
+        for name in ('grade_min', 'grade_max', 'attendance_min', 'attendance_max'):
+            if name in params:
+                try:
+                    applied_filters[name] = float(params[name][0])
+                except (ValueError, KeyError):
+                    pass
+        
+        # Binary search on the sorted indexes kept by STUDENTS
+        results = stores.filter_students(STUDENTS, applied_filters)
+        
+        html = page.render_filter_results(results, applied_filters, as_parts=True)
         self._send_html(html)
     
-    def _handle_sort(self, sort_by):
-        """Handle sorting"""
+    def _handle_sort(self):
+        """Handle sorting (?by=)"""
         global CURRENT_SORT
         
+        sort_by = self.query.get('by', ['roll_no'])[0]
         if sort_by not in ['roll_no', 'name', 'grade', 'attendance']:
             sort_by = 'roll_no'
         
@@ -190,42 +218,74 @@ class AdvancedStudentHandler(BaseHTTPRequestHandler):
         """Show statistics dashboard"""
         global STUDENTS
         
-        stats = self._calculate_statistics()
-        html = page.render_statistics(stats)
-        self._send_html(html)
+        headers = self._check_not_modified('stats')
+        if headers is None:
+            return
+        
+        body = PAGE_CACHE.render(self._cache_key('render_statistics'),
+                                 lambda: page.render_statistics(self._calculate_statistics(), as_parts=True))
+        self._send_html(body, headers=headers)
     
     def _handle_export_csv(self):
-        """Export students as CSV"""
-        global STUDENTS
+        """
+        Export students as CSV, streamed in chunks
         
-        output = io.StringIO()
-        writer = csv.writer(output)
+        ?fields=roll_no,name,... picks and orders the columns; the
+        body is gzip-compressed when the client accepts it.
+        """
+        global STUDENTS
         
-        # Header
-        writer.writerow(['Roll No', 'Name', 'Grade', 'Attendance', 'Fees Paid', 'Added On'])
+        try:
+            fields = export.parse_fields(self.query.get('fields', [''])[0])
+        except ValueError as e:
+            self._send_html(page.render_error(str(e), as_parts=True), 400)
+            return
         
-        # Data rows
-        for roll_no, student in sorted(STUDENTS.items()):
-            writer.writerow([
-                roll_no,
-                student.get('name', ''),
-                student.get('grade', ''),
-                student.get('attendance', ''),
-                'Yes' if student.get('fees_paid') else 'No',
-                student.get('added_on', '')
-            ])
+        gzip = export.accepts_gzip(self.headers.get('Accept-Encoding'))
+        headers = self._check_not_modified('csv', fields, gzip)
+        if headers is None:
+            return
         
-        csv_content = output.getvalue()
+        rows = stores.iter_sorted_students(STUDENTS, 'roll_no')
+        chunks = export.iter_csv(rows, fields)
+        headers += [('Content-Disposition', 'attachment; filename="students.csv"'),
+                    ('Vary', 'Accept-Encoding')]
+        if gzip:
+            chunks = export.gzip_chunks(chunks)
+            headers.append(('Content-Encoding', 'gzip'))
         
-        self.send_response(200)
-        self.send_header('Content-Type', 'text/csv')
-        self.send_header('Content-Disposition', 'attachment; filename="students.csv"')
-        self.end_headers()
-        self.wfile.write(csv_content.encode('utf-8'))
+        self._send_chunked(chunks, 'text/csv; charset=utf-8', headers=headers)
+    
+    def _handle_static_css(self):
+        """
+        Serve the shared stylesheet (linked when page.EXTERNAL_CSS is set)
+        
+        Pages link it as APP_CSS_URL, whose ?v= hash changes with the
+        CSS, so browsers may keep it for a year without revalidating.
+        """
+        etag = '"%s"' % page.APP_CSS_URL.rsplit('=', 1)[-1]
+        headers = [('ETag', etag), ('Cache-Control', 'public, max-age=31536000, immutable')]
+        if conditional.etag_matches(self.headers.get('If-None-Match', ''), etag):
+            self.send_response(304)
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            return
+        self._send_bytes([page.APP_CSS_BYTES], 'text/css; charset=utf-8', headers=headers)
+
+    def _handle_server_stats(self):
+        """Serve the server's queue / worker / connection counters as JSON"""
+        stats = getattr(self.server, 'stats', None)
+        if stats is None:
+            # ThreadingHTTPServer keeps no counters
+            self._send_html(page.render_error('Page not found', as_parts=True), 404)
+            return
+        body = json.dumps(stats()).encode('utf-8')
+        self._send_bytes([body], 'application/json', headers=[('Cache-Control', 'no-store')])
     
     def _handle_add_form(self):
         """Show add student form"""
-        html = page.render_add_form()
+        html = page.render_add_form(as_parts=True)
         self._send_html(html)
     
     def _handle_add_post(self):
@@ -266,7 +326,7 @@ class AdvancedStudentHandler(BaseHTTPRequestHandler):
             errors.append('Attendance must be a number')
         
         if errors:
-            html = page.render_add_form(errors)
+            html = page.render_add_form(errors, as_parts=True)
             self._send_html(html)
             return
         
@@ -279,21 +339,22 @@ class AdvancedStudentHandler(BaseHTTPRequestHandler):
             'added_on': datetime.now().isoformat()
         }
         
-        stores.save_students(STUDENTS)
+        stores.save_students(STUDENTS, {roll_no: STUDENTS[roll_no]})
         
-        html = page.render_add_success(roll_no, name)
+        html = page.render_add_success(roll_no, name, as_parts=True)
         self._send_html(html)
     
-    def _handle_edit_form(self, roll_no):
-        """Show edit student form"""
+    def _handle_edit_form(self):
+        """Show edit student form (?roll_no=)"""
         global STUDENTS
         
+        roll_no = self.query.get('roll_no', [''])[0]
         if roll_no not in STUDENTS:
-            self._send_html(page.render_error('Student not found'), 404)
+            self._send_html(page.render_error('Student not found', as_parts=True), 404)
             return
         
         student = STUDENTS[roll_no]
-        html = page.render_edit_form(roll_no, student)
+        html = page.render_edit_form(roll_no, student, as_parts=True)
         self._send_html(html)
     
     def _handle_edit_post(self):
@@ -304,7 +365,7 @@ class AdvancedStudentHandler(BaseHTTPRequestHandler):
         roll_no = form_data.get('roll_no', '').strip()
         
         if roll_no not in STUDENTS:
-            self._send_html(page.render_error('Student not found'), 404)
+            self._send_html(page.render_error('Student not found', as_parts=True), 404)
             return
         
         errors = []
@@ -334,20 +395,22 @@ class AdvancedStudentHandler(BaseHTTPRequestHandler):
             errors.append('Attendance must be a number')
         
         if errors:
-            html = page.render_edit_form(roll_no, student, errors)
+            html = page.render_edit_form(roll_no, student, errors, as_parts=True)
             self._send_html(html)
             return
         
-        # Update student
+        # Update student (replace the record so STUDENTS sees the change)
+        student = dict(student)
         student['name'] = page.html_escape(name)
         student['grade'] = float(form_data.get('grade', 0))
         student['attendance'] = float(form_data.get('attendance', 0))
         student['fees_paid'] = form_data.get('fees_paid') == 'on'
         student['updated_on'] = datetime.now().isoformat()
+        STUDENTS[roll_no] = student
         
-        stores.save_students(STUDENTS)
+        stores.save_students(STUDENTS, {roll_no: student})
         
-        html = page.render_edit_success(roll_no, name)
+        html = page.render_edit_success(roll_no, name, as_parts=True)
         self._send_html(html)
     
     def _handle_student_detail(self, roll_no):
@@ -355,11 +418,11 @@ class AdvancedStudentHandler(BaseHTTPRequestHandler):
         global STUDENTS
         
         if roll_no not in STUDENTS:
-            self._send_html(page.render_error('Student not found'), 404)
+            self._send_html(page.render_error('Student not found', as_parts=True), 404)
             return
         
         student = STUDENTS[roll_no]
-        html = page.render_student_detail(roll_no, student)
+        html = page.render_student_detail(roll_no, student, as_parts=True)
         self._send_html(html)
     
     def _handle_delete_confirm(self, roll_no):
@@ -367,11 +430,11 @@ class AdvancedStudentHandler(BaseHTTPRequestHandler):
         global STUDENTS
         
         if roll_no not in STUDENTS:
-            self._send_html(page.render_error('Student not found'), 404)
+            self._send_html(page.render_error('Student not found', as_parts=True), 404)
             return
         
         student = STUDENTS[roll_no]
-        html = page.render_delete_confirm(roll_no, student)
+        html = page.render_delete_confirm(roll_no, student, as_parts=True)
         self._send_html(html)
     
     def _handle_delete_post(self, roll_no):
@@ -379,14 +442,14 @@ class AdvancedStudentHandler(BaseHTTPRequestHandler):
         global STUDENTS
         
         if roll_no not in STUDENTS:
-            self._send_html(page.render_error('Student not found'), 404)
+            self._send_html(page.render_error('Student not found', as_parts=True), 404)
             return
         
         student = STUDENTS[roll_no]
         del STUDENTS[roll_no]
-        stores.save_students(STUDENTS)
+        stores.save_students(STUDENTS, {roll_no: None})
         
-        html = page.render_delete_success(roll_no, student['name'])
+        html = page.render_delete_success(roll_no, student['name'], as_parts=True)
         self._send_html(html)
     
     def _calculate_statistics(self):
@@ -404,17 +467,17 @@ class AdvancedStudentHandler(BaseHTTPRequestHandler):
                 'low_attendance': 0
             }
         
-        total = len(STUDENTS)
-        grades = [s.get('grade', 0) for s in STUDENTS.values()]
-        attendance = [s.get('attendance', 0) for s in STUDENTS.values()]
+        # Running counters kept up to date by STUDENTS (O(1))
+        counters = STUDENTS.stats.read(STUDENTS)
+        total = counters['total']
         
-        avg_grade = sum(grades) / total if total > 0 else 0
-        avg_attendance = sum(attendance) / total if total > 0 else 0
+        avg_grade = counters['grade_sum'] / total if total > 0 else 0
+        avg_attendance = counters['attendance_sum'] / total if total > 0 else 0
         
-        pass_count = len([g for g in grades if g >= 60])
+        pass_count = counters['pass_count']
         fail_count = total - pass_count
-        high_att = len([a for a in attendance if a >= 80])
-        low_att = len([a for a in attendance if a < 80])
+        high_att = counters['high_attendance_count']
+        low_att = total - high_att
         
         return {
             'total_students': total,
@@ -430,6 +493,7 @@ class AdvancedStudentHandler(BaseHTTPRequestHandler):
         """Send redirect response"""
         self.send_response(302)
         self.send_header('Location', path)
+        self.send_header('Content-Length', '0')
         self.end_headers()
     
     def _handle_test_reset(self):
@@ -438,49 +502,167 @@ class AdvancedStudentHandler(BaseHTTPRequestHandler):
         STUDENTS.clear()
         CURRENT_SORT = 'roll_no'
         
-        # Remove data file if exists
-        if os.path.exists('students_data.json'):
-            try:
-                os.remove('students_data.json')
-            except:
-                pass
+        # Remove data file (and write-ahead log) if exists
+        try:
+            stores.delete_storage()
+        except:
+            pass
         
         self._send_html('<html><body>Reset complete</body></html>')
     
-    def _send_html(self, html, status_code=200):
-        """Send HTML response"""
+    def _check_not_modified(self, *variant, dated=True):
+        """
+        Conditional GET for a page built from STUDENTS
+        
+        Sends 304 Not Modified and returns None if the client's copy
+        (If-None-Match / If-Modified-Since) matches the current data
+        version; otherwise returns the ETag / Last-Modified headers to
+        send with the page. Call before rendering, so the tag is never
+        newer than the page. dated=False (for pages that also depend on
+        server state, like the sort order) leaves out Last-Modified and
+        If-Modified-Since.
+        """
+        version = STUDENTS.version
+        etag = version.etag(*variant)
+        headers = version.validators(etag, dated)
+        if not version.is_fresh(self.headers, etag, dated):
+            return headers
+        
+        self.send_response(304)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        return None
+    
+    def _cache_key(self, renderer, *args):
+        """PAGE_CACHE key: a rendered page is only valid for this data version"""
+        return (renderer, args, STUDENTS.version.etag())
+    
+    def _send_html(self, html, status_code=200, headers=()):
+        """
+        Send HTML response
+        
+        html is a str, encoded bytes, or a list of byte strings (a page
+        rendered with as_parts=True), written out with writelines.
+        """
+        if isinstance(html, str):
+            html = html.encode('utf-8')
+        parts = [html] if isinstance(html, bytes) else html
+        self._send_bytes(parts, 'text/html; charset=utf-8', status_code, headers)
+    
+    def _send_bytes(self, parts, content_type, status_code=200, headers=()):
+        """Send a body given as a list of byte strings, with Content-Length"""
+        self.send_response(status_code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(sum(map(len, parts))))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.writelines(parts)
+    
+    def _send_html_chunked(self, chunks, status_code=200, headers=()):
+        """Send HTML generated piece by piece (see _send_chunked)"""
+        self._send_chunked((chunk.encode('utf-8') for chunk in chunks),
+                           'text/html; charset=utf-8', status_code, headers)
+    
+    def _send_chunked(self, chunks, content_type, status_code=200, headers=()):
+        """
+        Send a body of byte chunks (Transfer-Encoding: chunked)
+        
+        Each chunk is written as soon as it is produced, so the first
+        bytes go out before the whole body exists and memory stays flat.
+        HTTP/1.0 clients can't read chunked bodies; they get the chunks
+        unframed and the end of the body is the closed connection.
+        """
+        chunked = self.request_version != 'HTTP/1.0'
+        
         self.send_response(status_code)
-        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Type', content_type)
+        for name, value in headers:
+            self.send_header(name, value)
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
         self.end_headers()
-        self.wfile.write(html.encode('utf-8'))
+        
+        for data in chunks:
+            if not data:
+                continue
+            if chunked:
+                data = b'%X\r\n%s\r\n' % (len(data), data)
+            self.wfile.write(data)
+        
+        if chunked:
+            self.wfile.write(b'0\r\n\r\n')
     
     def _read_form(self):
-        """Read form data from POST"""
-        content_length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(content_length)
-        body_string = body.decode('utf-8')
-        parsed = parse_qs(body_string)
-        return {k: v[0] for k, v in parsed.items()}
+        """Read POST form data (in chunks, with size limits; see form_parser.py)"""
+        return read_request_form(self)
     
     def log_message(self, format, *args):
         """Suppress default logging"""
         pass
 
 
-def start_server(port=5001):
-    """Start the HTTP server"""
-    global STUDENTS
+def _create_server(port, keep_alive, engine, reuse_port=False):
+    """Create and bind the server for engine"""
+    if engine == 'asyncio':
+        return async_server.AsyncHTTPServer(AdvancedStudentHandler, ('127.0.0.1', port),
+                                            keep_alive=keep_alive, reuse_port=reuse_port)
     
-    # Load existing students
+    server_class = PooledHTTPServer if engine == 'pool' else ThreadingHTTPServer
+    if reuse_port:
+        server_class = prefork.reuse_port_server(server_class)
+    AdvancedStudentHandler.keep_alive = keep_alive
+    return server_class(('127.0.0.1', port), AdvancedStudentHandler)
+
+
+def _reload_students():
+    """Replace STUDENTS with the copy another worker process saved"""
+    global STUDENTS
+    STUDENTS = stores.load_students()
+    PAGE_CACHE.clear()
+
+
+def _share_version():
+    """Name STUDENTS' version after the data file, the same in every worker"""
+    STUDENTS.version.rebase(*DATA_SYNC.stamp())
+
+
+def _serve_worker(port, keep_alive, engine):
+    """One process of a multi-process server (runs in the forked child)"""
+    global STUDENTS, DATA_SYNC
+    # Sync first: a save landing before the load below is then reloaded
+    DATA_SYNC = prefork.FileSync(stores.STUDENTS_FILE, _reload_students)
     STUDENTS = stores.load_students()
+    _create_server(port, keep_alive, engine, reuse_port=True).serve_forever()
+
+
+def start_server(port=5001, keep_alive=True, engine=None, workers=1):
+    """
+    Start the HTTP server
     
-    server = ThreadingHTTPServer(('127.0.0.1', port), AdvancedStudentHandler)
+    Connections are persistent unless keep_alive=False. engine picks
+    'pool', 'threads' or 'asyncio' (default: SERVER_ENGINE). workers > 1
+    forks that many server processes sharing the port (see prefork.py).
+    """
+    global STUDENTS
+    
+    engine = engine or SERVER_ENGINE
+    if workers > 1:
+        if stores.STORAGE_BACKEND != 'json':
+            raise ValueError("Multiple worker processes need the 'json' storage backend")
+        server = None
+    else:
+        # Load existing students
+        STUDENTS = stores.load_students()
+        server = _create_server(port, keep_alive, engine)
     
     print("╔══════════════════════════════════════════╗")
     print("║  Advanced Student Management System      ║")
     print("║  Episode 15 - Assignment 2               ║")
     print("╚══════════════════════════════════════════╝")
-    print(f"\nServer running on http://127.0.0.1:{port}")
+    processes = f", {workers} processes" if workers > 1 else ""
+    print(f"\nServer running on http://127.0.0.1:{port} ({engine} engine{processes})")
     print("\nFeatures:")
     print("  ✓ Complete CRUD operations")
     print("  ✓ Search by name or roll number")
@@ -489,6 +671,7 @@ def start_server(port=5001):
     print("  ✓ Export to CSV")
     print("  ✓ Dashboard statistics")
     print("  ✓ Advanced validation")
+    print("  ✓ HTTP/1.1 keep-alive connections")
     print("\nEndpoints:")
     print("  GET  / - Dashboard")
     print("  GET  /students - Student list")
@@ -504,13 +687,20 @@ def start_server(port=5001):
     print("  GET  /sort?by=name - Sort")
     print("  GET  /stats - Statistics")
     print("  GET  /export/csv - Export CSV")
+    print("  GET  /server-stats - Server counters (JSON)")
     print("\nPress Ctrl+C to stop")
     
+    if server is None:
+        prefork.serve_prefork(lambda: _serve_worker(port, keep_alive, engine), workers)
+        print("\n\nShutting down gracefully...")
+        return
+    
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         print("\n\nShutting down gracefully...")
         stores.save_students(STUDENTS)
+        stores.flush_students()
         server.shutdown()
         sys.exit(0)
 
@@ -518,4 +708,6 @@ def start_server(port=5001):
 if __name__ == '__main__':
     import sys
     port = int(sys.argv[1]) if len(sys.argv) > 1 else 5001
-    start_server(port)
+    engine = sys.argv[2] if len(sys.argv) > 2 else None
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    start_server(port, engine=engine, workers=workers)
@@ -0,0 +1,91 @@
+"""
+Sorted index module for Episode 15 Assignment 2
+Bisect-backed secondary indexes for filtering and sorting
+"""
+
+import bisect
+import math
+import threading
+
+
+def number_key(field):
+    """Key function reading a numeric field (missing -> 0)"""
+    def key(roll_no, student):
+        return float(student.get(field, 0) or 0)
+    return key
+
+
+def text_key(field):
+    """Key function reading a text field (missing -> '')"""
+    def key(roll_no, student):
+        return str(student.get(field, ''))
+    return key
+
+
+def roll_no_key(roll_no, student):
+    """Key function for the roll number itself"""
+    return roll_no
+
+
+class SortedIndex:
+    """
+    Students ordered by one key, kept sorted as students change
+
+    Entries are (key, roll_no) tuples in a list kept sorted with bisect,
+    so equal keys are ordered by roll number. A change costs one binary
+    search plus a list insert/delete; listing in order needs no sort and
+    a range query is two binary searches.
+
+    Example:
+        grades = SortedIndex(number_key('grade'))
+        grades.rebuild(students)
+        grades.range(60, 80)        # roll numbers with 60 <= grade <= 80
+        grades.ordered(reverse=True)
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self._lock = threading.Lock()
+        self._entries = []
+
+    def _remove_locked(self, entry):
+        position = bisect.bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+
+    def apply(self, roll_no, old, new):
+        """StudentStore observer: move a changed student"""
+        old_entry = None if old is None else (self.key(roll_no, old), roll_no)
+        new_entry = None if new is None else (self.key(roll_no, new), roll_no)
+        if old_entry == new_entry:
+            return
+        with self._lock:
+            if old_entry is not None:
+                self._remove_locked(old_entry)
+            if new_entry is not None:
+                bisect.insort(self._entries, new_entry)
+
+    def rebuild(self, students):
+        """Index all students at once ({roll_no: student})"""
+        entries = sorted((self.key(roll_no, student), roll_no) for roll_no, student in students.items())
+        with self._lock:
+            self._entries = entries
+
+    def ordered(self, reverse=False):
+        """Return all roll numbers in key order"""
+        with self._lock:
+            entries = reversed(self._entries) if reverse else self._entries
+            return [roll_no for _, roll_no in entries]
+
+    def range(self, low=None, high=None):
+        """
+        Return roll numbers with low <= key <= high, in key order
+
+        Either bound may be None (open). Numeric keys only.
+        """
+        with self._lock:
+            entries = self._entries
+            start = 0 if low is None else bisect.bisect_left(entries, (low,))
+            # (next float above high,) sorts after every (high, roll_no)
+            stop = len(entries) if high is None else bisect.bisect_left(entries, (math.nextafter(high, math.inf),))
+            return [roll_no for _, roll_no in entries[start:stop]]
@@ -4,34 +4,255 @@ Extended data persistence with search and filter operations
 """
 
 import json
+import math
 import os
 import threading
 
+import columnar
+from aggregates import StatsAggregator
+from conditional import DataVersion
+from search_index import SearchIndex
+from sorted_index import SortedIndex, number_key, roll_no_key, text_key
+from snapshot import GroupCommit, write_json_atomic
+from wal import StudentLog
+
 STUDENTS_FILE = 'students_data.json'
 file_lock = threading.Lock()
 
+# Saves arriving within this many seconds share one snapshot write
+GROUP_COMMIT_WINDOW = 0.005
+
+# Storage backend:
+#   'json' - rewrite the whole file on every save
+#   'wal'  - append changed records to WAL_FILE, compact into STUDENTS_FILE
+STORAGE_BACKEND = 'json'
+WAL_FILE = 'students_data.log'
+WAL_FSYNC_BATCH = 32            # fsync after this many log records
+WAL_COMPACT_THRESHOLD = 10000   # compact once the log has this many records
+
+_student_log = None
+_save_listeners = []
+
+# Query engine behind statistics, filter and sort on a StudentStore:
+#   'python' - running counters and sorted indexes
+#   'numpy'  - NumPy column arrays, vectorized (needs numpy installed)
+ENGINE = 'python'
+
+
+def _write_snapshot(students):
+    """Atomically replace the JSON file with students"""
+    # dict() copies in one step, so other threads can keep writing
+    with file_lock:
+        write_json_atomic(STUDENTS_FILE, dict(students), indent=2)
+    return True
+
+
+_committer = GroupCommit(_write_snapshot, GROUP_COMMIT_WINDOW)
+
+
+def _get_log():
+    """Return the write-ahead log for the current settings"""
+    global _student_log
+    with file_lock:
+        if _student_log is None or _student_log.snapshot_path != STUDENTS_FILE:
+            if _student_log is not None:
+                _student_log.close()
+            _student_log = StudentLog(
+                STUDENTS_FILE, WAL_FILE,
+                to_state=dict, from_state=dict,
+                fsync_batch=WAL_FSYNC_BATCH,
+                compact_threshold=WAL_COMPACT_THRESHOLD
+            )
+        return _student_log
+
+
+class StudentStore(dict):
+    """
+    {roll_no: student} dict that keeps derived data up to date
+
+    Every write goes through __setitem__/__delitem__/pop/clear/update
+    and is passed to observers as (roll_no, old, new), so statistics and
+    indexes are maintained incrementally instead of rescanning students.
+    Reads are plain dict reads.
+
+    Student dicts must be replaced, not edited in place:
+        STUDENTS[roll_no] = {**STUDENTS[roll_no], 'grade': 90.0}
+    """
+
+    # update() with more new students than this (and than already
+    # stored) rebuilds derived data once instead of per student
+    BULK_THRESHOLD = 64
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._lock = threading.RLock()
+        self._observers = []
+        # Bumped on every change; validates cached pages (ETag)
+        self.version = DataVersion()
+        self.add_observer(self.version.bump, self.version.bump)
+        self.stats = StatsAggregator()
+        self.add_observer(lambda roll_no, old, new: self.stats.apply(old, new), self.stats.rebuild)
+        self.search_index = SearchIndex()
+        self.add_observer(self.search_index.apply, self.search_index.rebuild)
+        # Column arrays (numpy engine) or sorted indexes answer
+        # get_statistics / filter_students / sort_students
+        self.columns = None
+        self.indexes = {}
+        if ENGINE == 'numpy':
+            self.columns = columnar.ColumnStore()
+            self.add_observer(self.columns.apply, self.columns.rebuild)
+        else:
+            self.indexes = {
+                'roll_no': SortedIndex(roll_no_key),
+                'name': SortedIndex(text_key('name')),
+                'grade': SortedIndex(number_key('grade')),
+                'attendance': SortedIndex(number_key('attendance')),
+            }
+        for index in self.indexes.values():
+            self.add_observer(index.apply, index.rebuild)
+        self.update(*args, **kwargs)
+
+    def add_observer(self, callback, rebuild):
+        """
+        Keep derived data in sync
+
+        Args:
+            callback: callback(roll_no, old, new) after every change
+            rebuild: rebuild(students) after a bulk load
+        """
+        self._observers.append((callback, rebuild))
+
+    def _notify(self, roll_no, old, new):
+        for callback, _ in self._observers:
+            callback(roll_no, old, new)
+
+    def __setitem__(self, roll_no, student):
+        with self._lock:
+            old = self.get(roll_no)
+            super().__setitem__(roll_no, student)
+            self._notify(roll_no, old, student)
+
+    def __delitem__(self, roll_no):
+        with self._lock:
+            old = self[roll_no]
+            super().__delitem__(roll_no)
+            self._notify(roll_no, old, None)
+
+    def pop(self, roll_no, *default):
+        with self._lock:
+            if roll_no not in self:
+                return super().pop(roll_no, *default)
+            old = super().pop(roll_no)
+            self._notify(roll_no, old, None)
+            return old
+
+    def popitem(self):
+        with self._lock:
+            roll_no, old = super().popitem()
+            self._notify(roll_no, old, None)
+            return roll_no, old
+
+    def setdefault(self, roll_no, default=None):
+        with self._lock:
+            if roll_no not in self:
+                self[roll_no] = default
+            return self[roll_no]
+
+    def update(self, *args, **kwargs):
+        students = dict(*args, **kwargs)
+        with self._lock:
+            if len(students) > max(self.BULK_THRESHOLD, len(self)):
+                super().update(students)
+                for _, rebuild in self._observers:
+                    rebuild(self)
+                return
+            for roll_no, student in students.items():
+                self[roll_no] = student
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        with self._lock:
+            removed = list(self.items())
+            super().clear()
+            for roll_no, old in removed:
+                self._notify(roll_no, old, None)
+
 
 def load_students():
-    """Load students from JSON file"""
+    """Load students from JSON file (plus write-ahead log if enabled)"""
+    if STORAGE_BACKEND == 'wal':
+        return StudentStore(_get_log().load())
+
     with file_lock:
         if os.path.exists(STUDENTS_FILE):
             with open(STUDENTS_FILE, 'r') as f:
-                return json.load(f)
-    return {}
+                return StudentStore(json.load(f))
+    return StudentStore()
 
 
-def save_students(students):
-    """Save students to JSON file"""
-    with file_lock:
-        with open(STUDENTS_FILE, 'w') as f:
-            json.dump(students, f, indent=2)
+def add_save_listener(callback):
+    """Call callback() after every save_students (e.g. to drop cached pages)"""
+    _save_listeners.append(callback)
+
+
+def save_students(students, changes=None):
+    """
+    Save students to JSON file
+
+    Concurrent saves are merged into one atomic write (group commit).
+    Returns True once the data is durable on disk.
+
+    Args:
+        students: {roll_no: student} dict
+        changes: optional {roll_no: student or None} for the records that
+            changed (None = deleted). Only used by the 'wal' backend, which
+            otherwise diffs students against what it last wrote.
+    """
+    if STORAGE_BACKEND == 'wal':
+        saved = _get_log().save(students, changes)
+    else:
+        saved = _committer.commit(students)
+    
+    for callback in _save_listeners:
+        callback()
+    return saved
+
 
+def flush_students():
+    """fsync pending log records and wait for compaction (wal backend)"""
+    if _student_log is not None:
+        _student_log.close()
 
-def search_students(students, query):
-    """Search students by name or roll number"""
+
+def delete_storage():
+    """Remove the data file and any write-ahead log files"""
+    global _student_log
+    if _student_log is not None:
+        _student_log.delete_files()
+        _student_log = None
+    for path in (STUDENTS_FILE, WAL_FILE, WAL_FILE + '.old'):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def search_students(students, query, limit=None):
+    """
+    Search students by name or roll number
+
+    A StudentStore answers from its search index, best matches first
+    (see search_index.SearchIndex); other dicts are scanned.
+    """
     if not query:
         return students
     
+    if isinstance(students, StudentStore):
+        return {roll_no: students[roll_no]
+                for roll_no in students.search_index.search(query, limit)
+                if roll_no in students}
+    
     query_lower = query.lower()
     results = {}
     
@@ -43,14 +264,77 @@ def search_students(students, query):
     return results
 
 
+def _bound(value):
+    """A range bound as a float; ValueError unless it is a finite number"""
+    bound = float(value)
+    if not math.isfinite(bound):
+        # nan compares false with everything: the indexes and the scan
+        # would disagree on it, so it is ignored like any bad bound
+        raise ValueError(f'Range bound must be finite: {value!r}')
+    return bound
+
+
+def _range_criteria(criteria):
+    """[(field, low, high)] for the grade/attendance bounds in criteria"""
+    ranges = []
+    for field in ('grade', 'attendance'):
+        bounds = []
+        for suffix in ('_min', '_max'):
+            try:
+                bounds.append(_bound(criteria[field + suffix]))
+            except (ValueError, TypeError, KeyError):
+                bounds.append(None)
+        if bounds != [None, None]:
+            ranges.append((field, *bounds))
+    return ranges
+
+
+def _filter_indexed(students, criteria):
+    """
+    filter_students for a StudentStore: one vectorized pass over the
+    column arrays, or binary search each sorted index and intersect
+    """
+    ranges = _range_criteria(criteria)
+    matches = None      # roll numbers, in order of the first range
+    if ranges and students.columns is not None:
+        matches = students.columns.filter(ranges)
+    else:
+        for field, low, high in ranges:
+            hits = students.indexes[field].range(low, high)
+            if matches is None:
+                matches = hits
+            else:
+                hit_set = set(hits)
+                matches = [roll_no for roll_no in matches if roll_no in hit_set]
+    
+    with students._lock:
+        if matches is None:
+            return students.copy()
+        return {roll_no: students[roll_no] for roll_no in matches if roll_no in students}
+
+
 def filter_students(students, criteria):
-    """Filter students by various criteria"""
+    """
+    Filter students by various criteria
+
+    A StudentStore answers the grade/attendance ranges from its sorted
+    indexes or column arrays (results ordered by the first range's
+    field); other dicts are scanned in insertion order.
+    """
+    if isinstance(students, StudentStore):
+        results = _filter_indexed(students, criteria)
+        if 'fees_paid' in criteria:
+            fees_paid = criteria['fees_paid'].lower() == 'true'
+            results = {k: v for k, v in results.items() 
+                      if v.get('fees_paid') == fees_paid}
+        return results
+    
     results = students.copy()
     
     # Filter by minimum grade
     if 'grade_min' in criteria:
         try:
-            min_grade = float(criteria['grade_min'])
+            min_grade = _bound(criteria['grade_min'])
             results = {k: v for k, v in results.items() 
                       if float(v.get('grade', 0)) >= min_grade}
         except (ValueError, KeyError):
@@ -59,7 +343,7 @@ def filter_students(students, criteria):
     # Filter by maximum grade
     if 'grade_max' in criteria:
         try:
-            max_grade = float(criteria['grade_max'])
+            max_grade = _bound(criteria['grade_max'])
             results = {k: v for k, v in results.items() 
                       if float(v.get('grade', 0)) <= max_grade}
         except (ValueError, KeyError):
@@ -68,7 +352,7 @@ def filter_students(students, criteria):
     # Filter by minimum attendance
     if 'attendance_min' in criteria:
         try:
-            min_att = float(criteria['attendance_min'])
+            min_att = _bound(criteria['attendance_min'])
             results = {k: v for k, v in results.items() 
                       if float(v.get('attendance', 0)) >= min_att}
         except (ValueError, KeyError):
@@ -77,7 +361,7 @@ def filter_students(students, criteria):
     # Filter by maximum attendance
     if 'attendance_max' in criteria:
         try:
-            max_att = float(criteria['attendance_max'])
+            max_att = _bound(criteria['attendance_max'])
             results = {k: v for k, v in results.items() 
                       if float(v.get('attendance', 0)) <= max_att}
         except (ValueError, KeyError):
@@ -92,8 +376,41 @@ def filter_students(students, criteria):
     return results
 
 
+def iter_sorted_students(students, key='roll_no', reverse=False):
+    """
+    Yield (roll_no, student) pairs sorted by key, one at a time
+
+    For a StudentStore only the ordered roll numbers are built up front
+    (from its index or column arrays); each student is looked up as it
+    is yielded, and students deleted in the meantime are skipped.
+    Other dicts are sorted with sort_students.
+    """
+    if not isinstance(students, StudentStore):
+        yield from sort_students(students, key, reverse).items()
+        return
+    
+    if students.columns is not None:
+        ordered = students.columns.ordered(key, reverse)
+    else:
+        ordered = students.indexes.get(key, students.indexes['roll_no']).ordered(reverse)
+    for roll_no in ordered:
+        student = students.get(roll_no)
+        if student is not None:
+            yield roll_no, student
+
+
 def sort_students(students, key='roll_no', reverse=False):
-    """Sort students by key"""
+    """
+    Sort students by key
+
+    A StudentStore is listed from its sorted index without re-sorting,
+    or argsorted from its column arrays (equal keys ordered by roll
+    number).
+    """
+    if isinstance(students, StudentStore):
+        with students._lock:
+            return dict(iter_sorted_students(students, key, reverse))
+    
     if key == 'name':
         return dict(sorted(students.items(), 
                           key=lambda x: x[1].get('name', ''), 
@@ -111,7 +428,12 @@ def sort_students(students, key='roll_no', reverse=False):
 
 
 def get_statistics(students):
-    """Calculate statistics from students data"""
+    """
+    Calculate statistics from students data
+
+    O(1) for a StudentStore (running counters), vectorized with the
+    numpy engine; other dicts are scanned.
+    """
     if not students:
         return {
             'total': 0,
@@ -125,19 +447,23 @@ def get_statistics(students):
             'total_fees_pending': 0
         }
     
-    total = len(students)
-    grades = [float(s.get('grade', 0)) for s in students.values()]
-    attendance = [float(s.get('attendance', 0)) for s in students.values()]
+    if isinstance(students, StudentStore) and students.columns is not None:
+        counters = students.columns.statistics()
+    elif isinstance(students, StudentStore):
+        counters = students.stats.read(students)
+    else:
+        counters = StatsAggregator.compute(students)
     
-    avg_grade = sum(grades) / total if total > 0 else 0
-    avg_att = sum(attendance) / total if total > 0 else 0
+    total = counters['total']
+    avg_grade = counters['grade_sum'] / total if total > 0 else 0
+    avg_att = counters['attendance_sum'] / total if total > 0 else 0
     
-    pass_count = len([g for g in grades if g >= 60])
+    pass_count = counters['pass_count']
     fail_count = total - pass_count
-    high_att = len([a for a in attendance if a >= 80])
+    high_att = counters['high_attendance_count']
     low_att = total - high_att
     
-    fees_paid = len([s for s in students.values() if s.get('fees_paid')])
+    fees_paid = counters['fees_paid_count']
     fees_pending = total - fees_paid
     
     return {
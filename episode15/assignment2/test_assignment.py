@@ -11,6 +11,11 @@ import threading
 import time
 import sys
 from solution import start_server, AdvancedStudentHandler, STUDENTS as GLOBAL_STUDENTS
+import columnar
+import conditional
+import export
+import page
+import page_cache
 import stores
 
 
@@ -35,6 +40,11 @@ class Episode15Assignment2Tests(unittest.TestCase):
         cls.server_thread.start()
         time.sleep(1)  # Wait for server to start
     
+    @classmethod
+    def tearDownClass(cls):
+        """Remove data files left by the last test"""
+        stores.delete_storage()
+    
     def setUp(self):
         """Clear data before each test"""
         # Clear via HTTP reset endpoint
@@ -401,6 +411,1048 @@ class Episode15Assignment2Tests(unittest.TestCase):
         response = requests.get(f'{self.base_url}/nonexistent')
         self.assertEqual(response.status_code, 404)
         self.assertIn('not found', response.text.lower())
+    
+    # ============ Streaming ============
+    def test_34_student_list_streamed_chunked(self):
+        """Test student list is sent with chunked transfer encoding"""
+        data = {'roll_no': 'S001', 'name': 'Streamed', 'grade': '70', 'attendance': '90'}
+        requests.post(f'{self.base_url}/add', data=data)
+        
+        response = requests.get(f'{self.base_url}/students')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers.get('Transfer-Encoding'), 'chunked')
+        self.assertIn('Streamed', response.text)
+        self.assertTrue(response.text.endswith('</html>'))
+    
+    def test_35_iter_student_list_matches_render(self):
+        """Test streamed chunks join to the full student list page"""
+        import page
+        students = {f'R{i:03d}': {'name': f'S{i}', 'grade': 50 + i, 'attendance': 70 + i} for i in range(5)}
+        chunks = list(page.iter_student_list(students, batch_size=2))
+        
+        # page head, search form, table head, 3 row batches, table foot, page tail
+        self.assertEqual(len(chunks), 8)
+        self.assertEqual(''.join(chunks), page.render_student_list(students))
+
+    # ============ Write-Ahead Log ============
+    def _make_log(self, tmp_dir, **kwargs):
+        from wal import StudentLog
+        return StudentLog(
+            os.path.join(tmp_dir, 'students.json'),
+            os.path.join(tmp_dir, 'students.log'),
+            to_state=dict, from_state=dict, **kwargs
+        )
+
+    def test_36_wal_replays_add_update_delete(self):
+        """Test log records are replayed on load"""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log = self._make_log(tmp_dir)
+            students = log.load()
+            students['R001'] = {'name': 'Alice', 'grade': 85}
+            students['R002'] = {'name': 'Bob', 'grade': 70}
+            log.save(students)
+            students['R001']['grade'] = 90
+            log.save(students, {'R001': students['R001']})
+            del students['R002']
+            log.save(students, {'R002': None})
+            log.close()
+
+            with open(os.path.join(tmp_dir, 'students.log')) as f:
+                ops = [json.loads(line)['op'] for line in f]
+            self.assertEqual(ops, ['add', 'add', 'update', 'delete'])
+
+            reloaded = self._make_log(tmp_dir).load()
+            self.assertEqual(reloaded, {'R001': {'name': 'Alice', 'grade': 90}})
+
+    def test_37_wal_compacts_into_snapshot(self):
+        """Test log is folded into the JSON snapshot past the threshold"""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log = self._make_log(tmp_dir, compact_threshold=3)
+            students = {}
+            for i in range(4):
+                students[f'R{i:03d}'] = {'name': f'S{i}'}
+                log.save(students)
+            log.close()
+
+            # Snapshot is in the plain JSON store format
+            with open(os.path.join(tmp_dir, 'students.json')) as f:
+                self.assertEqual(len(json.load(f)), 3)
+            self.assertFalse(os.path.exists(os.path.join(tmp_dir, 'students.log.old')))
+            self.assertEqual(self._make_log(tmp_dir).load(), students)
+
+    def test_38_wal_ignores_torn_last_record(self):
+        """Test a partially written last line is skipped on replay"""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log = self._make_log(tmp_dir)
+            log.save({'R001': {'name': 'Alice'}})
+            log.close()
+            with open(os.path.join(tmp_dir, 'students.log'), 'ab') as f:
+                f.write(b'{"op":"add","key":"R002","da')
+
+            log = self._make_log(tmp_dir)
+            self.assertEqual(log.load(), {'R001': {'name': 'Alice'}})
+
+            # Next append starts on a clean line
+            log.save({'R001': {'name': 'Alice'}, 'R003': {'name': 'Carol'}})
+            log.close()
+            self.assertEqual(len(self._make_log(tmp_dir).load()), 2)
+
+    # ============ Snapshot Writes ============
+    def test_39_concurrent_saves_group_committed(self):
+        """Test concurrent saves share atomic writes and all complete"""
+        students = {}
+        results = []
+        writes_before = stores._committer.writes
+
+        def save(i):
+            students[f'G{i:03d}'] = {'name': f'Student {i}', 'grade': 80, 'attendance': 90}
+            results.append(stores.save_students(students))
+
+        threads = [threading.Thread(target=save, args=(i,)) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(results, [True] * 20)
+        self.assertLess(stores._committer.writes - writes_before, 20)
+        self.assertFalse(os.path.exists('students_data.json.tmp'))
+        self.assertEqual(len(stores.load_students()), 20)
+        stores.delete_storage()
+
+    # ============ Incremental Statistics ============
+    def test_40_student_store_statistics_incremental(self):
+        """Test running counters match a full recompute after changes"""
+        store = stores.StudentStore({
+            'R001': {'name': 'Alice', 'grade': 85, 'attendance': 90, 'fees_paid': True},
+            'R002': {'name': 'Bob', 'grade': 45, 'attendance': 60, 'fees_paid': False}
+        })
+        store['R003'] = {'name': 'Carol', 'grade': 70, 'attendance': 80, 'fees_paid': True}
+        store['R002'] = {**store['R002'], 'grade': 65}
+        del store['R001']
+        store.pop('R999', None)
+
+        store.stats.check(store)
+        stats = stores.get_statistics(store)
+        self.assertEqual(stats['total'], 2)
+        self.assertEqual(stats['average_grade'], 67.5)
+        self.assertEqual(stats['pass_count'], 2)
+        self.assertEqual(stats['high_attendance_count'], 1)
+        self.assertEqual(stats['total_fees_paid'], 1)
+        self.assertEqual(stats, stores.get_statistics(dict(store)))
+
+        store.clear()
+        self.assertEqual(store.stats.snapshot()['total'], 0)
+
+    def test_41_stats_consistent_through_http(self):
+        """Test dashboard statistics stay consistent across add/edit/delete"""
+        import aggregates
+        aggregates.CHECK_CONSISTENCY = True
+        try:
+            for roll_no, grade in (('C001', '90'), ('C002', '40'), ('C003', '75')):
+                requests.post(f'{self.base_url}/add', data={
+                    'roll_no': roll_no, 'name': roll_no, 'grade': grade, 'attendance': '85'})
+            requests.post(f'{self.base_url}/edit', data={
+                'roll_no': 'C002', 'name': 'C002', 'grade': '65', 'attendance': '50'})
+            requests.post(f'{self.base_url}/delete/C003')
+
+            # A mismatch raises inside the handler and turns into a 500
+            response = requests.get(f'{self.base_url}/stats')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(requests.get(f'{self.base_url}/').status_code, 200)
+        finally:
+            aggregates.CHECK_CONSISTENCY = False
+
+    # ============ Search Index ============
+    def test_42_search_index_ranked_and_limited(self):
+        """Test index returns the linear-scan matches, best first"""
+        store = stores.StudentStore({
+            'R010': {'name': 'Bob Alison'},
+            'R002': {'name': 'Ali'},
+            'R003': {'name': 'Alice Smith'},
+            'R004': {'name': 'Kalia'},
+            'R005': {'name': 'Zed'}
+        })
+        # exact, prefix, word prefix, substring
+        self.assertEqual(list(stores.search_students(store, 'ali')), ['R002', 'R003', 'R010', 'R004'])
+        self.assertEqual(list(stores.search_students(store, 'ali', limit=2)), ['R002', 'R003'])
+        self.assertEqual(list(stores.search_students(store, 'r00')), ['R002', 'R003', 'R004', 'R005'])
+        self.assertEqual(stores.search_students(store, 'nobody'), {})
+
+        plain = dict(store)
+        for query in ('a', 'li', 'son', 'r01', 'e s', 'alice smith'):
+            self.assertEqual(set(stores.search_students(store, query)),
+                             set(stores.search_students(plain, query)))
+
+    def test_43_search_index_updated_on_edit_delete(self):
+        """Test /search reflects edits and deletes"""
+        requests.post(f'{self.base_url}/add', data={
+            'roll_no': 'S100', 'name': 'Original Name', 'grade': '70', 'attendance': '80'})
+        requests.post(f'{self.base_url}/edit', data={
+            'roll_no': 'S100', 'name': 'Renamed Person', 'grade': '70', 'attendance': '80'})
+
+        self.assertIn('(0 found)', requests.get(f'{self.base_url}/search?q=Original').text)
+        self.assertIn('(1 found)', requests.get(f'{self.base_url}/search?q=person').text)
+
+        requests.post(f'{self.base_url}/delete/S100')
+        self.assertIn('(0 found)', requests.get(f'{self.base_url}/search?q=person').text)
+
+    # ============ Sorted Indexes ============
+    def test_44_sorted_indexes_filter_and_sort(self):
+        """Test range filters and sorting use the maintained indexes"""
+        store = stores.StudentStore({
+            'R001': {'name': 'Carol', 'grade': 85, 'attendance': 70},
+            'R002': {'name': 'Alice', 'grade': 55, 'attendance': 95},
+            'R003': {'name': 'Bob', 'grade': 72, 'attendance': 88}
+        })
+        store['R002'] = {**store['R002'], 'grade': 75}
+        store['R004'] = {'name': 'Dave', 'grade': 90, 'attendance': 60}
+        del store['R001']
+
+        results = stores.filter_students(store, {'grade_min': '70', 'grade_max': '80', 'attendance_min': '90'})
+        self.assertEqual(list(results), ['R002'])
+        results = stores.filter_students(store, {'grade_min': '70'})
+        self.assertEqual(list(results), ['R003', 'R002', 'R004'])
+
+        self.assertEqual(list(stores.sort_students(store, 'name')), ['R002', 'R003', 'R004'])
+        self.assertEqual(list(stores.sort_students(store, 'grade', reverse=True)), ['R004', 'R002', 'R003'])
+        self.assertEqual(list(stores.sort_students(store, 'roll_no')), ['R002', 'R003', 'R004'])
+
+    def test_45_filter_max_bounds_over_http(self):
+        """Test /filter accepts grade_max and attendance_max"""
+        for roll_no, grade, attendance in (('F001', '95', '95'), ('F002', '65', '70'), ('F003', '40', '99')):
+            requests.post(f'{self.base_url}/add', data={
+                'roll_no': roll_no, 'name': roll_no, 'grade': grade, 'attendance': attendance})
+
+        response = requests.get(f'{self.base_url}/filter?grade_min=50&grade_max=90&attendance_max=80')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('(1 results)', response.text)
+        self.assertIn('F002', response.text)
+        self.assertIn('Grade ≤ 90.0', response.text)
+
+    # ============ Columnar Engine ============
+    @unittest.skipUnless(columnar.AVAILABLE, 'numpy not installed')
+    def test_46_numpy_engine_matches_python_engine(self):
+        """Test the numpy engine gives the same statistics, filters and sorts"""
+        students = {
+            f'C{i:03d}': {'name': f'Student {i % 7}', 'grade': float(i * 37 % 101),
+                          'attendance': float(i * 53 % 101), 'fees_paid': i % 3 == 0}
+            for i in range(200)
+        }
+        stores.ENGINE = 'numpy'
+        try:
+            fast = stores.StudentStore(students)
+        finally:
+            stores.ENGINE = 'python'
+        indexed = stores.StudentStore(students)
+        for store in (fast, indexed):
+            del store['C010']
+            store['C020'] = {**store['C020'], 'grade': 99.0}
+            store['C999'] = {'name': 'Late', 'grade': 61.0, 'attendance': 80.0}
+
+        self.assertIsNotNone(fast.columns)
+        self.assertEqual(stores.get_statistics(fast), stores.get_statistics(dict(indexed)))
+        criteria = {'grade_min': '40', 'grade_max': '90', 'attendance_min': '50', 'fees_paid': 'true'}
+        self.assertEqual(list(stores.filter_students(fast, criteria)),
+                         list(stores.filter_students(indexed, criteria)))
+        for key in ('roll_no', 'name', 'grade', 'attendance'):
+            self.assertEqual(list(stores.sort_students(fast, key, reverse=True)),
+                             list(stores.sort_students(indexed, key, reverse=True)))
+
+    @unittest.skipIf(columnar.AVAILABLE, 'numpy installed')
+    def test_47_numpy_engine_requires_numpy(self):
+        """Test selecting the numpy engine without numpy fails clearly"""
+        stores.ENGINE = 'numpy'
+        try:
+            with self.assertRaises(ImportError):
+                stores.StudentStore()
+        finally:
+            stores.ENGINE = 'python'
+
+    # ============ Streaming Export ============
+    def test_48_export_csv_fields_and_gzip(self):
+        """Test CSV export is streamed, projected with ?fields= and gzipped"""
+        for roll_no, name in (('R002', 'Bob, Jr.'), ('R001', 'Alice')):
+            requests.post(f'{self.base_url}/add', data={
+                'roll_no': roll_no, 'name': name, 'grade': '80', 'attendance': '90'})
+
+        response = requests.get(f'{self.base_url}/export/csv?fields=name,roll_no',
+                                headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers.get('Transfer-Encoding'), 'chunked')
+        self.assertEqual(response.headers.get('Content-Encoding'), 'gzip')
+        self.assertEqual(response.text.splitlines(), ['Name,Roll No', 'Alice,R001', '"Bob, Jr.",R002'])
+
+        response = requests.get(f'{self.base_url}/export/csv', headers={'Accept-Encoding': 'identity'})
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(len(response.text.splitlines()), 3)
+
+        response = requests.get(f'{self.base_url}/export/csv?fields=name,password')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('password', response.text)
+
+    def test_49_iter_csv_batches_rows(self):
+        """Test iter_csv yields one chunk per batch of rows"""
+        rows = ((f'R{i:03d}', {'name': f'S{i}', 'fees_paid': i % 2 == 0}) for i in range(5))
+        chunks = list(export.iter_csv(rows, ['roll_no', 'fees_paid'], batch_size=2))
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(b''.join(chunks).decode().splitlines()[:2], ['Roll No,Fees Paid', 'R000,Yes'])
+        self.assertTrue(export.accepts_gzip('deflate, gzip;q=0.5'))
+        self.assertFalse(export.accepts_gzip('gzip;q=0, deflate'))
+
+    # ============ Conditional GET ============
+    def test_50_etag_not_modified(self):
+        """Test pages answer If-None-Match with 304 until the data changes"""
+        requests.post(f'{self.base_url}/add', data={
+            'roll_no': 'E001', 'name': 'Etag', 'grade': '80', 'attendance': '90'})
+
+        for path in ('/', '/students', '/stats', '/export/csv'):
+            response = requests.get(f'{self.base_url}{path}')
+            etag = response.headers['ETag']
+            response = requests.get(f'{self.base_url}{path}', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304, path)
+            self.assertEqual(response.content, b'')
+            self.assertEqual(response.headers['ETag'], etag)
+
+        etag = requests.get(f'{self.base_url}/stats').headers['ETag']
+        self.assertNotEqual(etag, requests.get(f'{self.base_url}/').headers['ETag'])
+        requests.post(f'{self.base_url}/add', data={
+            'roll_no': 'E002', 'name': 'Changed', 'grade': '70', 'attendance': '90'})
+        response = requests.get(f'{self.base_url}/stats', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_51_data_version_last_modified(self):
+        """Test Last-Modified is only issued once its second is over"""
+        version = conditional.DataVersion()
+        version.bump()
+        self.assertIsNone(version.last_modified())
+
+        version.modified -= 5
+        last_modified = version.last_modified()
+        etag = version.etag()
+        self.assertTrue(version.is_fresh({'If-Modified-Since': last_modified}, etag))
+        self.assertFalse(version.is_fresh({'If-Modified-Since': 'not a date'}, etag))
+        self.assertTrue(version.is_fresh({'If-None-Match': f'"x", W/{etag}'}, etag))
+        # If-None-Match wins over If-Modified-Since
+        self.assertFalse(version.is_fresh({'If-None-Match': '"x"', 'If-Modified-Since': last_modified}, etag))
+
+        version.bump()
+        self.assertFalse(version.is_fresh({'If-Modified-Since': last_modified}, etag))
+        self.assertNotEqual(version.etag(), etag)
+
+    # ============ Page Cache ============
+    def test_52_page_cache_lru_and_byte_cap(self):
+        """Test the page cache evicts least recently used pages past its byte cap"""
+        cache = page_cache.PageCache(max_bytes=30, max_entry_bytes=20)
+        self.assertEqual(cache.render('a', lambda: 'a' * 10), b'a' * 10)
+        cache.put('b', b'b' * 10)
+        cache.get('a')                      # 'b' is now least recently used
+        cache.put('c', b'c' * 15)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), b'a' * 10)
+        self.assertLessEqual(cache.size, 30)
+        self.assertFalse(cache.put('big', b'x' * 21))
+
+        self.assertEqual(list(cache.capture('d', iter([b'12', b'34']))), [b'12', b'34'])
+        self.assertEqual(cache.get('d'), b'1234')
+        list(cache.capture('e', iter([b'x' * 15, b'y' * 15])))
+        self.assertIsNone(cache.get('e'))
+
+    def test_53_pages_served_from_cache_until_save(self):
+        """Test repeat page hits come from the cache and saves invalidate it"""
+        from solution import PAGE_CACHE
+        requests.post(f'{self.base_url}/add', data={
+            'roll_no': 'P001', 'name': 'Cached', 'grade': '80', 'attendance': '90'})
+
+        for path in ('/', '/students', '/stats'):
+            first = requests.get(f'{self.base_url}{path}').text
+            hits = PAGE_CACHE.stats()['hits']
+            self.assertEqual(requests.get(f'{self.base_url}{path}').text, first)
+            self.assertEqual(PAGE_CACHE.stats()['hits'], hits + 1, path)
+
+        requests.post(f'{self.base_url}/add', data={
+            'roll_no': 'P002', 'name': 'Second', 'grade': '70', 'attendance': '90'})
+        self.assertEqual(PAGE_CACHE.stats()['pages'], 0)
+        self.assertIn('Second', requests.get(f'{self.base_url}/students').text)
+
+    # ============ Static Layout ============
+    def test_54_prebuilt_layout_and_static_css(self):
+        """Test pre-encoded layout parts and the cacheable /static/app.css"""
+        parts = page.render_error('Oops <b>', as_parts=True)
+        self.assertIs(parts[0], page.BASE_HEAD_START_BYTES)
+        self.assertEqual(b''.join(parts), page.render_error('Oops <b>').encode('utf-8'))
+        self.assertIn('<style>', page.render_error('x'))
+
+        page.EXTERNAL_CSS = True
+        try:
+            html = page.render_error('x')
+        finally:
+            page.EXTERNAL_CSS = False
+        self.assertNotIn('<style>', html)
+        self.assertIn(f'href="{page.APP_CSS_URL}"', html)
+
+        response = requests.get(f'{self.base_url}{page.APP_CSS_URL}')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('text/css', response.headers['Content-Type'])
+        self.assertIn('max-age=31536000', response.headers['Cache-Control'])
+        self.assertEqual(response.content, page.APP_CSS_BYTES)
+        response = requests.get(f'{self.base_url}/static/app.css',
+                                headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+
+    # ============ Keep-Alive ============
+    def test_55_keep_alive_connection_reuse(self):
+        """Test several requests share one persistent connection"""
+        import http.client
+        requests.post(f'{self.base_url}/add', data={
+            'roll_no': 'K001', 'name': 'Kept', 'grade': '80', 'attendance': '90'})
+
+        conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+        try:
+            conn.request('GET', '/students')
+            response = conn.getresponse()
+            self.assertIn(b'Kept', response.read())
+            self.assertIsNone(response.getheader('Connection'))
+            sock = conn.sock
+
+            conn.request('GET', '/export/csv')      # chunked
+            self.assertIn(b'K001', conn.getresponse().read())
+            conn.request('GET', '/search?q=')       # redirect
+            response = conn.getresponse()
+            response.read()
+            self.assertEqual(response.status, 302)
+            conn.request('POST', '/delete/K001', body='', headers={
+                'Content-Type': 'application/x-www-form-urlencoded'})
+            self.assertIn(b'K001', conn.getresponse().read())
+            conn.request('GET', '/static/app.css',
+                         headers={'If-None-Match': '"%s"' % page.APP_CSS_URL.rsplit('=', 1)[-1]})
+            self.assertEqual(conn.getresponse().status, 304)
+            self.assertIs(conn.sock, sock)
+        finally:
+            conn.close()
+
+    def test_56_keep_alive_framing_and_limits(self):
+        """Test Content-Length is added to unframed bodies and max_requests closes"""
+        import io
+        import http.client
+        import keepalive
+
+        out = io.BytesIO()
+        writer = keepalive.ResponseWriter(out)
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\n\r\n')
+        writer.write(b'hello ')
+        writer.write(b'world')
+        self.assertEqual(out.getvalue(), b'')
+        self.assertTrue(writer.finish())
+        self.assertEqual(out.getvalue(), b'HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\n'
+                                         b'Content-Length: 11\r\n\r\nhello world')
+
+        out = io.BytesIO()
+        writer = keepalive.ResponseWriter(out)
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n')
+        writer.write(b'ok')
+        self.assertEqual(out.getvalue(), b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok')
+
+        AdvancedStudentHandler.max_requests = 2
+        conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+        try:
+            conn.request('GET', '/stats')
+            response = conn.getresponse()
+            response.read()
+            self.assertIsNone(response.getheader('Connection'))
+            conn.request('GET', '/stats')
+            response = conn.getresponse()
+            response.read()
+            self.assertEqual(response.getheader('Connection'), 'close')
+        finally:
+            AdvancedStudentHandler.max_requests = keepalive.KeepAliveMixin.max_requests
+            conn.close()
+
+    # ============ Asyncio Engine ============
+    def test_57_asyncio_engine_serves_routes(self):
+        """Test the asyncio engine runs the same handler over persistent connections"""
+        import http.client
+        import socket
+        import async_server
+        import solution
+        server = async_server.AsyncHTTPServer(AdvancedStudentHandler, ('127.0.0.1', 0),
+                                              max_connections=50)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        idle = []
+        try:
+            conn.request('POST', '/add', 'roll_no=A001&name=Async&grade=80&attendance=90',
+                         {'Content-Type': 'application/x-www-form-urlencoded'})
+            response = conn.getresponse()
+            response.read()
+            self.assertEqual(response.status, 200)
+            self.assertIn('A001', solution.STUDENTS)
+            sock = conn.sock
+
+            for path, expected in (('/students', b'Async'), ('/export/csv', b'A001'),
+                                   ('/stats', b'</html>')):
+                conn.request('GET', path)
+                response = conn.getresponse()
+                self.assertEqual(response.status, 200)
+                self.assertIn(expected, response.read())
+            self.assertIs(conn.sock, sock)
+
+            # Idle connections up to the cap are held; the next one gets 503
+            idle = [socket.create_connection(('127.0.0.1', port)) for _ in range(49)]
+            extra = socket.create_connection(('127.0.0.1', port))
+            idle.append(extra)
+            self.assertIn(b'503', extra.recv(100))
+            self.assertEqual(server.connections, 50)
+            conn.request('GET', '/')
+            self.assertEqual(conn.getresponse().status, 200)
+        finally:
+            conn.close()
+            for idle_sock in idle:
+                idle_sock.close()
+            server.shutdown()
+            server.server_close()
+
+    def test_58_asyncio_request_framing(self):
+        """Test the stream parser finds the body length and rejects bad heads"""
+        import async_server
+        from http import HTTPStatus
+        head = b'POST /add HTTP/1.1\r\nHost: x\r\nContent-Length: 12\r\n\r\n'
+        self.assertEqual(async_server.parse_request_head(head), ('POST', '/add', 12))
+        self.assertEqual(async_server.parse_request_head(b'GET / HTTP/1.1\r\n\r\n'),
+                         ('GET', '/', 0))
+
+        for head, status in ((b'GARBAGE\r\n\r\n', HTTPStatus.BAD_REQUEST),
+                             (b'POST / HTTP/1.1\r\nContent-Length: x\r\n\r\n', HTTPStatus.BAD_REQUEST),
+                             (b'POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n',
+                              HTTPStatus.LENGTH_REQUIRED),
+                             (b'POST / HTTP/1.1\r\nContent-Length: 99999999\r\n\r\n',
+                              HTTPStatus.REQUEST_ENTITY_TOO_LARGE)):
+            with self.assertRaises(async_server.RequestError) as raised:
+                async_server.parse_request_head(head)
+            self.assertEqual(raised.exception.status, status)
+
+    # ============ Pooled Server ============
+    def test_59_pooled_server_rejects_when_queue_full(self):
+        """Test a full queue answers 503 + Retry-After and counters track it"""
+        import http.client
+        from http.server import BaseHTTPRequestHandler
+        from pooled_server import PooledHTTPServer
+        release = threading.Event()
+
+        class SlowHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                release.wait(5)
+                self.send_response(200)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'ok')
+
+            def log_message(self, format, *args):
+                pass
+
+        server = PooledHTTPServer(('127.0.0.1', 0), SlowHandler, workers=1, queue_size=1)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+        clients = [http.client.HTTPConnection('127.0.0.1', port, timeout=5) for _ in range(3)]
+        try:
+            for conn in clients[:2]:
+                conn.request('GET', '/')
+                time.sleep(0.2)
+            self.assertEqual(server.stats()['busy_workers'], 1)
+            self.assertEqual(server.stats()['queue_depth'], 1)
+            self.assertTrue(server.saturated)
+
+            clients[2].request('GET', '/')
+            response = clients[2].getresponse()
+            self.assertEqual(response.status, 503)
+            self.assertEqual(response.getheader('Retry-After'), '1')
+
+            release.set()
+            for conn in clients[:2]:
+                self.assertEqual(conn.getresponse().read(), b'ok')
+            stats = server.stats()
+            self.assertEqual(stats['rejected'], 1)
+            self.assertEqual(stats['peak_queue_depth'], 1)
+            self.assertGreater(stats['utilization'], 0)
+        finally:
+            release.set()
+            for conn in clients:
+                conn.close()
+            server.shutdown()
+            server.server_close()
+
+    def test_60_server_stats_endpoint(self):
+        """Test /server-stats exposes the pool counters as JSON"""
+        response = requests.get(f'{self.base_url}/server-stats')
+        self.assertEqual(response.status_code, 200)
+        stats = response.json()
+        self.assertEqual(stats['workers'], 16)
+        self.assertGreaterEqual(stats['busy_workers'], 1)   # this request
+        self.assertIn('queue_depth', stats)
+
+    # ============ Multi-Process Mode ============
+    def test_61_file_sync_between_processes(self):
+        """Test FileSync reloads another writer's save and not its own"""
+        import tempfile
+        import prefork
+        from snapshot import write_json_atomic
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, 'students_data.json')
+            write_json_atomic(path, {})
+            loads = {'a': 0, 'b': 0}
+            # Two FileSyncs with their own lock descriptors stand in for two workers
+            sync_a = prefork.FileSync(path, lambda: loads.__setitem__('a', loads['a'] + 1))
+            sync_b = prefork.FileSync(path, lambda: loads.__setitem__('b', loads['b'] + 1))
+            try:
+                self.assertFalse(sync_b.refresh())
+                with sync_a.writing():
+                    write_json_atomic(path, {'S1': {'name': 'A'}})
+                self.assertFalse(sync_a.refresh())
+                self.assertTrue(sync_b.refresh())
+                self.assertFalse(sync_b.refresh())
+
+                # An edit by another program is noticed through the file itself
+                write_json_atomic(path, {'S1': {'name': 'Changed by hand'}})
+                self.assertTrue(sync_a.refresh())
+                self.assertEqual(loads, {'a': 1, 'b': 1})
+            finally:
+                sync_a.close()
+                sync_b.close()
+
+    def test_62_prefork_workers_share_data(self):
+        """Test workers on one port see each other's changes and lose none"""
+        import signal
+        import socket
+        import subprocess
+        import tempfile
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        base_url = f'http://127.0.0.1:{port}'
+        here = os.path.dirname(os.path.abspath(__file__))
+        with tempfile.TemporaryDirectory() as workdir:
+            server = subprocess.Popen([sys.executable, os.path.join(here, 'solution.py'),
+                                       str(port), 'pool', '3'],
+                                      cwd=workdir, stdout=subprocess.DEVNULL)
+            try:
+                for _ in range(50):
+                    try:
+                        requests.get(f'{base_url}/stats', timeout=1)
+                        break
+                    except requests.ConnectionError:
+                        time.sleep(0.1)
+
+                def add(i):
+                    requests.post(f'{base_url}/add', data={
+                        'roll_no': f'W{i:03d}', 'name': f'Worker {i}',
+                        'grade': '70', 'attendance': '80'})
+                threads = [threading.Thread(target=add, args=(i,)) for i in range(30)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+                with open(os.path.join(workdir, 'students_data.json')) as f:
+                    self.assertEqual(len(json.load(f)), 30)
+                # New connections land on different workers; all are current
+                for _ in range(10):
+                    self.assertIn('Worker 29', requests.get(f'{base_url}/students').text)
+            finally:
+                server.send_signal(signal.SIGINT)
+                self.assertEqual(server.wait(timeout=10), 0)
+
+    # ============ Routing ============
+    def test_63_router_matching(self):
+        """Test static, parametric, 404 and 405 matches of the router"""
+        import router
+        routes = router.Router([
+            ('GET', '/students', 'list'),
+            ('GET', '/students/<roll_no>', 'detail'),
+            ('GET', '/students/new', 'new'),
+            ('POST', '/delete/<roll_no>', 'delete'),
+            ('GET', '/<a>/<b>/marks', 'marks'),
+            ('GET', '/courses/<code>/grades', 'course_grades'),
+        ])
+        self.assertEqual(routes.match('GET', '/students'), ('list', {}))
+        self.assertEqual(routes.match('GET', '/students/S%20001'), ('detail', {'roll_no': 'S 001'}))
+        # Literal segments win over parameters
+        self.assertEqual(routes.match('GET', '/students/new'), ('new', {}))
+        # ...but a dead-end literal branch falls back to the parameter
+        self.assertEqual(routes.match('GET', '/courses/CS1/marks'), ('marks', {'a': 'courses', 'b': 'CS1'}))
+        self.assertEqual(routes.match('GET', '/courses/CS1/grades'), ('course_grades', {'code': 'CS1'}))
+
+        with self.assertRaises(router.RouteError) as ctx:
+            routes.match('GET', '/delete/S001')
+        self.assertEqual((ctx.exception.status, ctx.exception.allowed), (405, ('POST',)))
+        for path in ('/students/', '/students/S001/x', '/nope'):
+            with self.assertRaises(router.RouteError) as ctx:
+                routes.match('GET', path)
+            self.assertEqual(ctx.exception.status, 404)
+
+    def test_64_wrong_method_gets_405(self):
+        """Test known paths answer 405 with Allow for other methods"""
+        response = requests.post(f'{self.base_url}/stats', data={'x': '1'})
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response.headers['Allow'], 'GET')
+
+        response = requests.put(f'{self.base_url}/delete/S001')
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response.headers['Allow'], 'GET, POST')
+
+        response = requests.delete(f'{self.base_url}/no-such-page')
+        self.assertEqual(response.status_code, 404)
+        response = requests.get(f'{self.base_url}/students/S001/extra')
+        self.assertEqual(response.status_code, 404)
+
+    # ============ Request Bodies ============
+    def test_65_form_parser_streams_multipart(self):
+        """Test multipart fields and files split across many small reads"""
+        import io
+        import form_parser
+        content = bytes(range(256)) * 40 + b'\r\n--Xy'    # almost a boundary
+        body = (b'preamble\r\n--XyZ\r\n'
+                b'Content-Disposition: form-data; name="name"\r\n\r\nAl\xc3\xa9\r\n--XyZ\r\n'
+                b'Content-Disposition: form-data; name="photo"; filename="p.bin"\r\n'
+                b'Content-Type: application/octet-stream\r\n\r\n' + content + b'\r\n--XyZ--\r\n')
+        old_chunk = form_parser.CHUNK_SIZE
+        form_parser.CHUNK_SIZE = 7
+        try:
+            form = form_parser.parse_form(io.BytesIO(body), len(body), 'multipart/form-data; boundary=XyZ')
+            self.assertEqual(dict(form), {'name': 'Alé'})
+            upload = form.files['photo']
+            self.assertEqual((upload.filename, upload.size), ('p.bin', len(content)))
+            self.assertEqual(upload.read(), content)
+            form.close()
+
+            with self.assertRaises(form_parser.FormError) as ctx:
+                form_parser.parse_form(io.BytesIO(body), len(body),
+                                       'multipart/form-data; boundary=XyZ', max_file=1000)
+            self.assertEqual(ctx.exception.status, 413)
+            with self.assertRaises(form_parser.FormError) as ctx:
+                form_parser.parse_form(io.BytesIO(b'a=1&b=' + b'x' * 100), 106, max_field=50)
+            self.assertEqual(ctx.exception.status, 413)
+        finally:
+            form_parser.CHUNK_SIZE = old_chunk
+
+        body = b'name=A+B&name=second&empty=&grade=%39%30'
+        form = form_parser.parse_form(io.BytesIO(body), len(body))
+        self.assertEqual(form, {'name': 'A B', 'grade': '90'})
+
+    def test_66_post_body_limits(self):
+        """Test oversized POST bodies get 413 and multipart forms are accepted"""
+        import http.client
+        import solution
+        response = requests.post(f'{self.base_url}/add', files={
+            'roll_no': (None, 'M001'), 'name': (None, 'Multi Part'),
+            'grade': (None, '75'), 'attendance': (None, '90')})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('M001', solution.STUDENTS)
+
+        # Refused from Content-Length alone, before any of the body is read
+        conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+        try:
+            conn.putrequest('POST', '/add')
+            conn.putheader('Content-Type', 'application/x-www-form-urlencoded')
+            conn.putheader('Content-Length', str(100 * 1024 * 1024))
+            conn.endheaders()
+            response = conn.getresponse()
+            self.assertEqual(response.status, 413)
+            self.assertEqual(response.getheader('Connection'), 'close')
+        finally:
+            conn.close()
+
+    def test_67_wal_finishes_interrupted_compaction(self):
+        """Test a .log.old left by a crash is folded into the snapshot"""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            old_path = os.path.join(tmp_dir, 'students.log.old')
+            log_path = os.path.join(tmp_dir, 'students.log')
+            # Crash after the rename, before the snapshot was written
+            with open(old_path, 'w') as f:
+                f.write('{"op":"add","key":"R001","data":{"name":"Alice"}}\n')
+            with open(log_path, 'w') as f:
+                f.write('{"op":"add","key":"R002","data":{"name":"Bob"}}\n')
+
+            log = self._make_log(tmp_dir, compact_threshold=5)
+            students = log.load()
+            self.assertEqual(students, {'R001': {'name': 'Alice'}, 'R002': {'name': 'Bob'}})
+            self.assertFalse(os.path.exists(old_path))
+            with open(os.path.join(tmp_dir, 'students.json')) as f:
+                self.assertEqual(json.load(f), students)
+
+            # Later compactions run again and keep the log short
+            for i in range(50):
+                students[f'N{i:03d}'] = {'name': f'S{i}'}
+                log.save(students)
+            log.compact()       # waits for a background compaction, if running
+            log.compact()
+            self.assertFalse(os.path.exists(old_path))
+            self.assertFalse(os.path.exists(log_path))
+            log.close()
+            self.assertEqual(self._make_log(tmp_dir).load(), students)
+
+            # A snapshot write that failed in the background is redone
+            log = self._make_log(tmp_dir)
+            log.load()
+            with open(old_path, 'w') as f:
+                f.write('{"op":"delete","key":"R001"}\n')
+            del students['R001']
+            log.save(students)
+            log.compact()
+            self.assertFalse(os.path.exists(old_path))
+            log.close()
+            self.assertEqual(self._make_log(tmp_dir).load(), students)
+
+    def test_68_filter_ignores_non_finite_bounds(self):
+        """Test nan/inf range bounds are ignored by the indexed and scan filters alike"""
+        students = {
+            'R001': {'name': 'Alice', 'grade': 50, 'attendance': 90, 'fees_paid': True},
+            'R002': {'name': 'Bob', 'grade': 80, 'attendance': 70, 'fees_paid': False}
+        }
+        store = stores.StudentStore(students)
+        for criteria in ({'grade_min': 'nan'}, {'grade_max': 'NaN'}, {'attendance_min': 'inf'},
+                         {'grade_max': '-inf', 'attendance_max': '75'}):
+            indexed = stores.filter_students(store, criteria)
+            scanned = stores.filter_students(dict(students), criteria)
+            self.assertEqual(set(indexed), set(scanned), criteria)
+        self.assertEqual(len(stores.filter_students(store, {'grade_min': 'nan'})), 2)
+
+    def test_69_sorted_list_ignores_if_modified_since(self):
+        """Test /students is validated by ETag only, since the sort order isn't in its date"""
+        from email.utils import formatdate
+        requests.post(f'{self.base_url}/add', data={
+            'roll_no': 'M001', 'name': 'Zed', 'grade': '80', 'attendance': '90'})
+        response = requests.get(f'{self.base_url}/students')
+        self.assertNotIn('Last-Modified', response.headers)
+        etag = response.headers['ETag']
+
+        version = conditional.DataVersion()
+        version.modified -= 5
+        dated = version.validators(version.etag())
+        self.assertIn('Last-Modified', dict(dated))
+        self.assertNotIn('Last-Modified', dict(version.validators(version.etag(), dated=False)))
+        since = {'If-Modified-Since': dict(dated)['Last-Modified']}
+        self.assertTrue(version.is_fresh(since, version.etag()))
+        self.assertFalse(version.is_fresh(since, version.etag(), dated=False))
+
+        requests.get(f'{self.base_url}/sort?by=name', allow_redirects=False)
+        try:
+            future = formatdate(time.time() + 3600, usegmt=True)
+            response = requests.get(f'{self.base_url}/students', headers={'If-Modified-Since': future})
+            self.assertEqual(response.status_code, 200)
+            response = requests.get(f'{self.base_url}/students', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 200)
+        finally:
+            requests.get(f'{self.base_url}/sort?by=roll_no', allow_redirects=False)
+
+    def test_70_pool_parks_idle_keep_alive_connections(self):
+        """Test idle keep-alive connections don't hold pool workers"""
+        import http.client
+        from http.server import BaseHTTPRequestHandler
+        from keepalive import KeepAliveMixin
+        from pooled_server import PooledHTTPServer
+
+        class Handler(KeepAliveMixin, BaseHTTPRequestHandler):
+            keep_alive = True
+            max_requests = 3
+
+            def do_GET(self):
+                self.send_response(200)
+                self.end_headers()
+                self.wfile.write(b'ok')
+
+            def log_message(self, format, *args):
+                pass
+
+        server = PooledHTTPServer(('127.0.0.1', 0), Handler, workers=2)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+        idle = [http.client.HTTPConnection('127.0.0.1', port, timeout=5) for _ in range(2)]
+        try:
+            for conn in idle:
+                conn.request('GET', '/')
+                self.assertEqual(conn.getresponse().read(), b'ok')
+            time.sleep(0.2)
+            self.assertEqual(server.stats()['idle_connections'], 2)
+            self.assertEqual(server.stats()['busy_workers'], 0)
+
+            # Both workers are free for a new client
+            start = time.monotonic()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            conn.request('GET', '/')
+            self.assertEqual(conn.getresponse().read(), b'ok')
+            conn.close()
+            self.assertLess(time.monotonic() - start, 0.5)
+
+            # Parked connections resume on the same socket; the request
+            # count carries over, so the third response closes
+            sock = idle[0].sock
+            for expected in (None, 'close'):
+                self.assertIs(idle[0].sock, sock)
+                idle[0].request('GET', '/')
+                response = idle[0].getresponse()
+                self.assertEqual(response.read(), b'ok')
+                self.assertEqual(response.getheader('Connection'), expected)
+        finally:
+            for conn in idle:
+                conn.close()
+            server.shutdown()
+            server.server_close()
+    def test_71_wal_load_waits_for_background_compaction(self):
+        """Test load() during a background compaction doesn't race it for .log.old"""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log = self._make_log(tmp_dir, compact_threshold=3)
+            students = log.load()
+            release = threading.Event()
+            errors = []
+            write_snapshot = log._write_snapshot
+
+            def slow_write_snapshot(snapshot):
+                release.wait(5)
+                try:
+                    write_snapshot(snapshot)
+                except Exception as e:
+                    errors.append(e)
+            log._write_snapshot = slow_write_snapshot
+
+            for i in range(3):
+                students[f'R{i:03d}'] = {'name': f'S{i}'}
+                log.save(students)
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir, 'students.log.old')))
+
+            threading.Timer(0.2, release.set).start()
+            self.assertEqual(log.load(), students)
+            log.compact()
+            self.assertEqual(errors, [])
+            self.assertFalse(os.path.exists(os.path.join(tmp_dir, 'students.log.old')))
+            log.close()
+            self.assertEqual(self._make_log(tmp_dir).load(), students)
+
+    def test_72_prefork_workers_share_etags(self):
+        """Test every worker tags the same data with the same ETag, so 304s work across workers"""
+        import signal
+        import socket
+        import subprocess
+        import tempfile
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        base_url = f'http://127.0.0.1:{port}'
+        here = os.path.dirname(os.path.abspath(__file__))
+        with tempfile.TemporaryDirectory() as workdir:
+            server = subprocess.Popen([sys.executable, os.path.join(here, 'solution.py'),
+                                       str(port), 'pool', '3'],
+                                      cwd=workdir, stdout=subprocess.DEVNULL)
+            try:
+                for _ in range(50):
+                    try:
+                        requests.get(f'{base_url}/stats', timeout=1)
+                        break
+                    except requests.ConnectionError:
+                        time.sleep(0.1)
+                for i in range(3):
+                    requests.post(f'{base_url}/add', data={
+                        'roll_no': f'E{i:03d}', 'name': f'Tagged {i}',
+                        'grade': '70', 'attendance': '80'})
+
+                # New connections land on different workers
+                etags = {requests.get(f'{base_url}/students').headers['ETag'] for _ in range(20)}
+                self.assertEqual(len(etags), 1)
+                etag = etags.pop()
+                for _ in range(20):
+                    response = requests.get(f'{base_url}/students', headers={'If-None-Match': etag})
+                    self.assertEqual(response.status_code, 304)
+
+                requests.post(f'{base_url}/add', data={
+                    'roll_no': 'E999', 'name': 'Late', 'grade': '70', 'attendance': '80'})
+                for _ in range(20):
+                    response = requests.get(f'{base_url}/students', headers={'If-None-Match': etag})
+                    self.assertEqual(response.status_code, 200)
+            finally:
+                server.send_signal(signal.SIGINT)
+                self.assertEqual(server.wait(timeout=10), 0)
+
+    def test_73_pooled_server_closes_with_full_queue(self):
+        """Test server_close() returns at once and drops queued connections when the queue is full"""
+        import http.client
+        from http.server import BaseHTTPRequestHandler
+        from pooled_server import PooledHTTPServer
+        release = threading.Event()
+
+        class SlowHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                release.wait(5)
+                self.send_response(200)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'ok')
+
+            def log_message(self, format, *args):
+                pass
+
+        server = PooledHTTPServer(('127.0.0.1', 0), SlowHandler, workers=1, queue_size=1)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+        clients = [http.client.HTTPConnection('127.0.0.1', port, timeout=5) for _ in range(2)]
+        try:
+            for conn in clients:
+                conn.request('GET', '/')
+                time.sleep(0.2)
+            self.assertEqual(server.stats()['queue_depth'], 1)
+
+            server.shutdown()
+            closer = threading.Thread(target=server.server_close)
+            start = time.monotonic()
+            closer.start()
+            closer.join(2)
+            self.assertFalse(closer.is_alive())
+            self.assertLess(time.monotonic() - start, 1)
+            # The queued connection is closed unanswered
+            with self.assertRaises((http.client.RemoteDisconnected, ConnectionError)):
+                clients[1].getresponse()
+
+            release.set()
+            self.assertEqual(clients[0].getresponse().read(), b'ok')
+        finally:
+            release.set()
+            for conn in clients:
+                conn.close()
+
+    def test_74_asyncio_slow_render_runs_off_the_loop(self):
+        """Test a slow student list render doesn't hold up other connections on the asyncio engine"""
+        import http.client
+        import async_server
+
+        class SlowListHandler(AdvancedStudentHandler):
+            def _handle_list(self):
+                time.sleep(1)
+                super()._handle_list()
+
+        server = async_server.AsyncHTTPServer(SlowListHandler, ('127.0.0.1', 0))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+        slow = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        fast = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        try:
+            slow.request('GET', '/students')
+            time.sleep(0.1)
+            start = time.monotonic()
+            fast.request('GET', '/add')
+            self.assertEqual(fast.getresponse().status, 200)
+            self.assertLess(time.monotonic() - start, 0.5)
+            self.assertEqual(slow.getresponse().status, 200)
+        finally:
+            slow.close()
+            fast.close()
+            server.shutdown()
+            server.server_close()
 
 
 def run_tests():